@@ -1,7 +1,26 @@
+from types import MappingProxyType
+
+
+class GameStateSnapshot:
+    """
+    Frozen view of a GameState. Holds the same flags dict/inventory the state
+    had when the snapshot was taken; GameState copies before its next write,
+    so taking a snapshot costs nothing.
+    """
+    __slots__ = ("flags", "inventory")
+
+    def __init__(self, flags, inventory):
+        self.flags = flags
+        self.inventory = inventory
+
+    def get_flag(self, name, default=None):
+        return self.flags.get(name, default)
+
+
 class GameState:
     def __init__(self, flags=None):
         if flags is None:
-            self.flags = {
+            self._flags = {
                 "g_DEBUG": False,
                 "g_interfaceVisible": False,
                 "g_roomVisible": True,
@@ -17,17 +36,70 @@ class GameState:
                 "g_soundsMuted": False,
             }
         else:
-            self.flags = flags.copy()  # <- key line
-        self.inventory = []
+            self._flags = flags.copy()  # <- key line
+        self._inventory = []
+        # True while a snapshot shares _flags / _inventory: copy before writing (copy-on-write)
+        self._flags_shared = False
+        self._inventory_shared = False
+
+    # ---------- copy-on-write ----------
+    def _own_flags(self):
+        if self._flags_shared:
+            self._flags = self._flags.copy()
+            self._flags_shared = False
 
+    def _own_inventory(self):
+        if self._inventory_shared:
+            self._inventory = self._inventory.copy()
+            self._inventory_shared = False
+
+    def snapshot(self) -> GameStateSnapshot:
+        """O(1): the next write copies instead."""
+        self._flags_shared = self._inventory_shared = True
+        return GameStateSnapshot(self._flags, self._inventory)
+
+    def restore(self, snapshot: GameStateSnapshot):
+        """O(1): share the snapshot's data until the next write."""
+        self._flags = snapshot.flags
+        self._inventory = snapshot.inventory
+        self._flags_shared = self._inventory_shared = True
+
+    @property
+    def flags(self):
+        # read-only live view (no copy); writes go through set_flag() or the setter
+        return MappingProxyType(self._flags)
+
+    @flags.setter
+    def flags(self, value):
+        # replaces only the flags: a shared inventory stays copy-on-write
+        self._flags = value
+        self._flags_shared = False
+
+    @property
+    def inventory(self):
+        # hands out the mutable list, so it is a write path; read with get_inventory()
+        self._own_inventory()
+        return self._inventory
+
+    @inventory.setter
+    def inventory(self, value):
+        self._inventory = value
+        self._inventory_shared = False
+
+    def get_inventory(self):
+        """The inventory without copying it. Don't mutate it; go through `inventory` to write."""
+        return self._inventory
+
+    # ---------- flags ----------
     def set_flag(self, name, value=True):
-        self.flags[name] = value
+        self._own_flags()
+        self._flags[name] = value
 
     def get_flag(self, name, default=None):
-        return self.flags.get(name, default)
+        return self._flags.get(name, default)
     
     def add_item_to_inventory(self, item_id, value=True):
         self.inventory[item_id] = value
 
     def is_item_in_inventory(self, name, default=False):
-        pass        
\ No newline at end of file
+        pass
@@ -12,8 +12,7 @@ ROOM_NAME: str = __name__
 def init(engine) -> Room:
     print("init", ROOM_NAME, "with debug enabled:", engine.DEBUG)
 
-    bg = Resources.load_image("interface/", "interface_bg.bmp").convert()
-    bg.set_colorkey((173, 0, 173))
+    bg = Resources.load_image("interface/", "interface_bg.bmp", colorkey=(173, 0, 173))
 
     bg_rect = bg.get_rect()
     bg_rect.y = 349
@@ -70,10 +69,10 @@ def onHornClick(room, engine):
         inv_costume = Costume(
             "assets/interface/inventory.png",
             "assets/interface/inventory.json",
+            colorkey=(203, 123, 199),
         )
         # Actor(actor_id=None, costume=None, name=None, pos=(0, 0), room=None)
         hornActor = Actor(room.get_next_actor_id(), inv_costume)
-        hornActor.costume.sprite_sheet.set_colorkey((203, 123, 199))
         animation = ["inv-horn-beep", "inv-horn-whistle", "inv-horn-aooga", "inv-horn-kooky"]
         hornActor.costume.play(random.choice(animation))
         hornActor.add_event(
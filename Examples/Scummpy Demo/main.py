@@ -79,13 +79,35 @@ TALKIES: dict[str, tuple] = {
 }      
 
 def main():
-    engine = Engine(stage_size, fps, title)
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description=title)
+    parser.add_argument("--record", metavar="FILE", help="record this session's input to FILE")
+    parser.add_argument("--replay", metavar="FILE", help="replay a recorded session at max speed")
+    parser.add_argument("--report", metavar="FILE", help="with --replay: write the frame-time histogram to FILE (JSON)")
+    parser.add_argument("--headless", action="store_true", help="no window/audio device (for replays)")
+    parser.add_argument("--fullscreen", action="store_true", help="start fullscreen (F11 toggles)")
+    parser.add_argument("--window", metavar="WxH", help="window size when hardware scaling is unavailable, e.g. 1280x960")
+    args, _ = parser.parse_known_args()
+
+    if args.headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    window_size = tuple(int(n) for n in args.window.lower().split("x")) if args.window else None
+    engine = Engine(stage_size, fps, title, window_size=window_size, fullscreen=args.fullscreen)
+    if args.replay:
+        engine.start_replay(args.replay, args.report)
+    elif args.record:
+        engine.start_recording(args.record)
     engine.register_rooms(ROOMS)
     engine.register_soundChannels(SOUND_CHANNELS)
     engine.register_music(MUSIC_TRACKS)
     engine.register_talkies(TALKIES)
     engine.set_game_state(GameState())
     engine.game_state.set_flag("g_musicMuted", True)
+    engine.AUTOSAVE_ON_ROOM_CHANGE = True
     engine.main_loop(start_room_id)
 
 if __name__ == "__main__":
@@ -17,7 +17,7 @@ ROOM_PATH: str = ROOM_NAME+"/"
 def init(engine) -> Room:
     print("init", ROOM_NAME, "with debug enabled:", engine.DEBUG)
 
-    bg = Resources.load_room_image(ROOM_PATH, "bg.jpg").convert()
+    bg = Resources.load_room_image(ROOM_PATH, "bg.jpg")
 
     room = Room(engine, ROOM_NAME, bg)
 
@@ -2,4 +2,4 @@ from .core import Engine
 from .room import Room
 from .actor import Actor
 from .costume import Costume
-from .resources import load_image, load_sound
+from .resources import load_image, load_sound, load_images, load_sounds
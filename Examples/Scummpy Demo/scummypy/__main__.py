@@ -0,0 +1,18 @@
+"""
+Engine command line, run from the game folder:
+
+    python -m scummypy build [baker ...] [-j N] [--force] [--prune]
+"""
+import sys
+
+from .build import main as build_main
+
+COMMANDS = {
+    "build": build_main,
+}
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in COMMANDS:
+        print(f"usage: python -m scummypy {{{','.join(COMMANDS)}}} ...")
+        sys.exit(2)
+    COMMANDS[sys.argv[1]](sys.argv[2:])
@@ -1,13 +1,128 @@
+import math
 import pygame
 import threading
+import weakref
 
+from array import array
+from collections import deque
 from typing import Callable
 
 class ActorEvents:
     ANIMATION_END = pygame.USEREVENT + 100
     ACTOR_UPDATE = pygame.USEREVENT + 101
+    WALK_END = pygame.USEREVENT + 102      # walk_to() arrived or was stopped (synchronous, like ANIMATION_END)
+
+    # Opt-in: also post ANIMATION_END to the pygame queue (the old global broadcast).
+    # Normally it is delivered synchronously to actor handlers and event_bus subscribers.
+    POST_ANIMATION_END_TO_QUEUE: bool = False
+
+
+class EventBus:
+    """
+    Synchronous in-process event delivery, no SDL queue involved.
+    Subscriptions can be narrowed to one actor_id and/or one animation name;
+    None matches everything. Callbacks get (actor, event_data, *user_args),
+    the same as Actor.add_event handlers.
+    """
+    def __init__(self):
+        # { (event_type, actor_id | None, animation | None): [(callback, user_args), ...] }
+        self._subs: dict[tuple, list] = {}
+
+    def subscribe(self, event_type, callback, *user_args, actor_id=None, animation=None):
+        key = (event_type, actor_id, animation)
+        self._subs.setdefault(key, []).append((callback, user_args))
+        return key
+
+    def unsubscribe(self, event_type, callback, *, actor_id=None, animation=None):
+        key = (event_type, actor_id, animation)
+        handlers = self._subs.get(key)
+        if not handlers:
+            return
+        handlers[:] = [(cb, args) for cb, args in handlers if cb != callback]
+        if not handlers:
+            del self._subs[key]
+
+    def unsubscribe_actor(self, actor_id):
+        """Drop every subscription narrowed to actor_id (used when an actor is destroyed)."""
+        for key in [k for k in self._subs if k[1] == actor_id]:
+            del self._subs[key]
+
+    def publish(self, event_type, actor=None, **event_data):
+        if not self._subs:
+            return
+        actor_id = getattr(actor, "actor_id", None)
+        animation = event_data.get("animation")
+
+        keys = [(event_type, None, None)]
+        if actor_id is not None:
+            keys.append((event_type, actor_id, None))
+        if animation is not None:
+            keys.append((event_type, None, animation))
+            if actor_id is not None:
+                keys.append((event_type, actor_id, animation))
+
+        for key in keys:
+            handlers = self._subs.get(key)
+            if not handlers:
+                continue
+            # Iterate over a snapshot so handlers can unsubscribe themselves safely
+            for callback, user_args in list(handlers):
+                callback(actor, event_data, *user_args)
+
+
+event_bus = EventBus()
+
+
+class ActorStore:
+    """
+    Struct-of-arrays for the per-actor numbers rooms touch in bulk:
+    one slot per live actor, with positions and the current sheet frame
+    kept in flat arrays instead of per-object Vector2s.
+    """
+    __slots__ = ("x", "y", "frame", "dirty", "_free")
+
+    def __init__(self):
+        self.x = array("d")
+        self.y = array("d")
+        self.frame = array("l")
+        self.dirty = bytearray()     # 1: moved in bulk, the actor's rect catches up in Actor.update()
+        self._free: list[int] = []
+
+    def alloc(self, x: float = 0.0, y: float = 0.0) -> int:
+        if self._free:
+            slot = self._free.pop()
+            self.x[slot] = x
+            self.y[slot] = y
+            self.frame[slot] = 0
+            self.dirty[slot] = 0
+        else:
+            slot = len(self.x)
+            self.x.append(x)
+            self.y.append(y)
+            self.frame.append(0)
+            self.dirty.append(0)
+        return slot
+
+    def free(self, slot: int) -> None:
+        self._free.append(slot)
+
+    def __len__(self) -> int:
+        return len(self.x) - len(self._free)
+
+    def move(self, slots, dx: float, dy: float) -> None:
+        x, y, dirty = self.x, self.y, self.dirty
+        for slot in slots:
+            x[slot] += dx
+            y[slot] += dy
+            dirty[slot] = 1
+
+
+actor_store = ActorStore()
+
 
 class Actor(pygame.sprite.Sprite):
+    WALK_SPEED: float = 120.0   # px per second
+
     def __init__(self, actor_id=None, costume=None, pos=(0, 0), name=None, room=None, actor_can_flap_while_change=False):
         super().__init__()
 
@@ -24,13 +139,18 @@ class Actor(pygame.sprite.Sprite):
         self.costume.actor = self
         if name is not None:
             self.__name__ = name
-        self.pos = pygame.math.Vector2(pos)
+
+        # Position lives in the shared ActorStore; the slot is released when the actor is collected
+        self._slot = actor_store.alloc(float(pos[0]), float(pos[1]))
+        weakref.finalize(self, actor_store.free, self._slot)
 
         self.image = costume.image
         self.rect = self.image.get_rect()
         self.mask = pygame.mask.from_surface(self.image)
+        self._mask_image = self.image
         self._update_rect_from_regpoint()
 
+        self.scale: float = 1.0   # depth scale from the room's scale bands, see scaling.py
         self.blink_required_before_flap = True
         self.currently_looking_at = "normal"
         self.flapping_mouth = False
@@ -38,6 +158,11 @@ class Actor(pygame.sprite.Sprite):
 
         # event registry: { event_type : [ (callback, (arg1,arg2,...)), ... ] }
         self._event_handlers = {}
+
+        # walk_to(): remaining waypoints, walked a bit every update()
+        self.walk_speed: float = self.WALK_SPEED
+        self._walk_path: deque = deque()
+        self._walk_done: Callable | None = None
         
         if self.actor_can_flap_while_change == False:
             data = dict(update_type="new", actor_id=self.actor_id)
@@ -52,12 +177,18 @@ class Actor(pygame.sprite.Sprite):
             data = dict(update_type="change", actor_id=self.actor_id)
             pygame.event.post(pygame.event.Event(ActorEvents.ACTOR_UPDATE, data))
 
+        # keep batched stepping: the new costume takes over the old one's room batch
+        batch = self.costume._batch
+        self.costume.detach_batch()
+
         self.costume = new_costume
         self.costume.actor = self
+        self.costume.attach_batch(batch)
 
         self.image = self.costume.image
         self.rect = self.image.get_rect()
         self.mask = pygame.mask.from_surface(self.image)
+        self._mask_image = self.image
 
         self._update_rect_from_regpoint()
 
@@ -147,11 +278,14 @@ class Actor(pygame.sprite.Sprite):
         else:
             self.look_at("normal")
         
-    def add_event(self, event_type, callback, *user_args):
-        """Register a callback for a specific ActorEvents type."""
+    def add_event(self, event_type, callback, *user_args, animation=None):
+        """
+        Register a callback for a specific ActorEvents type.
+        animation="name" only fires for that animation (ANIMATION_END).
+        """
         if event_type not in self._event_handlers:
             self._event_handlers[event_type] = []
-        self._event_handlers[event_type].append((callback, user_args))
+        self._event_handlers[event_type].append((callback, user_args, animation))
 
     def remove_event(self, event_type, callback):
         """Remove all handlers for an event type using the given callback."""
@@ -163,13 +297,14 @@ class Actor(pygame.sprite.Sprite):
         cb_func = getattr(callback, "__func__", callback)
 
         new_handlers = []
-        for cb, args in handlers:
+        for handler in handlers:
+            cb = handler[0]
             h_self = getattr(cb, "__self__", None)
             h_func = getattr(cb, "__func__", cb)
 
             # keep only those that don't match
             if not (h_self is cb_self and h_func is cb_func):
-                new_handlers.append((cb, args))
+                new_handlers.append(handler)
 
         if new_handlers:
             self._event_handlers[event_type] = new_handlers
@@ -191,31 +326,111 @@ class Actor(pygame.sprite.Sprite):
         if not handlers:
             return
 
+        animation = event_data.get("animation")
+
         # Iterate over a snapshot so handlers can remove themselves safely
-        for callback, user_args in list(handlers):
+        for callback, user_args, only_animation in list(handlers):
+            if only_animation is not None and only_animation != animation:
+                continue
             callback(self, event_data, *user_args)
 
 
     # --- Positioning code ---
-    def _update_rect_from_regpoint(self):
-        rx, ry = self.costume.reg_point
-        self.rect.topleft = (self.pos.x - rx, self.pos.y - ry)
+    def _update_rect_from_regpoint(self, reg_point=None):
+        rx, ry = reg_point if reg_point is not None else self.costume.reg_point
+        self._reg_point = (rx, ry)
+        slot = self._slot
+        self.rect.topleft = (actor_store.x[slot] - rx, actor_store.y[slot] - ry)
+        actor_store.dirty[slot] = 0
+
+    def _sync_rect(self):
+        """Catch the rect up with a bulk store move (Room.move_actors) before hit-testing."""
+        if actor_store.dirty[self._slot]:
+            self._update_rect_from_regpoint(self._reg_point)
+
+    # --- Walking ---
+    def walk_to(self, x: float, y: float, on_done: Callable | None = None, speed: float | None = None) -> list:
+        """
+        Walk to (x, y) along the room's walkboxes (straight line if the room has none).
+        Fires WALK_END and on_done() on arrival. Returns the waypoints.
+        """
+        walkboxes = getattr(self.room, "walkboxes", None) if self.room is not None else None
+        start = (actor_store.x[self._slot], actor_store.y[self._slot])
+        path = walkboxes.path(start, (x, y)) if walkboxes is not None else [(float(x), float(y))]
+
+        self.stop_walking(arrived=False)
+        if speed is not None:
+            self.walk_speed = speed
+        self._walk_path = deque(path)
+        self._walk_done = on_done
+        return path
+
+    def stop_walking(self, arrived: bool = False) -> None:
+        if not self._walk_path and self._walk_done is None:
+            return
+        self._walk_path.clear()
+        on_done, self._walk_done = self._walk_done, None
+        self._fire_event(ActorEvents.WALK_END, arrived=arrived)
+        event_bus.publish(ActorEvents.WALK_END, self, arrived=arrived)
+        if arrived and on_done is not None:
+            on_done()
+
+    @property
+    def walking(self) -> bool:
+        return bool(self._walk_path)
+
+    def _step_walk(self, dt: float) -> None:
+        slot = self._slot
+        x, y = actor_store.x[slot], actor_store.y[slot]
+        budget = self.walk_speed * dt
+        path = self._walk_path
+        while path and budget > 0:
+            tx, ty = path[0]
+            d = math.hypot(tx - x, ty - y)
+            if d <= budget:
+                x, y = tx, ty
+                budget -= d
+                path.popleft()
+            else:
+                x += (tx - x) * budget / d
+                y += (ty - y) * budget / d
+                budget = 0
+        actor_store.x[slot] = x
+        actor_store.y[slot] = y
+        if not path:
+            self.stop_walking(arrived=True)
 
     def update(self, dt: float):
-        self.costume.update(dt)
-        self.image = self.costume.image
-        self._update_rect_from_regpoint()
+        if self._walk_path:
+            self._step_walk(dt)
+        costume = self.costume
+        costume.update(dt)
+        room = self.room
+        if room is not None and room.walkboxes is not None:
+            self.scale = room.scale_at(actor_store.y[self._slot])
+        # one call: layered costumes compose once instead of once for image and once for reg_point
+        self.image, reg_point = costume.current_frame(self.scale)
+        # frames are trimmed to their visible pixels, so sizes differ from frame to frame
+        self.rect.size = self.image.get_size()
+        actor_store.frame[self._slot] = costume.frame_index
+        self._update_rect_from_regpoint(reg_point)
 
     def collidepoint(self, pos):       
+        self._sync_rect()
         x = pos[0] - self.rect.x
         y = pos[1] - self.rect.y
 
         # Avoid index error
         if 0 <= x < self.rect.width and 0 <= y < self.rect.height:
+            if self._mask_image is not self.image:
+                # hit-test the frame on screen; rebuilt only when hovering a new frame
+                self.mask = pygame.mask.from_surface(self.image)
+                self._mask_image = self.image
             return self.mask.get_at((x, y))
         return False
 
     def colliderect(self, *args):
+        self._sync_rect()
         return self.rect.colliderect(*args)
 
     def collide(self, *args):
@@ -237,6 +452,7 @@ class Actor(pygame.sprite.Sprite):
 
         # Clear event listeners
         self._event_handlers.clear()
+        event_bus.unsubscribe_actor(self.actor_id)
 
         # Tell the costume it no longer has an actor
         if hasattr(self.costume, "actor") and self.costume.actor is self:
@@ -248,15 +464,25 @@ class Actor(pygame.sprite.Sprite):
         # print(f"[Actor] Destroyed: {self.actor_id} - {self.__name__}")
 
     @property
-    def x(self): return self.pos.x
+    def pos(self) -> pygame.math.Vector2:
+        """A copy; assign actor.pos / actor.x / actor.y to move the actor."""
+        return pygame.math.Vector2(actor_store.x[self._slot], actor_store.y[self._slot])
+    @pos.setter
+    def pos(self, value):
+        actor_store.x[self._slot] = value[0]
+        actor_store.y[self._slot] = value[1]
+        self._update_rect_from_regpoint()
+
+    @property
+    def x(self): return actor_store.x[self._slot]
     @x.setter
     def x(self, v):
-        self.pos.x = v
+        actor_store.x[self._slot] = v
         self._update_rect_from_regpoint()
 
     @property
-    def y(self): return self.pos.y
+    def y(self): return actor_store.y[self._slot]
     @y.setter
     def y(self, v):
-        self.pos.y = v
+        actor_store.y[self._slot] = v
         self._update_rect_from_regpoint()
@@ -0,0 +1,136 @@
+"""
+Batched animation stepping.
+
+Every running costume timeline in a room (one per single-sheet costume, one per
+layer of a layered costume) gets a slot in flat NumPy arrays:
+
+    t         accumulated time in the current frame
+    duration  seconds per frame (1 / (framerate * speed))
+    idx       current index into the timeline's frame list
+    count     frames in the timeline
+    active    False for paused/stopped timelines
+
+`AnimationBatch.step(dt)` advances all of them with a few vector ops. Timelines
+that merely moved forward get their new index written back; only timelines
+that reached their end go through the costume's Python stepping code, which
+fires ANIMATION_END and follows "next" animations.
+
+NumPy is optional: without it `AnimationBatch.available()` is False and rooms
+let each costume update itself as before.
+"""
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+
+class AnimationBatch:
+    def __init__(self, capacity: int = 64):
+        self._capacity = 0
+        self.t = None
+        self.duration = None
+        self.idx = None
+        self.count = None
+        self.active = None
+        self.gen = None
+        # slot -> (costume, layer_name | None) or None when free
+        self._owners: list[Optional[tuple]] = []
+        self._free: list[int] = []
+        self._grow(max(1, capacity))
+
+    @staticmethod
+    def available() -> bool:
+        return np is not None
+
+    def _grow(self, capacity: int) -> None:
+        old = self._capacity
+
+        def grown(arr, dtype, fill):
+            new = np.full(capacity, fill, dtype=dtype)
+            if arr is not None:
+                new[:old] = arr[:old]
+            return new
+
+        self.t = grown(self.t, np.float64, 0.0)
+        self.duration = grown(self.duration, np.float64, 1.0)
+        self.idx = grown(self.idx, np.int32, 0)
+        self.count = grown(self.count, np.int32, 0)
+        self.active = grown(self.active, np.bool_, False)
+        self.gen = grown(self.gen, np.int64, 0)
+        self._owners.extend([None] * (capacity - old))
+        self._free.extend(range(capacity - 1, old - 1, -1))
+        self._capacity = capacity
+
+    # -----------------------------
+    # Slots
+    # -----------------------------
+    def alloc(self, costume, layer_name: Optional[str] = None) -> int:
+        if not self._free:
+            self._grow(self._capacity * 2)
+        slot = self._free.pop()
+        self._owners[slot] = (costume, layer_name)
+        self.t[slot] = 0.0
+        self.active[slot] = False
+        self.gen[slot] += 1
+        return slot
+
+    def release(self, slot: int) -> None:
+        self._owners[slot] = None
+        self.active[slot] = False
+        self.gen[slot] += 1
+        self._free.append(slot)
+
+    def set(self, slot: int, *, active: bool, idx: int = 0, count: int = 0,
+            duration: float = 1.0, t: Optional[float] = None) -> None:
+        """Costumes call this whenever a timeline is (re)started, stopped or switches animation."""
+        self.active[slot] = bool(active) and count > 0 and duration > 0
+        self.idx[slot] = idx
+        self.count[slot] = count
+        self.duration[slot] = duration if duration > 0 else 1.0
+        if t is not None:
+            self.t[slot] = t
+        self.gen[slot] += 1
+
+    # -----------------------------
+    # Per-frame
+    # -----------------------------
+    def step(self, dt: float) -> None:
+        n = self._capacity
+        active = self.active[:n]
+        if dt <= 0 or not active.any():
+            return
+
+        t = self.t[:n]
+        duration = self.duration[:n]
+        t[active] += dt
+
+        steps = np.zeros(n, dtype=np.int32)
+        steps[active] = np.floor(t[active] / duration[active]).astype(np.int32)
+        moved = np.flatnonzero(steps)
+        if moved.size == 0:
+            return
+
+        t[moved] -= steps[moved] * duration[moved]
+        new_idx = self.idx[moved] + steps[moved]
+        ended = new_idx >= self.count[moved]
+
+        # 1. Timelines that only moved forward: write the index back, no events
+        advanced = moved[~ended]
+        self.idx[advanced] = new_idx[~ended]
+        for slot, idx in zip(advanced.tolist(), new_idx[~ended].tolist()):
+            costume, layer_name = self._owners[slot]
+            costume._batched_set_index(layer_name, idx)
+
+        # 2. Timelines that reached their end: full Python stepping (events, "next" animations).
+        #    Handlers may restart/stop/replace other timelines, so skip slots touched meanwhile.
+        wrapped = moved[ended]
+        if wrapped.size == 0:
+            return
+        pending = [(slot, int(steps[slot]), self._owners[slot], int(self.gen[slot])) for slot in wrapped.tolist()]
+        for slot, slot_steps, owner, gen in pending:
+            if self._owners[slot] is not owner or self.gen[slot] != gen:
+                continue
+            costume, layer_name = owner
+            costume._batched_step(layer_name, slot_steps)
@@ -0,0 +1,346 @@
+"""
+Texture atlases for room sprites and costume frames.
+
+Offline, `build_room_atlas()` bin-packs every sprite image of a room and every
+frame rect of the room's costume sheets into a few large atlas pages and writes
+a rect index next to them:
+
+    assets/rooms/<room>/atlas/atlas.json
+    assets/rooms/<room>/atlas/atlas_0.png, atlas_1.png, ...
+
+Costume frames are baked on the way in: each frame is trimmed to its visible
+(alpha > 0) pixels, the offset of the trimmed rect is stored so reg points can
+be moved by it, and frames with identical pixels (across all of the room's
+costumes and layers) share one region of the atlas.
+
+At runtime `Resources.load_room_image()` and `Resources.load_room_costume()`
+look the room's atlas up and hand out subsurfaces of the pages instead of
+decoding every image separately.
+
+Build from the game folder:
+    python -m scummypy.atlas street goat
+"""
+import os
+import json
+import hashlib
+from typing import Optional
+
+import pygame
+
+ATLAS_DIR = "atlas"
+ATLAS_INDEX = "atlas.json"
+ATLAS_VERSION = 2
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+# -----------------------------
+# Packing
+# -----------------------------
+def pack_rects(sizes: list[tuple[int, int]], page_size: int = 2048, padding: int = 1) -> list[tuple[int, int, int]]:
+    """
+    Shelf bin-packer. Returns (page, x, y) for every (w, h) in `sizes`, in input order.
+    Tallest rects are placed first so shelves waste as little height as possible.
+    """
+    placements: list[tuple[int, int, int]] = [(0, 0, 0)] * len(sizes)
+    # pages[i] = {"shelves": [[y, height, x_cursor], ...], "bottom": next free y}
+    pages: list[dict] = []
+
+    order = sorted(range(len(sizes)), key=lambda i: (sizes[i][1], sizes[i][0]), reverse=True)
+    for i in order:
+        w, h = sizes[i]
+        pw, ph = w + padding, h + padding
+        if w > page_size or h > page_size:
+            raise ValueError(f"[atlas.py] {w}x{h} does not fit in a {page_size}px atlas page")
+
+        placed = False
+        for page_idx, page in enumerate(pages):
+            # 1. an existing shelf that is tall enough and still has room
+            for shelf in page["shelves"]:
+                y, shelf_h, x = shelf
+                if h <= shelf_h and x + w <= page_size:
+                    placements[i] = (page_idx, x, y)
+                    shelf[2] = x + pw
+                    placed = True
+                    break
+            if placed:
+                break
+
+            # 2. a new shelf at the bottom of this page
+            if page["bottom"] + h <= page_size:
+                y = page["bottom"]
+                page["shelves"].append([y, ph, pw])
+                page["bottom"] = y + ph
+                placements[i] = (page_idx, 0, y)
+                placed = True
+                break
+
+        if not placed:
+            pages.append({"shelves": [[0, ph, pw]], "bottom": ph})
+            placements[i] = (len(pages) - 1, 0, 0)
+
+    return placements
+
+
+def _collect_costume_sheets(room_dir: str) -> dict[str, set[tuple[int, int, int, int]]]:
+    """{ "cost/PUTT/int-stat-left.png": {(fx, fy, fw, fh), ...} } for every costume json in the room."""
+    sheets: dict[str, set[tuple[int, int, int, int]]] = {}
+    cost_dir = os.path.join(room_dir, "cost")
+    if not os.path.isdir(cost_dir):
+        return sheets
+
+    for root, _, files in os.walk(cost_dir):
+        for file in sorted(files):
+            if not file.endswith(".json"):
+                continue
+            json_path = os.path.join(root, file)
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+
+            base_url = data.get("base_url", None)
+            if base_url is not None:
+                for layer in data.get("layers", {}).values():
+                    if not isinstance(layer, dict) or layer.get("src"):
+                        continue
+                    images = layer.get("images", [])
+                    for frame in layer.get("frames", []):
+                        fx, fy, fw, fh, imageIndex = frame[:5]
+                        if not (0 <= imageIndex < len(images)):
+                            continue
+                        key = _sheet_key("cost", base_url, images[imageIndex])
+                        sheets.setdefault(key, set()).add((fx, fy, fw, fh))
+            else:
+                stem = os.path.relpath(json_path, cost_dir)[:-len(".json")]
+                key = _sheet_key("cost", f"{stem}.png")
+                for frame in data.get("frames", []):
+                    fx, fy, fw, fh = frame[:4]
+                    sheets.setdefault(key, set()).add((fx, fy, fw, fh))
+
+    return sheets
+
+
+def _sheet_key(*parts) -> str:
+    return "/".join(str(p).replace("\\", "/").strip("/") for p in parts if str(p).strip("/\\"))
+
+
+def trim_rect(surf: pygame.Surface) -> pygame.Rect:
+    """Bounding rect of the visible pixels (alpha/colorkey aware); 1x1 for a fully transparent frame."""
+    bounds = surf.get_bounding_rect()
+    if bounds.w == 0 or bounds.h == 0:
+        return pygame.Rect(0, 0, min(1, surf.get_width()), min(1, surf.get_height()))
+    return bounds
+
+
+def frame_hash(surf: pygame.Surface) -> bytes:
+    """Content hash of a frame's pixels (size included, so 2x8 and 8x2 never collide)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(b"%dx%d" % surf.get_size())
+    h.update(pygame.image.tobytes(surf, "RGBA"))
+    return h.digest()
+
+
+def _to_rgba(surf: pygame.Surface) -> pygame.Surface:
+    """Display-independent equivalent of convert_alpha(): colorkeys become alpha."""
+    out = pygame.Surface(surf.get_size(), pygame.SRCALPHA, 32)
+    out.blit(surf, (0, 0))
+    return out
+
+
+def load_rgba(path: str) -> pygame.Surface:
+    return _to_rgba(pygame.image.load(path))
+
+
+def trim_sheet_frames(surf: pygame.Surface, rects) -> list[tuple[tuple[int, int, int, int], int, int, pygame.Surface]]:
+    """(frame rect, trim x, trim y, trimmed frame) for every frame rect of a sheet, in sorted rect order."""
+    frames = []
+    bounds = surf.get_rect()
+    for rect in sorted(rects):
+        fx, fy, fw, fh = rect
+        # zero-sized "blank" frames and rects running off the sheet keep the runtime slicing path
+        if fw <= 0 or fh <= 0 or not bounds.contains(pygame.Rect(rect)):
+            continue
+        trim = trim_rect(surf.subsurface(rect))
+        frames.append((rect, trim.x, trim.y, surf.subsurface((fx + trim.x, fy + trim.y, trim.w, trim.h))))
+    return frames
+
+
+def _sheet_frames(path: str, rects):
+    return trim_sheet_frames(load_rgba(path), rects)
+
+
+def build_room_atlas(room_dir: str, page_size: int = 2048, padding: int = 1, out_dir: Optional[str] = None,
+                     load_image=load_rgba, sheet_frames=_sheet_frames) -> dict:
+    """
+    Pack the room's sprite images and costume frames into atlas pages and write the index
+    to out_dir (default <room_dir>/atlas; `python -m scummypy build` bakes into its cache).
+    Backgrounds (bg.*) stay separate: they are opaque, screen-sized and blitted with convert().
+    load_image(path) / sheet_frames(path, rects) decode and trim the sources; the build
+    passes versions that answer from its per-file cache. Returns the index that was written.
+    """
+    # (kind, key, surface) for every region that goes into the atlas
+    regions: list[tuple[str, str, pygame.Surface]] = []
+    # costume frames: { (sheet key, frame rect): (region index, trim x, trim y) }
+    frames: dict[tuple[str, tuple[int, int, int, int]], tuple[int, int, int]] = {}
+    by_hash: dict[bytes, int] = {}          # frame content hash -> region index
+    frame_px = trimmed_px = 0
+
+    for name in sorted(os.listdir(room_dir)):
+        path = os.path.join(room_dir, name)
+        if not os.path.isfile(path) or not name.lower().endswith(IMAGE_EXTS):
+            continue
+        if os.path.splitext(name)[0].lower() == "bg":
+            continue
+        surf = load_image(path)
+        if surf.get_width() > page_size or surf.get_height() > page_size:
+            continue
+        regions.append(("image", name, surf))
+
+    for key, rects in sorted(_collect_costume_sheets(room_dir).items()):
+        path = os.path.join(room_dir, *key.split("/"))
+        if not os.path.isfile(path):
+            print(f"[atlas.py] missing costume sheet {path}")
+            continue
+        for rect, trim_x, trim_y, frame in sheet_frames(path, rects):
+            digest = frame_hash(frame)
+            region_idx = by_hash.get(digest)
+            if region_idx is None:
+                region_idx = by_hash[digest] = len(regions)
+                regions.append(("sheet", key, frame))
+            frames[(key, rect)] = (region_idx, trim_x, trim_y)
+            frame_px += rect[2] * rect[3]
+            trimmed_px += frame.get_width() * frame.get_height()
+
+    placements = pack_rects([r[2].get_size() for r in regions], page_size, padding)
+    page_count = max((p[0] for p in placements), default=-1) + 1
+
+    pages = [pygame.Surface((page_size, page_size), pygame.SRCALPHA, 32) for _ in range(page_count)]
+    page_used = [[0, 0] for _ in range(page_count)]
+    index: dict = {
+        "version": ATLAS_VERSION,
+        "page_size": page_size,
+        "pages": [],
+        "images": {},
+        "sheets": {},
+    }
+
+    for (kind, key, surf), (page_idx, x, y) in zip(regions, placements):
+        fw, fh = surf.get_size()
+        pages[page_idx].blit(surf, (x, y))
+        page_used[page_idx][0] = max(page_used[page_idx][0], x + fw)
+        page_used[page_idx][1] = max(page_used[page_idx][1], y + fh)
+
+        if kind == "image":
+            index["images"][key] = [page_idx, x, y, fw, fh]
+
+    # frame rect -> [page, x, y, trim x, trim y, w, h] of its (possibly shared) region
+    for (key, rect), (region_idx, trim_x, trim_y) in sorted(frames.items()):
+        page_idx, x, y = placements[region_idx]
+        w, h = regions[region_idx][2].get_size()
+        index["sheets"].setdefault(key, {})[_rect_key(rect)] = [page_idx, x, y, trim_x, trim_y, w, h]
+
+    out_dir = out_dir or os.path.join(room_dir, ATLAS_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    for old in os.listdir(out_dir):
+        if old.startswith("atlas_") and old.endswith(".png"):
+            os.remove(os.path.join(out_dir, old))
+
+    for page_idx, page in enumerate(pages):
+        # trim unused space so the last page is not a mostly empty 2048x2048 decode
+        w, h = page_used[page_idx]
+        page_name = f"atlas_{page_idx}.png"
+        pygame.image.save(page.subsurface((0, 0, max(1, w), max(1, h))), os.path.join(out_dir, page_name))
+        index["pages"].append(page_name)
+
+    with open(os.path.join(out_dir, ATLAS_INDEX), "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"))
+
+    print(f"[atlas.py] {out_dir}: {len(regions)} regions -> {page_count} page(s)")
+    if frames:
+        unique = sum(1 for kind, _, _ in regions if kind == "sheet")
+        print(f"[atlas.py]   {len(frames)} costume frames -> {unique} unique, "
+              f"trimmed {frame_px} -> {trimmed_px} px")
+    return index
+
+
+def _rect_key(rect) -> str:
+    return ",".join(str(int(v)) for v in rect)
+
+
+# -----------------------------
+# Runtime lookups
+# -----------------------------
+class AtlasSheet:
+    """Stands in for a costume sheet surface; frames are handed out as atlas subsurfaces."""
+    def __init__(self, atlas: "RoomAtlas", frames: dict[str, list[int]]):
+        self.atlas = atlas
+        self._frames = frames
+
+    def frame(self, fx: int, fy: int, fw: int, fh: int) -> Optional[tuple[pygame.Surface, tuple[int, int]]]:
+        """(trimmed frame region, offset of the trimmed rect inside the frame rect) or None."""
+        entry = self._frames.get(_rect_key((fx, fy, fw, fh)))
+        if entry is None:
+            return None
+        page_idx, x, y, trim_x, trim_y, w, h = entry
+        return self.atlas.page(page_idx).subsurface((x, y, w, h)), (trim_x, trim_y)
+
+
+class RoomAtlas:
+    def __init__(self, atlas_dir: str, index: dict):
+        self.atlas_dir = atlas_dir
+        self.index = index
+        self._pages: dict[int, pygame.Surface] = {}
+
+    @classmethod
+    def load(cls, room_dir: str, atlas_dir: Optional[str] = None) -> Optional["RoomAtlas"]:
+        """
+        Returns None when the room has no (current) atlas; callers then load files directly.
+        atlas_dir: a built atlas from the build manifest instead of <room_dir>/atlas.
+        """
+        atlas_dir = atlas_dir or os.path.join(room_dir, ATLAS_DIR)
+        index_path = os.path.join(atlas_dir, ATLAS_INDEX)
+        if not os.path.isfile(index_path):
+            return None
+
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != ATLAS_VERSION:
+            print(f"[atlas.py] ignoring {index_path}: version {index.get('version')} != {ATLAS_VERSION}")
+            return None
+        return cls(atlas_dir, index)
+
+    def page(self, page_idx: int) -> pygame.Surface:
+        page = self._pages.get(page_idx)
+        if page is None:
+            path = os.path.join(self.atlas_dir, self.index["pages"][page_idx])
+            page = pygame.image.load(path).convert_alpha()
+            self._pages[page_idx] = page
+        return page
+
+    def image(self, name: str) -> Optional[pygame.Surface]:
+        entry = self.index["images"].get(name)
+        if entry is None:
+            return None
+        page_idx, x, y, w, h = entry
+        return self.page(page_idx).subsurface((x, y, w, h))
+
+    def sheet(self, key: str) -> Optional[AtlasSheet]:
+        frames = self.index["sheets"].get(key)
+        if frames is None:
+            return None
+        return AtlasSheet(self, frames)
+
+
+if __name__ == "__main__":
+    import argparse
+    import scummypy.resources as Resources
+
+    parser = argparse.ArgumentParser(description="Pack room sprites and costume frames into texture atlases.")
+    parser.add_argument("rooms", nargs="*", help="room folder names under assets/rooms (default: all)")
+    parser.add_argument("--page-size", type=int, default=2048)
+    parser.add_argument("--padding", type=int, default=1)
+    args = parser.parse_args()
+
+    rooms_root = Resources._join("rooms")
+    rooms = args.rooms or sorted(d for d in os.listdir(rooms_root) if os.path.isdir(os.path.join(rooms_root, d)))
+    for room in rooms:
+        build_room_atlas(os.path.join(rooms_root, room), args.page_size, args.padding)
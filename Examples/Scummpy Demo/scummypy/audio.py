@@ -1,6 +1,10 @@
+import os
 import time
 import pygame
 
+from . import resources as Resources
+from .soundbank import MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS
+
 class AudioEventScheduler:
     """
     Fires callbacks when audio position reaches given timestamps.
@@ -138,7 +142,8 @@ class AudioManager:
     def __init__(self, num_channels: int = 20):
         print(f'[audio.py] AudioManager(num_channels={num_channels})')
         if not pygame.mixer.get_init():
-            pygame.mixer.init()
+            # the format the sound bank is baked in (also pygame's default)
+            pygame.mixer.init(MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS)
         pygame.mixer.set_num_channels(num_channels)
 
         # Pre-allocate channels for deterministic behavior
@@ -147,13 +152,50 @@ class AudioManager:
         # Sounds cache
         self.cache = {}
         self.sounds_playing: list[AudioHandle] = []
+        self._prefetching: set[str] = set()   # filepaths decoding on the loader pool
+
+        # pre-decoded sfx/talkies from `python -m scummypy build` (None: decode the files)
+        self.bank = Resources.sound_bank()
+        if self.bank is not None:
+            print(f"[audio.py] using sound bank {self.bank.path} ({len(self.bank)} sounds)")
 
     def load(self, filepath: str) -> pygame.mixer.Sound:
-        """Load (and cache) a sound file."""
+        """Load (and cache) a sound file; from the sound bank when it has it, no decoding."""
         if filepath not in self.cache:
-            self.cache[filepath] = pygame.mixer.Sound(filepath)
+            sound = self.bank.get(filepath) if self.bank is not None else None
+            self.cache[filepath] = sound or pygame.mixer.Sound(filepath)
         return self.cache[filepath]
 
+    def prefetch(self, filepaths: list[str]) -> int:
+        """
+        Decode sounds on the loader pool so a later load() is a cache hit. Results land in
+        the cache on the main thread (Resources.process_loaded()). Returns how many started.
+        """
+        started = 0
+        for filepath in filepaths:
+            if filepath in self.cache or filepath in self._prefetching:
+                continue
+            if self.bank is not None and filepath in self.bank:
+                continue   # already decoded: load() is a copy out of the bank
+            rel = os.path.relpath(os.path.abspath(filepath), Resources.ASSETS_ROOT)
+            if rel.startswith(".."):
+                continue
+
+            def store(sounds, filepath=filepath):
+                self._prefetching.discard(filepath)
+                self.cache.setdefault(filepath, sounds[0])
+
+            def failed(future, filepath=filepath):
+                # store() never runs for a failed decode; let a later load()/prefetch() retry
+                if future.exception() is not None:
+                    self._prefetching.discard(filepath)
+
+            self._prefetching.add(filepath)
+            batch = Resources.load_sounds_async([rel], on_done=store)
+            batch.futures[0].add_done_callback(failed)
+            started += 1
+        return started
+
     def play(self, sound: pygame.mixer.Sound, filename, soundChannel: int, loop: bool = False) -> AudioHandle:
         if soundChannel != -1 and self.channels[soundChannel]:
             channel = self.channels[soundChannel]      # << always honor explicit channel
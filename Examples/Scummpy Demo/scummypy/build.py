@@ -0,0 +1,418 @@
+"""
+Offline asset build.
+
+    python -m scummypy build                 bake everything that changed
+    python -m scummypy build atlas -j 4      only the atlas baker, 4 processes
+    python -m scummypy build --force         re-bake even when cached
+    python -m scummypy build --prune         also delete cache entries nothing uses
+
+Every baker turns a set of files under assets/ into outputs (room atlases with
+trimmed, deduplicated costume frames; walkbox next-hop tables; the pre-decoded
+PCM sound bank of sfx and talkies). A bake job is
+keyed by the content hashes of its inputs plus the baker's version, and its
+outputs live in build/cache/<baker>/<key>/. A job whose key is already in the
+cache is skipped, so a rebuild only re-bakes what an edit actually touched and
+a rebuild with nothing changed is a stat() per asset. File hashes are cached by
+(size, mtime) in build/hashes.json so unchanged files are never re-read.
+
+The expensive per-file work is cached on its own in build/pieces/<kind>/, named
+after the source file's content hash (see Pieces): the decoded PCM of each
+sound, the decoded RGBA of each sprite image and the trimmed frames of each
+costume sheet. Touching one talkie re-bakes the bank job, but that is one
+decode plus concatenating the other sounds' cached PCM; touching one costume
+sheet re-trims that sheet and re-packs the room's atlas from cached frames.
+
+Jobs that do need baking run on a process pool (pygame's image work holds the
+GIL). The build ends by writing build/manifest.json:
+
+    {"version": 1, "assets": {"rooms/street/atlas": "cache/atlas/3f9c.../", ...}}
+
+which Resources.built_asset() reads at runtime: loaders use the baked output
+when there is one and fall back to the source assets when there isn't.
+"""
+import os
+import json
+import time
+import shutil
+import struct
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+import pygame
+
+from .atlas import build_room_atlas, load_rgba, trim_sheet_frames, ATLAS_DIR, IMAGE_EXTS
+from .walkbox import bake_room_walkboxes, WALKBOX_FILE
+from .soundbank import baking_mixer, decode_sound, write_sound_bank, BANK_FILE, BANK_DIRS, SOUND_EXTS
+
+BUILD_DIR = "build"
+CACHE_DIR = "cache"
+PIECES_DIR = "pieces"
+MANIFEST_FILE = "manifest.json"
+HASHES_FILE = "hashes.json"
+MANIFEST_VERSION = 1
+
+
+# -----------------------------
+# Bakers
+# -----------------------------
+@dataclass(frozen=True, slots=True)
+class Job:
+    baker: str
+    target: str                  # manifest key, e.g. "rooms/street/atlas"
+    inputs: tuple[str, ...]      # asset-relative paths ("/" separated) the output depends on
+    room: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class Baker:
+    name: str
+    version: int                 # bump when the output format/algorithm changes: invalidates the cache
+    find_jobs: Callable[[str], list[Job]]
+    bake: Callable[[Job, str, str, "Pieces"], None]     # (job, assets root, output dir, per-file cache)
+    output: str = ""             # what the manifest points at inside the output dir ("" = the dir)
+
+
+def _rooms(assets_root: str) -> list[str]:
+    rooms_root = os.path.join(assets_root, "rooms")
+    if not os.path.isdir(rooms_root):
+        return []
+    return sorted(d for d in os.listdir(rooms_root) if os.path.isdir(os.path.join(rooms_root, d)))
+
+
+def _files_under(assets_root: str, *parts: str) -> list[str]:
+    root = os.path.join(assets_root, *parts)
+    found = []
+    for dirpath, _, files in os.walk(root):
+        for file in files:
+            found.append(os.path.relpath(os.path.join(dirpath, file), assets_root).replace(os.sep, "/"))
+    return sorted(found)
+
+
+def _atlas_jobs(assets_root: str) -> list[Job]:
+    jobs = []
+    for room in _rooms(assets_root):
+        room_dir = os.path.join(assets_root, "rooms", room)
+        # exactly what build_room_atlas() reads: sprite images next to bg.* and the cost/ tree
+        inputs = [f"rooms/{room}/{name}" for name in sorted(os.listdir(room_dir))
+                  if name.lower().endswith(IMAGE_EXTS) and os.path.splitext(name)[0].lower() != "bg"
+                  and os.path.isfile(os.path.join(room_dir, name))]
+        inputs += _files_under(assets_root, "rooms", room, "cost")
+        if inputs:
+            jobs.append(Job("atlas", f"rooms/{room}/{ATLAS_DIR}", tuple(inputs), room))
+    return jobs
+
+
+def _bake_atlas(job: Job, assets_root: str, out_dir: str, pieces: "Pieces") -> None:
+    def load_image(path):
+        rel = pieces.rel(path)
+        data = pieces.get("image", rel)
+        if data is None:
+            surf = load_rgba(path)
+            pieces.put("image", rel, _pack_frames(surf.get_size(), [((0, 0, 0, 0), 0, 0, surf)]))
+            return surf
+        return _unpack_frames(data)[0][3]
+
+    def sheet_frames(path, rects):
+        rel = pieces.rel(path)
+        # the frame rects come from the costume jsons: a different set is a different piece
+        variant = hashlib.sha256(repr(sorted(rects)).encode()).hexdigest()[:16]
+        data = pieces.get("frames", rel, variant)
+        if data is None:
+            surf = load_rgba(path)
+            frames = trim_sheet_frames(surf, rects)
+            pieces.put("frames", rel, _pack_frames(surf.get_size(), frames), variant)
+            return frames
+        return _unpack_frames(data)
+
+    build_room_atlas(os.path.join(assets_root, "rooms", job.room), out_dir=out_dir,
+                     load_image=load_image, sheet_frames=sheet_frames)
+    print(f"[build.py] {job.target}: {pieces.misses} of {pieces.misses + pieces.hits} images decoded")
+
+
+def _pack_frames(size: tuple[int, int], frames: list) -> bytes:
+    """Trimmed frames as one piece: u32 header size | JSON header | RGBA rows of every frame."""
+    header = {"size": list(size), "frames": []}
+    pixels = []
+    for rect, trim_x, trim_y, surf in frames:
+        header["frames"].append([*rect, trim_x, trim_y, *surf.get_size()])
+        pixels.append(pygame.image.tobytes(surf, "RGBA"))
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    return struct.pack("<I", len(header_bytes)) + header_bytes + b"".join(pixels)
+
+
+def _unpack_frames(data: bytes) -> list:
+    (header_size,) = struct.unpack_from("<I", data, 0)
+    header = json.loads(data[4:4 + header_size].decode("utf-8"))
+    offset = 4 + header_size
+    frames = []
+    for fx, fy, fw, fh, trim_x, trim_y, w, h in header["frames"]:
+        size = w * h * 4
+        surf = pygame.image.frombytes(data[offset:offset + size], (w, h), "RGBA")
+        frames.append(((fx, fy, fw, fh), trim_x, trim_y, surf))
+        offset += size
+    return frames
+
+
+def _walkbox_jobs(assets_root: str) -> list[Job]:
+    return [Job("walkbox", f"rooms/{room}/walkboxes", (f"rooms/{room}/{WALKBOX_FILE}",), room)
+            for room in _rooms(assets_root)
+            if os.path.isfile(os.path.join(assets_root, "rooms", room, WALKBOX_FILE))]
+
+
+def _bake_walkboxes(job: Job, assets_root: str, out_dir: str, pieces: "Pieces") -> None:
+    bake_room_walkboxes(os.path.join(assets_root, "rooms", job.room), os.path.join(out_dir, WALKBOX_FILE))
+
+
+def _sound_bank_jobs(assets_root: str) -> list[Job]:
+    inputs = [rel for folder in BANK_DIRS for rel in _files_under(assets_root, *folder.split("/"))
+              if rel.lower().endswith(SOUND_EXTS)]
+    return [Job("soundbank", "audio/bank", tuple(inputs))] if inputs else []
+
+
+def _bake_sound_bank(job: Job, assets_root: str, out_dir: str, pieces: "Pieces") -> None:
+    blobs = []
+    with baking_mixer() as fmt:
+        variant = "{}_{}_{}".format(*fmt)
+        for rel in job.inputs:
+            raw = pieces.get("pcm", rel, variant)
+            if raw is None:
+                raw = decode_sound(os.path.join(assets_root, *rel.split("/")))
+                pieces.put("pcm", rel, raw, variant)
+            blobs.append((rel, raw))
+    write_sound_bank(os.path.join(out_dir, BANK_FILE), fmt, blobs)
+    print(f"[build.py] {job.target}: {pieces.misses} of {len(job.inputs)} sounds decoded")
+
+
+BAKERS: dict[str, Baker] = {
+    "atlas": Baker("atlas", 2, _atlas_jobs, _bake_atlas),
+    "walkbox": Baker("walkbox", 1, _walkbox_jobs, _bake_walkboxes, WALKBOX_FILE),
+    # version covers soundbank.MIXER_*: bump it when the mixer format changes
+    "soundbank": Baker("soundbank", 1, _sound_bank_jobs, _bake_sound_bank, BANK_FILE),
+}
+
+
+# -----------------------------
+# Content hashes
+# -----------------------------
+class FileHashes:
+    """sha256 per asset file, re-read only when a file's size or mtime changed."""
+    def __init__(self, assets_root: str, path: str):
+        self.assets_root = assets_root
+        self.path = path
+        self.rehashed = 0
+        self._entries: dict[str, list] = {}   # { rel path: [size, mtime_ns, sha256 hex] }
+        if os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+
+    def get(self, rel: str) -> str:
+        st = os.stat(os.path.join(self.assets_root, *rel.split("/")))
+        entry = self._entries.get(rel)
+        if entry is not None and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            return entry[2]
+
+        h = hashlib.sha256()
+        with open(os.path.join(self.assets_root, *rel.split("/")), "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        self._entries[rel] = [st.st_size, st.st_mtime_ns, h.hexdigest()]
+        self.rehashed += 1
+        return h.hexdigest()
+
+    def live_entries(self) -> dict[str, list]:
+        """Entries of files that still exist."""
+        return {rel: entry for rel, entry in sorted(self._entries.items())
+                if os.path.isfile(os.path.join(self.assets_root, *rel.split("/")))}
+
+    def save(self) -> None:
+        # forget files that are gone so the table doesn't grow forever
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.live_entries(), f, separators=(",", ":"))
+
+
+class Pieces:
+    """
+    Per-file intermediate results in build/pieces/<kind>/<content hash>[-<variant>].
+    A piece is named after the sha256 of the file it came from (plus a variant for
+    whatever else it depends on, e.g. the mixer format), so any job that needs that
+    file's content again - after a rename, or when a sibling file changed - reuses it.
+    """
+    def __init__(self, root: str, assets_root: str, hashes: dict[str, str]):
+        self.root = root
+        self.assets_root = os.path.abspath(assets_root)
+        self.hashes = hashes        # { asset-relative path: sha256 } for the job's inputs
+        self.hits = 0
+        self.misses = 0
+
+    def rel(self, path: str) -> str:
+        return os.path.relpath(os.path.abspath(path), self.assets_root).replace(os.sep, "/")
+
+    def _path(self, kind: str, rel: str, variant: str) -> str:
+        name = self.hashes[rel][:32] + (f"-{variant}" if variant else "")
+        return os.path.join(self.root, kind, name)
+
+    def get(self, kind: str, rel: str, variant: str = "") -> bytes | None:
+        try:
+            with open(self._path(kind, rel, variant), "rb") as f:
+                data = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, kind: str, rel: str, data: bytes, variant: str = "") -> None:
+        path = self._path(kind, rel, variant)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp{os.getpid()}"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+
+def job_key(baker: Baker, job: Job, hashes: FileHashes) -> str:
+    h = hashlib.sha256()
+    h.update(f"{baker.name}:{baker.version}:{job.target}\n".encode())
+    for rel in job.inputs:
+        h.update(f"{rel}={hashes.get(rel)}\n".encode())
+    return h.hexdigest()[:32]
+
+
+# -----------------------------
+# Running
+# -----------------------------
+def _run_job(job: Job, assets_root: str, cache_dir: str, pieces_dir: str,
+             hashes: dict[str, str]) -> tuple[Job, float]:
+    """Process pool entry point: bake into a temp dir, then move it into place in one rename."""
+    started = time.perf_counter()
+    tmp_dir = f"{cache_dir}.tmp{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    try:
+        BAKERS[job.baker].bake(job, assets_root, tmp_dir, Pieces(pieces_dir, assets_root, hashes))
+        try:
+            os.replace(tmp_dir, cache_dir)
+        except OSError:
+            # another build got there first with the same content
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return job, time.perf_counter() - started
+
+
+def build(assets_root: str, build_root: str | None = None, bakers: list[str] | None = None,
+          workers: int | None = None, force: bool = False, prune: bool = False) -> dict:
+    """Bake what changed and write the manifest. Returns the manifest."""
+    started = time.perf_counter()
+    build_root = build_root or os.path.join(os.path.dirname(os.path.abspath(assets_root)), BUILD_DIR)
+    os.makedirs(os.path.join(build_root, CACHE_DIR), exist_ok=True)
+
+    manifest_path = os.path.join(build_root, MANIFEST_FILE)
+    manifest = {"version": MANIFEST_VERSION, "assets": {}, "jobs": {}}
+    if os.path.isfile(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            old = json.load(f)
+        if old.get("version") == MANIFEST_VERSION:
+            manifest = old
+
+    hashes = FileHashes(assets_root, os.path.join(build_root, HASHES_FILE))
+    selected = [BAKERS[name] for name in (bakers or BAKERS)]
+
+    # { target: (job, key, cache dir) } for every job, and the ones that need baking
+    planned: dict[str, tuple[Job, str, str]] = {}
+    todo: list[Job] = []
+    for baker in selected:
+        for job in baker.find_jobs(assets_root):
+            key = job_key(baker, job, hashes)
+            cache_dir = os.path.join(build_root, CACHE_DIR, baker.name, key)
+            planned[job.target] = (job, key, cache_dir)
+            if force and os.path.isdir(cache_dir):
+                shutil.rmtree(cache_dir)
+            if not os.path.isdir(cache_dir):
+                todo.append(job)
+
+    # targets of the selected bakers that no longer exist (room deleted, walkboxes removed)
+    for target, info in list(manifest["jobs"].items()):
+        if info["baker"] in {b.name for b in selected} and target not in planned:
+            manifest["jobs"].pop(target)
+            manifest["assets"].pop(target, None)
+
+    if todo:
+        pieces_dir = os.path.join(build_root, PIECES_DIR)
+        args = [(job, assets_root, planned[job.target][2], pieces_dir, {rel: hashes.get(rel) for rel in job.inputs})
+                for job in todo]
+        if len(todo) == 1 or workers == 1:
+            results = [_run_job(*a) for a in args]
+        else:
+            with ProcessPoolExecutor(max_workers=min(len(todo), workers or os.cpu_count() or 1)) as pool:
+                futures = [pool.submit(_run_job, *a) for a in args]
+                results = [future.result() for future in futures]
+        for job, secs in results:
+            print(f"[build.py] baked {job.target} ({secs * 1000:.0f} ms)")
+
+    for target, (job, key, cache_dir) in planned.items():
+        baker = BAKERS[job.baker]
+        manifest["assets"][target] = "/".join(p for p in (CACHE_DIR, baker.name, key, baker.output) if p)
+        manifest["jobs"][target] = {"baker": baker.name, "version": baker.version,
+                                    "key": key, "inputs": len(job.inputs)}
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    hashes.save()
+
+    if prune:
+        _prune(build_root, manifest, hashes)
+
+    print(f"[build.py] {len(planned)} targets, {len(todo)} baked, {len(planned) - len(todo)} cached, "
+          f"{hashes.rehashed} files hashed in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return manifest
+
+
+def _prune(build_root: str, manifest: dict, hashes: FileHashes) -> None:
+    """Delete cache entries the manifest doesn't point at, and pieces of files that no longer exist."""
+    keep = {(info["baker"], info["key"]) for info in manifest["jobs"].values()}
+    cache_root = os.path.join(build_root, CACHE_DIR)
+    removed = 0
+    for baker in os.listdir(cache_root):
+        baker_dir = os.path.join(cache_root, baker)
+        if not os.path.isdir(baker_dir):
+            continue
+        for key in os.listdir(baker_dir):
+            if (baker, key) not in keep:
+                shutil.rmtree(os.path.join(baker_dir, key), ignore_errors=True)
+                removed += 1
+
+    live = {entry[2][:32] for entry in hashes.live_entries().values()}
+    pieces_root = os.path.join(build_root, PIECES_DIR)
+    for kind in (os.listdir(pieces_root) if os.path.isdir(pieces_root) else ()):
+        for name in os.listdir(os.path.join(pieces_root, kind)):
+            if name[:32] not in live:
+                os.remove(os.path.join(pieces_root, kind, name))
+                removed += 1
+    print(f"[build.py] pruned {removed} stale cache entries")
+
+
+def main(argv: list[str] | None = None) -> None:
+    import argparse
+    import scummypy.resources as Resources
+
+    parser = argparse.ArgumentParser(prog="python -m scummypy build",
+                                     description="Bake assets/ into build/ (only what changed).")
+    parser.add_argument("bakers", nargs="*", metavar="baker",
+                        help=f"bakers to run: {', '.join(sorted(BAKERS))} (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="re-bake even if the output is cached")
+    parser.add_argument("--prune", action="store_true", help="delete cache entries no target uses")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.bakers if name not in BAKERS]
+    if unknown:
+        parser.error(f"unknown baker(s): {', '.join(unknown)}")
+
+    build(Resources.ASSETS_ROOT, Resources.BUILD_ROOT, args.bakers or None, args.jobs, args.force, args.prune)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,56 @@
+import os
+import random
 import threading
 import time
-from unittest import result
 import pygame
 import traceback
 
+from contextlib import contextmanager
 from dataclasses import dataclass
 
 
 import scummypy.resources as Resources
-from .cursors import Cursors
-from .actor import ActorEvents
+from .cursors import Cursors, CursorState
+from .actor import ActorEvents, event_bus
 from .audio import AudioHandle, AudioManager, AudioEventScheduler
 from .music import MusicSystem, Song
 from .system import ask_yes_no, ask_ok_cancel
+from .replay import ReplayRecorder, ReplayPlayer, FrameTimeHistogram
+from .save import SaveSystem
+from .display import Display
+from .scripts import ScriptScheduler
+from .mainthread import MainThreadQueue, on_main_thread
+from .framestore import frame_store
 
 class Engine:
-    def __init__(self, screen_size=(640, 480), fps=60, title="Scummpy"):
-        pygame.init()
-        self.screen = pygame.display.set_mode(screen_size)
-        pygame.display.set_caption(title)
+    def __init__(self, screen_size=(640, 480), fps=60, title="Scummpy",
+                 window_size=None, fullscreen=False):
+        # [(step name, ms)] until the first frame is on screen, see startup_report()
+        self.startup_timings: list[tuple[str, float]] = []
+        self._startup_t0 = time.perf_counter()
+        self._first_frame_done = False
+        self._time_to_first_frame = 0.0
+
+        # Only what the engine needs up front. The mixer starts in register_soundChannels(),
+        # fonts on the first show_text(), Tk on the first prompt() and cursors on first use.
+        with self._startup_step("pygame.display.init"):
+            pygame.display.init()
+        with self._startup_step("display.set_mode"):
+            # Everything draws into a fixed screen_size framebuffer; display.py scales it
+            # to the window/fullscreen size in one step and maps mouse positions back
+            self.display = Display(screen_size, window_size, fullscreen)
+            self.screen = self.display.framebuffer
+            pygame.display.set_caption(title)
 
         self.DEBUG: bool = False
+        self.PRINT_STARTUP_REPORT: bool = False
         self.HOTSPOT_DRAWER_POINTS = [(None, None), (0, 0)]
         # pygame.key.set_repeat(80)
 
         self._main_thread_id = threading.get_ident()
+        # Work posted from other threads, run by main_loop within a per-frame budget (see mainthread.py)
+        self.main_queue = MainThreadQueue(self._main_thread_id)
+        self.MAIN_QUEUE_BUDGET_MS: float = 4.0
         self._skip_dt_frames = 0
         self.clock = pygame.time.Clock()
         self.fps: int = fps
@@ -36,9 +62,12 @@ class Engine:
         # [audio.py] SOUND_END = pygame.USEREVENT + 1
         self.SCREEN_TEXT_EVENT: int = pygame.USEREVENT + 3
         self.ENGINE_RESTART_EVENT = pygame.USEREVENT + 50
-        # [actor.py] ANIMATION_END = pygame.USEREVENT + 100
+        # [actor.py] ANIMATION_END = pygame.USEREVENT + 100 (delivered via event_bus, queue is opt-in)
         # [actor.py] ACTOR_UPDATE = pygame.USEREVENT + 101
 
+        # Synchronous actor events: engine.event_bus.subscribe(ActorEvents.ANIMATION_END, cb, actor_id=.., animation=..)
+        self.event_bus = event_bus
+
         self.interface = None
         self.last_room = None
         self.current_room = None
@@ -53,11 +82,74 @@ class Engine:
         self._line_active_by_channel: dict[int, bool] = {}
         self._line_on_done_by_channel: dict = {}
         self._current_actor_talking: int = -1
-        Cursors.load_all()
+        # say_line() sequences decode this many upcoming talkies in the background
+        self.TALKIE_LOOKAHEAD: int = 2
+        # Cooperative room/cutscene scripts (see scripts.py), resumed once per frame in main_loop
+        self.scripts = ScriptScheduler()
         self.Cursors = Cursors
+        self.cursor_state = CursorState()
+        self._hover_dirty = False
+        self._hover_pos: tuple[int, int] | None = None
+        self._font = None
 
         self.screen_text = (None, None)
 
+        # Event dispatch table: { event_type: [handler(event), ...] }
+        self._event_handlers: dict[int, list] = {}
+        self._flush_event_queue = False
+        self.FILTER_UNUSED_EVENTS: bool = True
+        # Input event types forwarded to current_room/interface handle_event() (see room_event_types)
+        self._room_event_types: frozenset[int] = frozenset()
+        self._register_engine_events()
+        self.room_event_types = {pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP}
+
+        # Record / replay (see replay.py). Events from outside the game: input, QUIT,
+        # the mixer's SOUND_END and wall-clock timers. Everything else the engine re-posts itself.
+        self.replay_event_types: set[int] = {
+            pygame.QUIT, pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+            pygame.KEYDOWN, pygame.KEYUP, AudioManager.SOUND_END, self.SCREEN_TEXT_EVENT,
+        }
+        self._recorder: ReplayRecorder | None = None
+        self._replay: ReplayPlayer | None = None
+        self.frame_times: FrameTimeHistogram | None = None
+        self.frame_times_path: str | None = None
+
+        # Save games (see save.py); writes happen on a background thread
+        self.saves = SaveSystem(self)
+        self.AUTOSAVE_ON_ROOM_CHANGE: bool = False
+
+        # Copy-on-write state snapshots (game states with snapshot()/restore(), see game_state.py)
+        # { room_id or name: (room_id, snapshot of the state before entering that room) }
+        self.checkpoints: dict = {}
+        self.CHECKPOINT_ON_ROOM_ENTRY: bool = True
+        self._initial_snapshot = None
+        self._room_entry_snapshot = None
+
+    @contextmanager
+    def _startup_step(self, name: str):
+        """Times a block of work for the startup report (no-op once the first frame is drawn)."""
+        if self._first_frame_done:
+            yield
+            return
+
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.startup_timings.append((name, (time.perf_counter() - t0) * 1000.0))
+
+    def startup_report(self) -> str:
+        lines = ["[core.py] startup report:"]
+        for name, ms in self.startup_timings:
+            lines.append(f"  {name:<32} {ms:8.1f} ms")
+        if self._first_frame_done:
+            total = self._time_to_first_frame
+        else:
+            total = (time.perf_counter() - self._startup_t0) * 1000.0
+        lines.append(f"  {'time to first frame':<32} {total:8.1f} ms")
+        lines.append(f"  {'frame store':<32} {frame_store.summary()}")
+        return "\n".join(lines)
+
     def refocus_pygame(self):
         # Bring the Pygame window to the front
         #pygame.display.set_mode(self.screen.get_size())  # refreshes window handle
@@ -80,10 +172,16 @@ class Engine:
         if self.game_state:
             # Sometimes the DEBUG in core.py is not available to check in all Python files
             self.game_state.set_flag("g_DEBUG", self.DEBUG) 
+        # restart_game() goes back to this instead of rebuilding the state
+        self._initial_snapshot = self._snapshot_state()
 
 
     def register_rooms(self, room_table: dict, room_names: list | None = None):
         """room_table: {room_id: init(engine) -> Room}"""
+        with self._startup_step("register_rooms"):
+            self._register_rooms(room_table, room_names)
+
+    def _register_rooms(self, room_table: dict, room_names: list | None = None):
         self.room_registry.update(room_table)
         
         # Quick fix for potential removal of room_names
@@ -106,7 +204,8 @@ class Engine:
             print("[core.py] room_table:", room_table)
 
     def register_soundChannels(self, sound_channels: dict):
-        self.audio = AudioManager(sound_channels['maxChannels'])
+        with self._startup_step("register_soundChannels"):
+            self.audio = AudioManager(sound_channels['maxChannels'])
 
         self.sound_channels = sound_channels
 
@@ -142,6 +241,7 @@ class Engine:
         self.audio_schedulers.append(scheduler)
         return scheduler
 
+    @on_main_thread
     def enter_modal_room(self, room_id: int):
         # 1) Suspend current WORLD room (do NOT destroy)
         if self.modal_room is not None:
@@ -171,6 +271,7 @@ class Engine:
         # Cursor reset
         self._handle_mouse_motion()
 
+    @on_main_thread
     def change_room(self, room_id: int, skip_enter_func: bool = False):
 
         if room_id is None or not isinstance(room_id, int):
@@ -179,6 +280,11 @@ class Engine:
         if room_id <= 0:
             raise Exception("room_id can not be 0 or lower!")
 
+        # State as it was before entering: restore_checkpoint() replays the entry from here
+        self._room_entry_snapshot = self._snapshot_state()
+        if self.CHECKPOINT_ON_ROOM_ENTRY and self._room_entry_snapshot is not None:
+            self.checkpoints[room_id] = (room_id, self._room_entry_snapshot)
+
         # --- flags: last room + rolling last-3 room history ---
         prev_room = int(self.game_state.get_flag("g_currentRoom"))  # int or None
 
@@ -189,6 +295,7 @@ class Engine:
         history = self.game_state.get_flag("g_previousRooms")
         if not isinstance(history, list):
             history = []
+        history = list(history)  # never edit a list a state snapshot may share
 
         if isinstance(prev_room, int):
             history.insert(0, int(prev_room))
@@ -203,6 +310,7 @@ class Engine:
         # print(f'[core.py] g_previousRooms is {self.game_state.get_flag("g_previousRooms")}')
 
         if self.current_room is not None:
+            self.scripts.stop_room(self.current_room)
             if hasattr(self.current_room, "destroy"):
                 self.current_room.destroy()
 
@@ -218,6 +326,7 @@ class Engine:
 
         factory = self.room_registry[room_id]
         Resources.ROOM_PATH = factory[1]
+        Resources.evict_surfaces(keep_room=factory[1])
         self.current_room = factory[0](self)
         self.game_state.set_flag("g_currentRoom", room_id)
         self.current_skipable = None
@@ -230,6 +339,8 @@ class Engine:
                     self.current_skipable = None
 
         self.current_room.screen = self.screen
+        if self.DEBUG:
+            frame_store.report()
 
         # Run this once to reset the mouse cursor..
         self._handle_mouse_motion()
@@ -258,23 +369,86 @@ class Engine:
         if self.DEBUG:
             pygame.display.set_caption(f"{self.title} - room: {self.current_room.ROOM_NAME}")
 
+        if self.AUTOSAVE_ON_ROOM_CHANGE and self._replay is None:
+            self.saves.autosave()
+
+    # -----------------------------
+    # Checkpoints
+    # -----------------------------
+    def _snapshot_state(self):
+        if hasattr(self.game_state, "snapshot"):
+            return self.game_state.snapshot()
+        return None
+
+    def save_checkpoint(self, name) -> bool:
+        """Debug save point: the current room, with the state it was entered with."""
+        if self._room_entry_snapshot is None:
+            return False
+        room_id = self.game_state.get_flag("g_currentRoom")
+        self.checkpoints[name] = (room_id, self._room_entry_snapshot)
+        return True
+
+    @on_main_thread
+    def restore_checkpoint(self, name) -> bool:
+        """Jump back to a checkpoint: swap the state back in (O(1)) and re-enter its room."""
+        checkpoint = self.checkpoints.get(name)
+        if checkpoint is None:
+            print(f"[core.py] restore_checkpoint(): no checkpoint '{name}'")
+            return False
+
+        room_id, snapshot = checkpoint
+        self.game_state.restore(snapshot)
+        self.change_room(room_id)
+        return True
+
+    # -----------------------------
+    # Save games
+    # -----------------------------
+    def save_game(self, name: str):
+        """Write a save in the background (see save.py). Returns a Future."""
+        return self.saves.save(name)
+
+    @on_main_thread
+    def load_game(self, name: str) -> None:
+        """Restore flags, inventory, room, actor positions and music pool from a save."""
+        self.saves.load(name)
+
     def main_loop(self, start_room_id: int):
         if start_room_id:
             self.start_room_id = start_room_id
             if self.DEBUG: 
                 print("[core.py] Start game in Room:", start_room_id)
-            self.change_room(start_room_id)
+            with self._startup_step(f"change_room({start_room_id})"):
+                self.change_room(start_room_id)
 
         self.running = True
+        self._sync_room_event_types()
+        self._refresh_event_filter()
 
         while self.running:
-            dt = self.clock.tick(self.fps) / 1000.0
-            dt = min(dt, 1/30) # clamp to ~33ms (or 1/15 if you prefer)
+            replay_events = None
+            if self._replay is not None:
+                # Replays run at max speed with the recorded dt
+                frame = self._replay.next_frame()
+                if frame is None:
+                    break
+                self.clock.tick()
+                dt, replay_events = frame
+                self._skip_dt_frames = 0
+            else:
+                dt = self.clock.tick(self.fps) / 1000.0
+                dt = min(dt, 1/30) # clamp to ~33ms (or 1/15 if you prefer)
+
+                # If we just came back from a modal, ignore dt for a couple frames
+                if self._skip_dt_frames > 0:
+                    dt = 0.0
+                    self._skip_dt_frames -= 1
+            frame_t0 = time.perf_counter()
 
-            # If we just came back from a modal, ignore dt for a couple frames
-            if self._skip_dt_frames > 0:
-                dt = 0.0
-                self._skip_dt_frames -= 1
+            # Finish any threaded asset loads (convert_alpha + callbacks on this thread)
+            Resources.process_loaded()
+            # Calls other threads marshalled onto this one (@on_main_thread methods, main_queue.post())
+            self.main_queue.drain(self.MAIN_QUEUE_BUDGET_MS)
 
             for scheduler in self.audio_schedulers:
                 scheduler.update()
@@ -283,60 +457,21 @@ class Engine:
                 if not s.finished
             ] # clean out finished ones
 
-            for event in pygame.event.get():
-                if event.type in (
-                    getattr(pygame, "WINDOWFOCUSGAINED", -1),
-                    getattr(pygame, "WINDOWFOCUSLOST", -1),
-                    getattr(pygame, "WINDOWENTER", -1),
-                    getattr(pygame, "WINDOWLEAVE", -1),
-                ): 
-                    pass # print("[WIN]", pygame.event.event_name(event.type), event)
-
-
-                if event.type == pygame.QUIT:
-                    self.running = False
-                elif event.type == self.ENGINE_RESTART_EVENT:
-                    print("[core.py] ENGINE_RESTART_EVENT received")
+            events = pygame.event.get()
+            if self.display.hardware is False:
+                events = [self.display.map_event(e) for e in events]
+            if replay_events is not None:
+                # live input/timer/mixer events are replaced by the recorded ones
+                events = [e for e in events if e.type not in self.replay_event_types] + replay_events
+            elif self._recorder is not None:
+                external = [e for e in events if e.type in self.replay_event_types]
+            self._dispatch_events(events)
+            if self._recorder is not None and replay_events is None:
+                self._recorder.record_frame(dt, external)
 
-                    self.change_room(event.room_id)
+            self._update_hover_cursor()
 
-                    # Reset timing so room enter animation doesn't fast-forward
-                    self.clock.tick()
-                    self._skip_dt_frames = 2
-
-                    # Flush anything queued from the previous room/menu/dialog
-                    pygame.event.clear()
-                    break
-
-                elif event.type == self.audio.SOUND_END:
-                    print("[core.py] SOUND_END event received")
-                    self.audio.on_audio_end()
-                elif event.type == self.SCREEN_TEXT_EVENT:
-                    print("[core.py] SCREEN_TEXT_EVENT event received")
-                    self.screen_text = (None, None)
-                    pygame.time.set_timer(self.SCREEN_TEXT_EVENT, 0)  # Stop the timer
-                elif event.type == pygame.MOUSEMOTION:
-                    self._handle_mouse_motion(event)
-                elif event.type == ActorEvents.ACTOR_UPDATE:
-                    if event.update_type is "new" or event.update_type is "change":
-                        actor = self.actor_table.get(event.actor_id, None)
-                        if actor is not None:
-                            print(f'[core.py] ACTOR_UPDATE event received {event.update_type} for actor_id: {event.actor_id}')
-                            if actor.actor_can_flap_while_change == False and self.is_actor_talking(actor_id=event.actor_id):
-                                if self.in_close_up == False:
-                                    self.stop_line(channel=0)
-                else:
-                    if not self.key_input_blocked:
-                        if event.type == pygame.KEYDOWN:
-                            self._handle_keydown(event)
-                        if event.type == pygame.KEYUP:
-                            self._handle_keyup(event)
-
-                    if not self.mouse_input_blocked:                        
-                        if self.current_room:
-                            self.current_room.handle_event(event)
-                        if self.interface:
-                            self.interface.handle_event(event)
+            self.scripts.update(dt)
 
             if self.current_room:
                 self.current_room.update(dt)
@@ -351,18 +486,212 @@ class Engine:
                 for surf, rect in self.screen_text:
                     self.screen.blit(surf, rect)
 
-            pygame.display.flip()
+            self.display.present()
+
+            if self.frame_times is not None:
+                self.frame_times.add((time.perf_counter() - frame_t0) * 1000.0)
 
+            if not self._first_frame_done:
+                self._time_to_first_frame = (time.perf_counter() - self._startup_t0) * 1000.0
+                self._first_frame_done = True
+                if self.DEBUG or self.PRINT_STARTUP_REPORT:
+                    print(self.startup_report())
+
+        self._finish_record_replay()
+        self.saves.shutdown()
         pygame.quit()
 
+    # -----------------------------
+    # Record / replay
+    # -----------------------------
+    def start_recording(self, path: str, seed: int | None = None) -> None:
+        """Record this session's inputs, frame dts, prompt answers and RNG seed to `path`."""
+        if seed is None:
+            seed = int.from_bytes(os.urandom(4), "little")
+        random.seed(seed)
+        self._recorder = ReplayRecorder(path, seed)
+        print(f"[core.py] recording to {path} (seed {seed})")
+
+    def start_replay(self, path: str, report_path: str | None = None) -> None:
+        """Play a recording back at max speed and collect a frame-time histogram."""
+        self._replay = ReplayPlayer.load(path)
+        random.seed(self._replay.seed)
+        self.frame_times = FrameTimeHistogram()
+        self.frame_times_path = report_path
+        print(f"[core.py] replaying {path}: {self._replay.frame_count} frames (seed {self._replay.seed})")
+
+    def mouse_pos(self) -> tuple[int, int]:
+        """Pointer position; during a replay the recorded one."""
+        if self._replay is not None:
+            return self._replay.mouse_pos
+        return self.display.mouse_pos()
+
+    def toggle_fullscreen(self) -> None:
+        self.display.toggle_fullscreen()
+        self.screen = self.display.framebuffer
+        for room in (self.current_room, self.interface,
+                     getattr(self, "modal_room", None), getattr(self, "suspended_world_room", None)):
+            if room is not None:
+                room.screen = self.screen
+
+    def _finish_record_replay(self) -> None:
+        if self._recorder is not None:
+            self._recorder.close()
+            self._recorder = None
+        if self.frame_times is not None:
+            print(self.frame_times.report())
+            if self.frame_times_path:
+                self.frame_times.save(self.frame_times_path)
+
+    # -----------------------------
+    # Event dispatch
+    # -----------------------------
+    def subscribe(self, event_type: int, handler) -> None:
+        """Call handler(event) for every queued event of event_type."""
+        handlers = self._event_handlers.setdefault(event_type, [])
+        if handler not in handlers:
+            handlers.append(handler)
+            self._refresh_event_filter()
+
+    def unsubscribe(self, event_type: int, handler) -> None:
+        handlers = self._event_handlers.get(event_type)
+        if not handlers or handler not in handlers:
+            return
+        handlers.remove(handler)
+        if not handlers:
+            del self._event_handlers[event_type]
+            self._refresh_event_filter()
+
+    def _register_engine_events(self) -> None:
+        self.subscribe(pygame.QUIT, self._on_quit)
+        self.subscribe(self.ENGINE_RESTART_EVENT, self._on_engine_restart)
+        self.subscribe(AudioManager.SOUND_END, self._on_sound_end)
+        self.subscribe(self.SCREEN_TEXT_EVENT, self._on_screen_text_end)
+        self.subscribe(ActorEvents.ACTOR_UPDATE, self._on_actor_update)
+        self.subscribe(pygame.MOUSEMOTION, self._handle_mouse_motion)
+        self.subscribe(pygame.KEYDOWN, self._on_key_event)
+        self.subscribe(pygame.KEYUP, self._on_key_event)
+
+    @property
+    def room_event_types(self) -> frozenset[int]:
+        """Event types forwarded to the rooms. Assign a new set to change it (re-subscribes)."""
+        return self._room_event_types
+
+    @room_event_types.setter
+    def room_event_types(self, event_types) -> None:
+        self._room_event_types = frozenset(event_types)
+        self._sync_room_event_types()
+
+    def _sync_room_event_types(self) -> None:
+        wanted = set(self._room_event_types)
+        if ActorEvents.POST_ANIMATION_END_TO_QUEUE:
+            # the opt-in queue broadcast is for rooms' handle_event()
+            wanted.add(ActorEvents.ANIMATION_END)
+        for event_type, handlers in list(self._event_handlers.items()):
+            if self._dispatch_to_rooms in handlers and event_type not in wanted:
+                self.unsubscribe(event_type, self._dispatch_to_rooms)
+        for event_type in wanted:
+            self.subscribe(event_type, self._dispatch_to_rooms)
+
+    def _refresh_event_filter(self) -> None:
+        """Keep SDL event types nobody listens to out of the queue."""
+        if not self.FILTER_UNUSED_EVENTS or not pygame.display.get_init():
+            return
+        pygame.event.set_blocked(None)
+        # user events are only ever posted on purpose (by the engine or game code): never drop them
+        pygame.event.set_allowed(list(self._event_handlers) + list(range(pygame.USEREVENT, pygame.NUMEVENTS)))
+
+    def _dispatch_events(self, events: list) -> None:
+        # Only the newest MOUSEMOTION of this batch matters for hover
+        last_motion = None
+        for event in events:
+            if event.type == pygame.MOUSEMOTION:
+                last_motion = event
+
+        for event in events:
+            if event.type == pygame.MOUSEMOTION and event is not last_motion:
+                continue
+
+            for handler in list(self._event_handlers.get(event.type, ())):
+                handler(event)
+
+            if self._flush_event_queue:
+                # Flush anything queued from the previous room/menu/dialog
+                self._flush_event_queue = False
+                pygame.event.clear()
+                break
+
+    def _on_quit(self, event) -> None:
+        self.running = False
+
+    def _on_engine_restart(self, event) -> None:
+        print("[core.py] ENGINE_RESTART_EVENT received")
+
+        self.change_room(event.room_id)
+
+        # Reset timing so room enter animation doesn't fast-forward
+        self.clock.tick()
+        self._skip_dt_frames = 2
+
+        self._flush_event_queue = True
+
+    def _on_sound_end(self, event) -> None:
+        print("[core.py] SOUND_END event received")
+        self.audio.on_audio_end()
+
+    def _on_screen_text_end(self, event) -> None:
+        print("[core.py] SCREEN_TEXT_EVENT event received")
+        self.screen_text = (None, None)
+        pygame.time.set_timer(self.SCREEN_TEXT_EVENT, 0)  # Stop the timer
+
+    def _on_actor_update(self, event) -> None:
+        if event.update_type == "new" or event.update_type == "change":
+            actor = self.actor_table.get(event.actor_id, None)
+            if actor is not None:
+                print(f'[core.py] ACTOR_UPDATE event received {event.update_type} for actor_id: {event.actor_id}')
+                if actor.actor_can_flap_while_change == False and self.is_actor_talking(actor_id=event.actor_id):
+                    if self.in_close_up == False:
+                        self.stop_line(channel=0)
+
+    def _on_key_event(self, event) -> None:
+        if self.key_input_blocked:
+            return
+        if event.type == pygame.KEYDOWN:
+            self._handle_keydown(event)
+        else:
+            self._handle_keyup(event)
+
+    def _dispatch_to_rooms(self, event) -> None:
+        if self.mouse_input_blocked:
+            return
+        if self.current_room:
+            self.current_room.handle_event(event)
+        if self.interface:
+            self.interface.handle_event(event)
+
     def _handle_mouse_motion(self, event=None):
+        """Request a hover-cursor refresh. Any number of calls per frame cost one resolution."""
+        if event is not None:
+            self._hover_pos = event.pos
+        self._hover_dirty = True
+
+    def invalidate_cursor(self):
+        """Forget the cached SDL cursor state (call after code that set the OS cursor directly)."""
+        self.cursor_state.invalidate()
+        self._hover_dirty = True
+
+    def _update_hover_cursor(self):
+        if not self._hover_dirty:
+            return
+        self._hover_dirty = False
+
         isCursorVisible = self.game_state.get_flag("g_cursorVisible")
-        pygame.mouse.set_visible(isCursorVisible)
+        self.cursor_state.set_visible(isCursorVisible)
+        if not isCursorVisible:
+            return
 
-        if event is not None:
-            pos = event.pos
-        else:
-            pos =  pygame.mouse.get_pos()
+        pos = self._hover_pos if self._hover_pos is not None else self.mouse_pos()
+        self._hover_pos = None
 
         hover_cursor = None
 
@@ -385,7 +714,7 @@ class Engine:
         else:
             cursor = Cursors.NORMAL or pygame.SYSTEM_CURSOR_CROSSHAIR
 
-        pygame.mouse.set_cursor(cursor)
+        self.cursor_state.set_cursor(cursor)
 
     def _handle_keydown(self, event):
         print("[core.py] _handle_keydown()> unicode=", event.unicode, "key=", event.key)
@@ -399,10 +728,12 @@ class Engine:
                 self.stop_line(channel=0)
         if event.key == 46: # Period Key
             self.skip_line(channel=0)
+        if event.key == 1073741892: # F11 Key
+            self.toggle_fullscreen()
         if event.key == 1073742048: #CTRL Key
             pygame.key.set_repeat(80)
 
-            pos =  pygame.mouse.get_pos()
+            pos =  self.mouse_pos()
             if self.HOTSPOT_DRAWER_POINTS[0] is (None, None):
                 self.HOTSPOT_DRAWER_POINTS[0] = pos
 
@@ -472,12 +803,24 @@ class Engine:
     ) -> bool:
         if title is None:
             title = self.title
+        if prompt_type not in ("yesno", "okcancel"):
+            return False
+
+        if self._replay is not None:
+            # answer from the recording instead of opening a dialog
+            result = self._replay.next_prompt()
+            callback = pcallback if result else ncallback
+            if callable(callback):
+                callback(result)
+            return result
+
         if prompt_type == "yesno":
-            return ask_yes_no(self, title=title, message=message, pcallback=pcallback, ncallback=ncallback)
-        elif prompt_type == "okcancel":
-            return ask_ok_cancel(self, title=title, message=message, pcallback=pcallback, ncallback=ncallback)
+            result = ask_yes_no(self, title=title, message=message, pcallback=pcallback, ncallback=ncallback)
         else:
-            return False
+            result = ask_ok_cancel(self, title=title, message=message, pcallback=pcallback, ncallback=ncallback)
+        if self._recorder is not None:
+            self._recorder.record_prompt(result)
+        return result
 
 
     def hide_cursor(self, inputBlocked=False):
@@ -486,8 +829,8 @@ class Engine:
         self.mouse_input_blocked = inputBlocked
 
         isCursorVisible = self.game_state.get_flag("g_cursorVisible")
-        pygame.mouse.set_visible(isCursorVisible)
-        pygame.display.flip()
+        self.cursor_state.set_visible(isCursorVisible)
+        self.display.present()
 
     def show_cursor(self, inputBlocked=False):
         self.game_state.set_flag("g_cursorVisible", True) 
@@ -495,10 +838,10 @@ class Engine:
         self.mouse_input_blocked = inputBlocked
 
         isCursorVisible = self.game_state.get_flag("g_cursorVisible")
-        pygame.mouse.set_visible(isCursorVisible)
+        self.cursor_state.set_visible(isCursorVisible)
         self._handle_mouse_motion()
 
-        pygame.display.flip()
+        self.display.present()
 
     def toggle_cursor_visible(self):
         isCursorVisible = self.game_state.get_flag("g_cursorVisible")
@@ -507,6 +850,7 @@ class Engine:
         else:
             self.show_cursor()
 
+    @on_main_thread
     def hide_interface(self, hideCursor=False):
         if self.interface:
             self.interface.remove_all_room_actors()
@@ -517,12 +861,14 @@ class Engine:
         if hideCursor is True:
             self.hide_cursor()
 
+    @on_main_thread
     def show_interface(self, showCursor=True):
         self.game_state.set_flag("g_interfaceVisible", True)
         
         if showCursor is True:
             self.show_cursor()
 
+    @on_main_thread
     def close_up(self, bg, hideCursor=True):
         self.stop_line(channel=0)
         
@@ -540,6 +886,7 @@ class Engine:
         if hideCursor == True:
             self.hide_cursor(inputBlocked=True)
 
+    @on_main_thread
     def hide_close_up(self, showCursor=True):
         if self.interface:
             self.interface.enable_all_clickpoints()
@@ -554,6 +901,7 @@ class Engine:
         if showCursor == True:
             self.show_cursor(inputBlocked=False)
 
+    @on_main_thread
     def show_text(
         self,
         text: str,
@@ -577,7 +925,7 @@ class Engine:
             words = len(text.split())
             duration = max(1200, words * 300)
 
-        font = pygame.font.SysFont("Arial Rounded MT Bold", 48, bold=False)
+        font = self._get_font()
         fg = color
  
         outline = (0, 0, 0)
@@ -606,10 +954,18 @@ class Engine:
         for surf, rect in rendered:
             self.screen.blit(surf, rect)
 
-        pygame.display.flip()
+        self.display.present()
         if duration >= 0:
             pygame.time.set_timer(self.SCREEN_TEXT_EVENT, int(duration))
 
+    def _get_font(self) -> pygame.font.Font:
+        # SysFont scans the installed fonts, so do it once, on the first line of text
+        if self._font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self._font = pygame.font.SysFont("Arial Rounded MT Bold", 48, bold=False)
+        return self._font
+
     def render_text_outline(
             self,
             font: pygame.font.Font,
@@ -685,6 +1041,7 @@ class Engine:
 
         return surfaces
     
+    @on_main_thread
     def remove_text(self):
         self.screen_text = (None, None)
         pygame.time.set_timer(self.SCREEN_TEXT_EVENT, 0)  # Stop the timer
@@ -714,6 +1071,7 @@ class Engine:
             return
         self.music.start_song(songId, loop)
 
+    @on_main_thread
     def restart_game(self, start_room_id=None):
         """
         Fully restart the game:
@@ -729,6 +1087,8 @@ class Engine:
         if hasattr(self, "SCREEN_TEXT_EVENT"):
             pygame.time.set_timer(self.SCREEN_TEXT_EVENT, 0)
 
+        self.scripts.stop_all()
+
         # 2) Clear UI / captions
         if hasattr(self, "screen_text"):
             self.screen_text = (None, None)
@@ -776,6 +1136,12 @@ class Engine:
         if isinstance(self.game_state, dict):
             print('[core.py] restart_game() clearing game_state dict')
             self.game_state.clear()
+        elif self._initial_snapshot is not None:
+            # copy-on-write: back to the state set_game_state() saw, keeping player preferences
+            keep = {k: self.game_state.get_flag(k) for k in ("g_screenTextEnabled", "g_musicMuted", "g_talkiesMuted", "g_soundsMuted")}
+            self.game_state.restore(self._initial_snapshot)
+            for k, v in keep.items():
+                self.game_state.set_flag(k, v)
         else:
             new_state = type(self.game_state)()
             for k in ("g_screenTextEnabled", "g_musicMuted", "g_talkiesMuted", "g_soundsMuted"):
@@ -794,6 +1160,16 @@ class Engine:
         handle: AudioHandle
         subtitle: str | None
         
+    def _talkie_path(self, key: str) -> str:
+        talkie_info = self.talkie_table.get(key)
+        filename = talkie_info[0] if talkie_info else key
+        return f"assets/audio/talkies/{filename}"
+
+    def _prefetch_talkies(self, queue: list):
+        # decode the next lines while this one plays, so line changes don't hitch on a decode
+        upcoming = [step[1] for step in queue if step[0] == "say"][:self.TALKIE_LOOKAHEAD]
+        self.audio.prefetch([self._talkie_path(key) for key in upcoming])
+
     def play_talkie(self, filename: str, soundChannel: int = 0, loop: bool = False, preload: bool = False):
         filepath = f"assets/audio/talkies/{filename}"
         sound = self.audio.load(filepath)
@@ -806,6 +1182,7 @@ class Engine:
         self._line_token_by_channel[channel] = t
         return t
     
+    @on_main_thread
     def say_line(self, key, *, color=(255,165,255), actor_id=1, look_at="normal",
                 channel: int = 0, show_subtitles: bool = True, on_done=None) -> TalkieResult | None:
         # Remove any existing text first
@@ -813,6 +1190,15 @@ class Engine:
             self.remove_text()
 
         self._current_actor_talking = actor_id
+
+        # WaitTalkieEnd(channel) in scripts resumes when the line/sequence is done
+        self.scripts.talkie_started(channel)
+        user_on_done = on_done
+
+        def on_done():
+            self.scripts.talkie_ended(channel)
+            if user_on_done:
+                user_on_done()
         
         # SEQUENCE MODE
         if isinstance(key, (list, tuple)):
@@ -894,6 +1280,7 @@ class Engine:
 
             step = q.pop(0)
             self._line_queue_by_channel[channel] = q
+            self._prefetch_talkies(q)
 
             kind = step[0]
             if kind != "say":
@@ -991,6 +1378,7 @@ class Engine:
         return self.TalkieResult(handle, subtitle)
 
 
+    @on_main_thread
     def stop_line(self, channel: int = 0, invalidate_pending_cbs: bool = True):
         #queue = self._line_queue_by_channel.get(channel)
         #if not queue:
@@ -1001,7 +1389,9 @@ class Engine:
         self.audio.stop_channel(channel)
         self.remove_text()
         self._current_actor_talking = -1
+        self.scripts.talkie_ended(channel)
 
+    @on_main_thread
     def skip_line(self, channel: int = 0):
         if not self._line_active_by_channel.get(channel):
             self.audio.stop_channel(channel)
@@ -1044,6 +1434,7 @@ class Engine:
 
             if kind == "say":
                 _, key, actor_id, look_at = step
+                self._prefetch_talkies(queue)
                 self._say_one_line(
                     key,
                     actor_id=actor_id,
@@ -1089,6 +1480,7 @@ class Engine:
         if channel in self._line_queue_by_channel:
             del self._line_queue_by_channel[channel]
         self._current_actor_talking = -1
+        self.scripts.talkie_ended(channel)
 
     def is_actor_in_talkie_queue(self, channel: int = 0, actor_id: int = 1) -> bool:
         # print(f"[core.py] is_actor_in_talkie_queue()> channel={channel}, actor_id={actor_id}")
@@ -1110,6 +1502,7 @@ class Engine:
         return self.is_actor_in_talkie_queue(channel, actor_id)
 
 
+    @on_main_thread
     def play_sound(self, filename, soundChannel=-1, loop: bool = False):
         filepath = "assets/audio/sfx/" + filename
         sound = self.audio.load(filepath)
@@ -1,18 +1,169 @@
 import json
-from dataclasses import dataclass
+import weakref
+from dataclasses import dataclass, field
 from typing import Optional, Any
 
 import pygame
 
-from .actor import ActorEvents
+from .actor import ActorEvents, event_bus
+from .atlas import AtlasSheet, trim_rect
+from .framestore import frame_store
+from .scaling import SCALE_STEPS, quantize, scaled_frames
+from . import resources as Resources
+
+
+def _slice_frame(sheet: pygame.Surface | AtlasSheet, fx: int, fy: int, fw: int, fh: int,
+                 regX: int, regY: int) -> tuple[pygame.Surface, tuple[int, int]]:
+    """
+    (frame surface, reg point) for a sheet rect. Frames are trimmed to their visible pixels
+    and the reg point moved with them, so transparent margins are never stored or blitted.
+    Atlas-backed sheets hand out a region that was trimmed when the atlas was built.
+    Frames come out of frame_store: identical frames of different costumes are one surface.
+    """
+    if isinstance(sheet, AtlasSheet):
+        found = sheet.frame(fx, fy, fw, fh)
+        if found is not None:
+            region, (ox, oy) = found
+            return frame_store.intern(region), (regX - ox, regY - oy)
+        return frame_store.intern(pygame.Surface((fw, fh), pygame.SRCALPHA)), (regX, regY)
+
+    surf = pygame.Surface((fw, fh), pygame.SRCALPHA)
+    surf.blit(sheet, (0, 0), (fx, fy, fw, fh))
+    if fw > 0 and fh > 0:
+        bounds = trim_rect(surf)
+        if bounds.size != (fw, fh):
+            surf = surf.subsurface(bounds).copy()
+            regX, regY = regX - bounds.x, regY - bounds.y
+    # most frames are hard-edged pixel art: RLE colorkey instead of per-pixel alpha where possible
+    return frame_store.intern(Resources.prepare_surface(surf)), (regX, regY)
+
+
+# -----------------------------
+# Mirrored frames
+# -----------------------------
+# source frame -> its horizontal mirror, made on first use and dropped with the source
+_flipped_frames: "weakref.WeakKeyDictionary[pygame.Surface, pygame.Surface]" = weakref.WeakKeyDictionary()
+
+def flipped_frame(image: pygame.Surface) -> pygame.Surface:
+    flipped = _flipped_frames.get(image)
+    if flipped is None:
+        flipped = pygame.transform.flip(image, True, False)
+        key = image.get_colorkey()
+        if key is not None:
+            flipped.set_colorkey(key, pygame.RLEACCEL)
+        _flipped_frames[image] = flipped
+    return flipped
+
+
+class FlippedFrames:
+    """Timeline.images for a "flip" animation: mirrors of the source frames, made lazily."""
+    __slots__ = ("_source",)
+
+    def __init__(self, source: tuple[pygame.Surface, ...]):
+        self._source = source
+
+    def __len__(self) -> int:
+        return len(self._source)
+
+    def __getitem__(self, i: int) -> pygame.Surface:
+        return flipped_frame(self._source[i])
+
+    def __iter__(self):
+        return (flipped_frame(img) for img in self._source)
+
+
+def mirror_reg_point(image: pygame.Surface, reg_point: tuple[int, int]) -> tuple[int, int]:
+    """Reg point of the mirrored frame, so it mirrors around the actor's x."""
+    return (image.get_width() - reg_point[0], reg_point[1])
+
+
+# -----------------------------
+# Compiled timelines
+# -----------------------------
+# eq=False: timelines compare by identity ("next" may form cycles)
+@dataclass(frozen=True, slots=True, eq=False)
+class Timeline:
+    """
+    An animation compiled at load time: everything update() and rendering need,
+    with frame indices clamped, the frame duration precomputed and "next" resolved.
+    The raw timeline (name None) plays every sheet frame in order.
+    """
+    name: Optional[str]
+    frames: tuple[int, ...]                                        # sheet frame for each step
+    images: tuple[pygame.Surface, ...] = field(repr=False)         # surface for each step
+    reg_points: tuple[tuple[int, int], ...] = field(repr=False)    # reg point for each step
+    frame_duration: float                                          # seconds per step, 0 = never advances
+    # None: default end behaviour, False: freeze on last frame, True: restart, Timeline: switch to it
+    next: "Timeline | bool | None" = field(default=None, repr=False)
+    flipped: bool = False                                          # mirrored variant of the sheet frames
+
+    @property
+    def last(self) -> int:
+        return len(self.frames) - 1
+
+
+def compile_timelines(animations: dict[str, dict], images: list[pygame.Surface],
+                      reg_points: list[tuple[int, int]], framerate: float) -> tuple[Timeline, dict[str, Timeline]]:
+    """
+    Returns (raw timeline, {anim name: Timeline}) for a sheet's frames and animation dicts.
+
+    An animation with "flip" is the mirror image of sheet frames instead of a second sheet:
+        "walk-right": {"flip": "walk-left"}                  same frames/speed as walk-left, mirrored
+        "wave-right": {"flip": true, "frames": [4, 5, 6]}    these frames, mirrored
+    """
+    count = len(images)
+
+    def build(name: Optional[str], frames: list[int], speed: float, flip: bool = False) -> Timeline:
+        if count and not frames:
+            # empty animation: shows the first frame and never advances
+            frames, speed = [0], 0.0
+        frames = tuple(max(0, min(int(f), count - 1)) for f in frames) if count else ()
+        duration = 1.0 / (framerate * speed) if framerate > 0 and speed > 0 and frames else 0.0
+        step_images = tuple(images[f] for f in frames)
+        if flip:
+            return Timeline(name, frames, FlippedFrames(step_images),
+                            tuple(mirror_reg_point(images[f], reg_points[f]) for f in frames),
+                            duration, flipped=True)
+        return Timeline(name, frames, step_images, tuple(reg_points[f] for f in frames), duration)
+
+    def build_anim(name: str, anim: dict) -> Timeline:
+        flip = anim.get("flip", False)
+        if isinstance(flip, str):
+            source = animations.get(flip)
+            if not isinstance(source, dict):
+                print(f"[costume.py] animation '{name}': unknown flip source '{flip}'")
+                source = {}
+            frames = anim.get("frames", source.get("frames", []))
+            speed = anim.get("speed", source.get("speed", 1.0))
+            return build(name, frames, float(speed), flip=True)
+        return build(name, anim.get("frames", []), float(anim.get("speed", 1.0)), flip=bool(flip))
+
+    raw = build(None, list(range(count)), 1.0)
+    timelines = {name: build_anim(name, anim) for name, anim in animations.items()}
+
+    for name, anim in animations.items():
+        next_anim = anim.get("next", None)
+        if next_anim is None or next_anim is False:
+            resolved = next_anim
+        elif isinstance(next_anim, str) and next_anim in timelines:
+            resolved = timelines[next_anim]
+        else:
+            if isinstance(next_anim, str):
+                print(f"[costume.py] animation '{name}': unknown next '{next_anim}', restarting instead")
+            resolved = True
+        # frozen: "next" can only be wired once every timeline exists (it may point back in a cycle)
+        object.__setattr__(timelines[name], "next", resolved)
+
+    return raw, timelines
 
 
 # -----------------------------
 # LayerSheet = sprite data only
 # -----------------------------
 class LayerSheet:
-    def __init__(self, sheet: pygame.Surface, layer_json: dict):
-        self.sprite_sheet = sheet.convert_alpha()
+    def __init__(self, sheet: pygame.Surface | AtlasSheet, layer_json: dict, framerate: float = 24.0):
+        # loaders hand over sheets already converted by Resources.prepare_surface()
+        self.sprite_sheet = sheet
         self.frames: list[pygame.Surface] = []
         self.reg_points: list[tuple[int, int]] = []
         self.frame_meta: list[dict | None] = []
@@ -22,11 +173,13 @@ class LayerSheet:
             fx, fy, fw, fh, imageIndex, regX, regY = frame[:7]
             meta = frame[7] if len(frame) > 7 else None
 
-            surf = pygame.Surface((fw, fh), pygame.SRCALPHA)
-            surf.blit(self.sprite_sheet, (0, 0), (fx, fy, fw, fh))
-            self.frames.append(surf)
-            self.reg_points.append((regX, regY))
+            image, reg_point = _slice_frame(self.sprite_sheet, fx, fy, fw, fh, regX, regY)
+            self.frames.append(image)
+            self.reg_points.append(reg_point)
             self.frame_meta.append(meta)
+        frame_store.own(self, self.frames)
+
+        self.raw_timeline, self.timelines = compile_timelines(self.animations, self.frames, self.reg_points, framerate)
 
     def get_frame_raw(self, raw_idx: int) -> tuple[Optional[pygame.Surface], tuple[int, int]]:
         if not self.frames:
@@ -58,18 +211,36 @@ class LayerSheet:
 # -----------------------------
 # Shared timeline state model
 # -----------------------------
-@dataclass
+@dataclass(slots=True)
 class TimelineState:
-    mode: str = "raw"                 # "raw" or "anim"
-    raw_idx: int = 0                  # index into sheet frames
-    anim_name: Optional[str] = None   # animation name
-    anim_idx: int = 0                 # index into anim["frames"]
-    t: float = 0.0                    # time accumulator
+    timeline: Optional[Timeline] = None   # compiled timeline being played
+    idx: int = 0                          # step within timeline.frames
+    t: float = 0.0                        # time accumulator
     loops: bool = False
     paused: bool = False
 
+    @property
+    def mode(self) -> str:
+        """raw or anim, derived from the timeline being played"""
+        return "raw" if self.timeline is None or self.timeline.name is None else "anim"
+
+    @property
+    def anim_name(self) -> Optional[str]:
+        return self.timeline.name if self.timeline is not None else None
 
-@dataclass
+    @property
+    def anim_idx(self) -> int:
+        return self.idx if self.mode == "anim" else 0
+
+    @property
+    def raw_idx(self) -> int:
+        """Sheet frame currently shown."""
+        if self.timeline is None or not self.timeline.frames:
+            return 0
+        return self.timeline.frames[self.idx]
+
+
+@dataclass(slots=True)
 class LayerState(TimelineState):
     is_hidden: bool = False
     event_fired: bool = False
@@ -79,7 +250,7 @@ class LayerState(TimelineState):
 # Costume
 # -----------------------------
 class Costume:
-    def __init__(self, image_path_or_tuple: str | tuple, json_path: str = ""):
+    def __init__(self, image_path_or_tuple: str | tuple, json_path: str = "", colorkey: tuple | None = None):
         self.actor = None
         self._paused = False
 
@@ -87,10 +258,12 @@ class Costume:
         self._layered = False
 
         # Single-sheet data
-        self.sprite_sheet: Optional[pygame.Surface] = None
+        self.sprite_sheet: Optional[pygame.Surface | AtlasSheet] = None
         self.frames: list[pygame.Surface] = []
         self.reg_points: list[tuple[int, int]] = []
         self.animations: dict[str, dict] = {}
+        self.raw_timeline: Optional[Timeline] = None
+        self.timelines: dict[str, Timeline] = {}
         self.timeline = TimelineState()
         self.framerate: float = 24.0
 
@@ -101,6 +274,10 @@ class Costume:
         self.base_layer_name: Optional[str] = None
         self._layer_state: dict[str, LayerState] = {}
 
+        # Batched stepping (see animation.py): slot per timeline, key None = single-sheet timeline
+        self._batch = None
+        self._batch_slots: dict[Optional[str], int] = {}
+
         # ---------------- load ----------------
         if not json_path and isinstance(image_path_or_tuple, tuple):
             sheet_surface, data, layer_images_src = image_path_or_tuple
@@ -119,7 +296,8 @@ class Costume:
         if not isinstance(image_path, str):
             raise TypeError("image_path_or_tuple must be a str path when json_path is provided")
 
-        self.sprite_sheet = pygame.image.load(image_path).convert_alpha()
+        # cached: several actors sharing one sheet (e.g. the interface inventory) decode it once
+        self.sprite_sheet = Resources.load_image_path(image_path, colorkey)
         with open(json_path, "r", encoding="utf-8") as f:
             data = json.load(f)
 
@@ -137,16 +315,17 @@ class Costume:
         self.reg_points.clear()
 
         for fx, fy, fw, fh, imageIndex, regX, regY in data.get("frames", []):
-            frame_surf = pygame.Surface((fw, fh), pygame.SRCALPHA)
-            frame_surf.blit(self.sprite_sheet, (0, 0), (fx, fy, fw, fh))
-            self.frames.append(frame_surf)
-            self.reg_points.append((regX, regY))
+            image, reg_point = _slice_frame(self.sprite_sheet, fx, fy, fw, fh, regX, regY)
+            self.frames.append(image)
+            self.reg_points.append(reg_point)
+        frame_store.own(self, self.frames)
 
         self.animations = data.get("animations", {})
-        self.timeline = TimelineState()
+        self.raw_timeline, self.timelines = compile_timelines(self.animations, self.frames, self.reg_points, self.framerate)
+        self.timeline = TimelineState(timeline=self.raw_timeline)
 
     # ---------- Layered loading ----------
-    def setup_layers(self, data: dict, layer_images_src: dict[str, pygame.Surface]) -> None:
+    def setup_layers(self, data: dict, layer_images_src: dict[str, pygame.Surface | AtlasSheet]) -> None:
         self._layered = True
         self.framerate = float(data.get("framerate", 24))
         self.layer_defs = data.get("layers", {})
@@ -170,14 +349,15 @@ class Costume:
             if sheet is None:
                 continue
 
-            self.layer_sheets[layer_name] = LayerSheet(sheet, layer)
+            self.layer_sheets[layer_name] = LayerSheet(sheet, layer, self.framerate)
             self.layer_order.append(layer_name)
 
         self.base_layer_name = "body" if "body" in self.layer_sheets else (self.layer_order[0] if self.layer_order else None)
 
         for layer_name in self.layer_order:
             is_hidden = bool(self.layer_defs[layer_name].get("isHidden", False))
-            self._layer_state[layer_name] = LayerState(is_hidden=is_hidden)
+            self._layer_state[layer_name] = LayerState(timeline=self.layer_sheets[layer_name].raw_timeline,
+                                                       is_hidden=is_hidden)
 
     # -----------------------------
     # Public controls (single sheet)
@@ -191,6 +371,7 @@ class Costume:
         if self._layered:
             # layered costumes should use play_layer()/play_all_layers()
             self._paused = False
+            self._sync_all_batched()
             return
 
         self._paused = False
@@ -198,23 +379,22 @@ class Costume:
         self.timeline.paused = False
 
         if play_at is None or isinstance(play_at, int):
-            self.timeline.mode = "raw"
-            self.timeline.anim_name = None
-            self.timeline.anim_idx = 0
-            self.timeline.raw_idx = self._clamp(play_at or 0, 0, len(self.frames) - 1)
+            self.timeline.timeline = self.raw_timeline
+            self.timeline.idx = self._clamp(play_at or 0, 0, len(self.frames) - 1)
+            self._sync_batched(None, reset_t=True)
             return
 
-        if play_at not in self.animations:
+        if play_at not in self.timelines:
             raise KeyError(f"Unknown animation '{play_at}'. Available: {list(self.animations.keys())}")
 
-        self.timeline.mode = "anim"
-        self.timeline.anim_name = play_at
-        self.timeline.anim_idx = 0
-        self.timeline.raw_idx = 0
+        self.timeline.timeline = self.timelines[play_at]
+        self.timeline.idx = 0
+        self._sync_batched(None, reset_t=True)
 
     def stop(self, frame: Optional[int] = None) -> None:
         if self._layered:
             self._paused = True
+            self._sync_all_batched()
             return
 
         self._paused = True
@@ -222,10 +402,9 @@ class Costume:
         self.timeline.t = 0.0
 
         if frame is not None:
-            self.timeline.mode = "raw"
-            self.timeline.anim_name = None
-            self.timeline.anim_idx = 0
-            self.timeline.raw_idx = self._clamp(frame, 0, len(self.frames) - 1)
+            self.timeline.timeline = self.raw_timeline
+            self.timeline.idx = self._clamp(frame, 0, len(self.frames) - 1)
+        self._sync_batched(None, reset_t=True)
 
     # -----------------------------
     # Public controls (layered)
@@ -243,23 +422,18 @@ class Costume:
         
         # raw
         if play_at is None or isinstance(play_at, int):
-            st.mode = "raw"
-            st.anim_name = None
-            st.anim_idx = 0
-            st.raw_idx = self._clamp(play_at or 0, 0, len(sheet.frames) - 1)
+            st.timeline = sheet.raw_timeline
+            st.idx = self._clamp(play_at or 0, 0, len(sheet.frames) - 1)
+            self._sync_batched(layer_name, reset_t=True)
             return
 
         # anim
-        if play_at not in sheet.animations:
+        if play_at not in sheet.timelines:
             raise KeyError(f"Layer '{layer_name}' unknown anim '{play_at}'. Available: {list(sheet.animations.keys())}")
 
-        st.mode = "anim"
-        st.anim_name = play_at
-        st.anim_idx = 0
-
-        # keep raw_idx synced to current anim frame for meta/offsets/debug
-        first = sheet.animations[play_at].get("frames", [0])[0]
-        st.raw_idx = self._clamp(int(first), 0, len(sheet.frames) - 1)
+        st.timeline = sheet.timelines[play_at]
+        st.idx = 0
+        self._sync_batched(layer_name, reset_t=True)
 
     def stop_layer(self, layer_name: str, frame: Optional[int] = None) -> None:
         sheet = self.layer_sheets.get(layer_name, None)
@@ -272,11 +446,10 @@ class Costume:
         st.t = 0.0
 
         if frame is not None:
-            st.mode = "raw"
-            st.anim_name = None
-            st.anim_idx = 0
-            st.raw_idx = self._clamp(frame, 0, len(sheet.frames) - 1)
-    
+            st.timeline = sheet.raw_timeline
+            st.idx = self._clamp(frame, 0, len(sheet.frames) - 1)
+        self._sync_batched(layer_name, reset_t=True)
+
     def stop_layers(self, *layer_names: str, frame: Optional[int] = None) -> None:
         for layer_name in layer_names:
             self.stop_layer(layer_name, frame)
@@ -293,7 +466,8 @@ class Costume:
     # Update
     # -----------------------------
     def update(self, dt: float) -> None:
-        if self._paused:
+        if self._paused or self._batch is not None:
+            # batched costumes are stepped by their room's AnimationBatch
             return
 
         if self._layered:
@@ -302,141 +476,156 @@ class Costume:
             self._update_single(dt)
 
     def _update_single(self, dt: float) -> None:
-        if self.timeline.paused:
-            return
-        if not self.frames or self.framerate <= 0:
+        st = self.timeline
+        if st.paused or st.timeline is None or st.timeline.frame_duration <= 0:
             return
 
-        frames_list, speed, next_anim = self._resolve_single_timeline()
-        if not frames_list or speed <= 0:
-            return
-
-        frame_duration = 1.0 / (self.framerate * speed)
-        self.timeline.t += dt
-
-        while self.timeline.t >= frame_duration:
-            self.timeline.t -= frame_duration
-            self._step_timeline_single(frames_list, next_anim)
+        st.t += dt
+        while not st.paused and st.t >= st.timeline.frame_duration > 0:
+            st.t -= st.timeline.frame_duration
+            self._step_timeline_single()
 
-    def _resolve_single_timeline(self) -> tuple[list[int], float, Any]:
-        if self.timeline.mode == "anim" and self.timeline.anim_name:
-            anim = self.animations.get(self.timeline.anim_name, {})
-            return anim.get("frames", []), float(anim.get("speed", 1.0)), anim.get("next", None)
-        return list(range(len(self.frames))), 1.0, None
+    def _step_timeline_single(self) -> None:
+        st = self.timeline
+        tl = st.timeline
+        if st.idx < tl.last:
+            st.idx += 1
+            return
 
-    def _step_timeline_single(self, frames_list: list[int], next_anim: Any) -> None:
-        # RAW MODE
-        if self.timeline.mode == "raw":
-            if self.timeline.raw_idx + 1 < len(frames_list):
-                self.timeline.raw_idx += 1
+        # RAW MODE: loop or freeze on last frame (common behavior)
+        if tl.name is None:
+            if st.loops:
+                st.idx = 0
             else:
-                if getattr(self.timeline, "loops", True):
-                    self.timeline.raw_idx = 0
-                else:
-                    # freeze on last frame (common behavior)
-                    self.timeline.raw_idx = len(frames_list) - 1
-                    self.timeline.paused = True
-                    # optional: fire end for raw too
-                    self._fire_anim_end(animation_type="actor", animation=None, end_frame=self.timeline.raw_idx)
-            return  # <-- IMPORTANT
-
-        # ANIM MODE
-        if self.timeline.anim_idx + 1 < len(frames_list):
-            self.timeline.anim_idx += 1
+                st.paused = True
+                self._fire_anim_end(animation_type="actor", animation=None, end_frame=st.idx)
             return
 
-        # ended anim
-        ended = self.timeline.anim_name
-        end_frame = len(frames_list) - 1
-        self._fire_anim_end(animation_type="actor", animation=ended, end_frame=end_frame)
+        # ANIM MODE: ended anim
+        self._fire_anim_end(animation_type="actor", animation=tl.name, end_frame=tl.last)
 
+        next_anim = tl.next
         if next_anim is None:
-            if getattr(self.timeline, "loops", True):
-                self.timeline.anim_idx = 0
+            if st.loops:
+                st.idx = 0
             else:
-                self.timeline.anim_idx = end_frame
-                self.timeline.paused = True
+                st.paused = True
         elif next_anim is False:
-            self.timeline.anim_idx = end_frame
-            self.timeline.paused = True
-        elif isinstance(next_anim, str):
-            self.play(next_anim)
+            st.paused = True
+        elif next_anim is True:
+            st.idx = 0
         else:
-            self.timeline.anim_idx = 0
+            self.play(next_anim.name)
 
     def _update_layers(self, dt: float) -> None:
-        if self.framerate <= 0:
-            return
-
         for layer_name in self.layer_order:
-            sheet = self.layer_sheets[layer_name]
             st = self._layer_state[layer_name]
-
-            if st.paused:
-                continue
-            if not sheet.frames:
-                continue
-
-            frames_list, speed, next_anim = self._resolve_layer_timeline(sheet, st)
-            if not frames_list or speed <= 0:
+            if st.paused or st.timeline.frame_duration <= 0:
                 continue
 
-            frame_duration = 1.0 / (self.framerate * speed)
             st.t += dt
-
-            while st.t >= frame_duration:
-                st.t -= frame_duration
-                self._step_timeline_layer(layer_name, sheet, st, frames_list, next_anim)
-
-    def _resolve_layer_timeline(self, sheet: LayerSheet, st: LayerState) -> tuple[list[int], float, Any]:
-        if st.mode == "anim" and st.anim_name and st.anim_name in sheet.animations:
-            anim = sheet.animations[st.anim_name]
-            return anim.get("frames", []), float(anim.get("speed", 1.0)), anim.get("next", None)
-
-        # fallback to raw
-        st.mode = "raw"
-        st.anim_name = None
-        st.anim_idx = 0
-        return list(range(len(sheet.frames))), 1.0, None
-
-    def _step_timeline_layer(self, layer_name: str, sheet: LayerSheet, st: LayerState,
-                            frames_list: list[int], next_anim: Any) -> None:
-        if st.mode == "raw":
-            st.raw_idx = (st.raw_idx + 1) % len(frames_list)
+            while not st.paused and st.t >= st.timeline.frame_duration > 0:
+                st.t -= st.timeline.frame_duration
+                self._step_timeline_layer(layer_name, st)
+
+    def _step_timeline_layer(self, layer_name: str, st: LayerState) -> None:
+        tl = st.timeline
+        if tl.name is None:
+            st.idx = (st.idx + 1) % len(tl.frames)
             return
 
-        end_frame = len(frames_list) - 1
-
         # Normal advance
-        if st.anim_idx < end_frame:
-            st.anim_idx += 1
-            st.raw_idx = self._clamp(int(frames_list[st.anim_idx]), 0, len(sheet.frames) - 1)
+        if st.idx < tl.last:
+            st.idx += 1
             return
 
         # We are ON the last frame and another tick happened -> now it's "ended"
         if st.event_fired is False:
             self._fire_anim_end(
                 animation_type="layer",
-                animation=st.anim_name,
-                end_frame=end_frame,
+                animation=tl.name,
+                end_frame=tl.last,
                 layer_name=layer_name,
-                layer=sheet,
+                layer=self.layer_sheets[layer_name],
             )
         st.event_fired = True
 
         # Decide what happens next
-        if next_anim is None:
-            st.anim_idx = 0
-        elif next_anim is False:
-            st.anim_idx = end_frame
+        next_anim = tl.next
+        if next_anim is False:
             st.paused = True
-        elif isinstance(next_anim, str) and next_anim in sheet.animations:
-            st.anim_name = next_anim
-            st.anim_idx = 0
+        elif isinstance(next_anim, Timeline):
+            st.timeline = next_anim
+            st.idx = 0
         else:
-            st.anim_idx = 0
+            st.idx = 0
+
+    # -----------------------------
+    # Batched stepping
+    # -----------------------------
+    def attach_batch(self, batch) -> None:
+        """Hand this costume's timelines to a room's AnimationBatch (no-op without NumPy)."""
+        if batch is self._batch:
+            return
+        self.detach_batch()
+        if batch is None or not batch.available():
+            return
+
+        self._batch = batch
+        names = self.layer_order if self._layered else [None]
+        for name in names:
+            self._batch_slots[name] = batch.alloc(self, name)
+            self._sync_batched(name, reset_t=True)
 
-        st.raw_idx = self._clamp(int(frames_list[st.anim_idx]), 0, len(sheet.frames) - 1)
+    def detach_batch(self) -> None:
+        batch = self._batch
+        if batch is None:
+            return
+        for name, slot in self._batch_slots.items():
+            # hand the accumulated frame time back so update() continues seamlessly
+            self._timeline_state(name).t = float(batch.t[slot])
+            batch.release(slot)
+        self._batch_slots.clear()
+        self._batch = None
+
+    def _timeline_state(self, layer_name: Optional[str]) -> TimelineState:
+        return self.timeline if layer_name is None else self._layer_state[layer_name]
+
+    def _sync_all_batched(self) -> None:
+        for name in list(self._batch_slots):
+            self._sync_batched(name)
+
+    def _sync_batched(self, layer_name: Optional[str], reset_t: bool = False) -> None:
+        """Push a timeline's index/length/frame duration into the batch after any state change."""
+        if self._batch is None:
+            return
+        slot = self._batch_slots.get(layer_name)
+        if slot is None:
+            return
+
+        st = self._timeline_state(layer_name)
+        tl = st.timeline
+        active = not self._paused and not st.paused and tl is not None and tl.frame_duration > 0
+        self._batch.set(slot, active=active, idx=st.idx, count=len(tl.frames) if tl else 0,
+                        duration=tl.frame_duration if active else 1.0, t=0.0 if reset_t else None)
+
+    def _batched_set_index(self, layer_name: Optional[str], idx: int) -> None:
+        """Batch advanced a timeline without reaching its end."""
+        self._timeline_state(layer_name).idx = idx
+
+    def _batched_step(self, layer_name: Optional[str], steps: int) -> None:
+        """Batch says this timeline reached its end: step it the unbatched way (events, "next")."""
+        st = self._timeline_state(layer_name)
+        tl = st.timeline
+        for _ in range(steps):
+            if st.paused or st.timeline is not tl or self._batch is None:
+                break
+            if layer_name is None:
+                self._step_timeline_single()
+            else:
+                self._step_timeline_layer(layer_name, st)
+
+        self._sync_batched(layer_name)
 
     # -----------------------------
     # Rendering helpers
@@ -455,47 +644,52 @@ class Costume:
             return rp
         return self._single_reg_point()
 
-    def _single_image(self) -> pygame.Surface:
-        if not self.frames:
-            return pygame.Surface((1, 1), pygame.SRCALPHA)
-
-        if self.timeline.mode == "raw":
-            return self.frames[self._clamp(self.timeline.raw_idx, 0, len(self.frames) - 1)]
-
-        # anim mode
-        if not self.timeline.anim_name:
-            return self.frames[0]
+    def current_frame(self, scale: float = 1.0) -> tuple[pygame.Surface, tuple[int, int]]:
+        """
+        (image, reg_point) together; layered costumes are composed only once.
+        scale != 1 takes frames from the shared scaled-frame cache (see scaling.py).
+        """
+        step = SCALE_STEPS if scale == 1.0 else quantize(scale)
+        if self._layered:
+            return self._compose_layers(step)
+        image, (regX, regY) = self._single_image(), self._single_reg_point()
+        if step != SCALE_STEPS:
+            image = scaled_frames.get(image, step)
+            regX, regY = regX * step // SCALE_STEPS, regY * step // SCALE_STEPS
+        return image, (regX, regY)
+
+    def all_frames(self) -> list[pygame.Surface]:
+        """Every source frame this costume can show (all layers, mirrored ones too), e.g. to pre-scale them."""
+        sheets = list(self.layer_sheets.values()) if self._layered else [self]
+        frames = []
+        for sheet in sheets:
+            frames.extend(sheet.frames)
+            for tl in sheet.timelines.values():
+                if tl.flipped:
+                    frames.extend(dict.fromkeys(tl.images))
+        return frames
 
-        anim = self.animations.get(self.timeline.anim_name, {})
-        frames_list = anim.get("frames", [])
-        if not frames_list:
-            return self.frames[0]
+    @property
+    def frame_index(self) -> int:
+        """Sheet frame currently shown (base layer's frame for layered costumes)."""
+        if self._layered:
+            st = self._layer_state.get(self.base_layer_name) if self.base_layer_name else None
+            return st.raw_idx if st else 0
+        return self.timeline.raw_idx
 
-        i = self._clamp(self.timeline.anim_idx, 0, len(frames_list) - 1)
-        sheet_idx = self._clamp(int(frames_list[i]), 0, len(self.frames) - 1)
-        return self.frames[sheet_idx]
+    def _single_image(self) -> pygame.Surface:
+        tl = self.timeline.timeline
+        if tl is None or not tl.images:
+            return pygame.Surface((1, 1), pygame.SRCALPHA)
+        return tl.images[self.timeline.idx]
 
     def _single_reg_point(self) -> tuple[int, int]:
-        if not self.reg_points:
+        tl = self.timeline.timeline
+        if tl is None or not tl.reg_points:
             return (0, 0)
+        return tl.reg_points[self.timeline.idx]
 
-        if self.timeline.mode == "raw":
-            i = self._clamp(self.timeline.raw_idx, 0, len(self.reg_points) - 1)
-            return self.reg_points[i]
-
-        if not self.timeline.anim_name:
-            return self.reg_points[0]
-
-        anim = self.animations.get(self.timeline.anim_name, {})
-        frames_list = anim.get("frames", [])
-        if not frames_list:
-            return self.reg_points[0]
-
-        i = self._clamp(self.timeline.anim_idx, 0, len(frames_list) - 1)
-        sheet_idx = self._clamp(int(frames_list[i]), 0, len(self.reg_points) - 1)
-        return self.reg_points[sheet_idx]
-
-    def _compose_layers(self) -> tuple[pygame.Surface, tuple[int, int]]:
+    def _compose_layers(self, step: int = SCALE_STEPS) -> tuple[pygame.Surface, tuple[int, int]]:
         if not self.layer_sheets or not self.layer_order:
             return pygame.Surface((1, 1), pygame.SRCALPHA), (0, 0)
 
@@ -504,16 +698,15 @@ class Costume:
         for layer_name in self.layer_order:
             st = self._layer_state.get(layer_name)
             sheet = self.layer_sheets.get(layer_name)
-            if not st or not sheet or st.is_hidden:
+            if not st or not sheet or st.is_hidden or not st.timeline.images:
                 continue
 
-            if st.mode == "anim" and st.anim_name:
-                img, (regX, regY), _ = sheet.get_frame_anim(st.anim_name, st.anim_idx)
-            else:
-                img, (regX, regY) = sheet.get_frame_raw(st.raw_idx)
-
-            if img is None:
-                continue
+            regX, regY = st.timeline.reg_points[st.idx]
+            img = st.timeline.images[st.idx]
+            if step != SCALE_STEPS:
+                # scale each layer (stable, cacheable frames), then compose as usual
+                img = scaled_frames.get(img, step)
+                regX, regY = regX * step // SCALE_STEPS, regY * step // SCALE_STEPS
             parts.append((layer_name, img, regX, regY))
 
         if not parts:
@@ -534,13 +727,14 @@ class Costume:
         if self.base_layer_name and self.base_layer_name in self.layer_sheets:
             base_sheet = self.layer_sheets[self.base_layer_name]
             base_state = self._layer_state.get(self.base_layer_name)
-            if base_state:
-                base_idx = self._clamp(base_state.raw_idx, 0, len(base_sheet.frame_meta) - 1)
-                meta = base_sheet.frame_meta[base_idx]
+            if base_state and base_sheet.frame_meta:
+                meta = base_sheet.frame_meta[base_state.raw_idx]
                 if isinstance(meta, dict):
                     rel = meta.get("relativeOffsets")
                     if rel and len(rel) >= 2:
-                        x_offset, y_offset = int(rel[0]), int(rel[1])
+                        x_offset, y_offset = int(rel[0]) * step // SCALE_STEPS, int(rel[1]) * step // SCALE_STEPS
+                        if base_state.timeline is not None and base_state.timeline.flipped:
+                            x_offset = -x_offset
 
         for layer_name, img, regX, regY in parts:
             x = int((-regX) - left)
@@ -561,7 +755,10 @@ class Costume:
         # print(f"[costume.py] _fire_anim_end(): data={data}")
         if self.actor:
             self.actor._fire_event(ActorEvents.ANIMATION_END, **data)
-        pygame.event.post(pygame.event.Event(ActorEvents.ANIMATION_END, **data))
+        event_bus.publish(ActorEvents.ANIMATION_END, self.actor, **data)
+
+        if ActorEvents.POST_ANIMATION_END_TO_QUEUE:
+            pygame.event.post(pygame.event.Event(ActorEvents.ANIMATION_END, actor=self.actor, **data))
 
     @staticmethod
     def _clamp(v: int, lo: int, hi: int) -> int:
@@ -1,7 +1,15 @@
 import pygame
 import scummypy.resources as Resources
 
-class Cursors:
+class _LazyCursors(type):
+    def __getattr__(cls, name: str):
+        # Only called when `name` is not loaded yet
+        if name in cls.__dict__.get("SPECS", {}):
+            return cls.get(name)
+        raise AttributeError(name)
+
+
+class Cursors(metaclass=_LazyCursors):
     @staticmethod
     def HCursor(filename: str, hotspot=(0, 0)) -> pygame.cursors.Cursor | None:
         name=filename
@@ -35,22 +43,76 @@ class Cursors:
                 # Last resort: return None (caller should handle None)
                 return None
 
-    HIGHLIGHT = None
-    NORMAL = None
-    NWDeep = None
-    #NORTH
-    NEDeep = None
-    #EAST
-    EShallow = None
-    #SOUTH
-    WEST = None
-    #BACK TO NORTH
+    # Cursors are decoded on first use (Cursors.NEDeep etc.), not at engine startup.
+    # { attribute name: (filename, hotspot) }
+    SPECS: dict[str, tuple[str, tuple[int, int]]] = {
+        "HIGHLIGHT": ("hw_cursorHighlight.png", (0, 0)),
+        "NORMAL":    ("hw_cursorNormal.png", (0, 0)),
+        "NWDeep":    ("hw_cursorNWDeep.png", (0, 0)),
+        #NORTH
+        "NEDeep":    ("hw_cursorNEDeep.png", (30, 0)),
+        #EAST
+        "EShallow":  ("hw_cursorEShallow.png", (22, 16)),
+        #SOUTH
+        "WEST":      ("hw_cursorWest.png", (0, 14)),
+        #BACK TO NORTH
+    }
+
+    @classmethod
+    def get(cls, name: str) -> pygame.cursors.Cursor | None:
+        """Load (once) and return the cursor registered under `name` in SPECS."""
+        cursor = cls.__dict__.get(name)
+        if cursor is None:
+            filename, hotspot = cls.SPECS[name]
+            cursor = cls.HCursor(filename, hotspot)
+            setattr(cls, name, cursor)
+        return cursor
 
     @classmethod
     def load_all(cls):
-        cls.HIGHLIGHT = cls.HCursor("hw_cursorHighlight.png")
-        cls.NORMAL   = cls.HCursor("hw_cursorNormal.png")
-        cls.NWDeep   = cls.HCursor("hw_cursorNWDeep.png", (0, 0))
-        cls.NEDeep   = cls.HCursor("hw_cursorNEDeep.png", (30, 0))
-        cls.EShallow   = cls.HCursor("hw_cursorEShallow.png", (22, 16))
-        cls.WEST   = cls.HCursor("hw_cursorWest.png", (0, 14))
+        """Eagerly load every cursor (optional; normally they load on first use)."""
+        for name in cls.SPECS:
+            cls.get(name)
+
+
+class CursorState:
+    """
+    Remembers what SDL is currently showing so the engine only calls
+    pygame.mouse.set_visible()/set_cursor() when something actually changed.
+    """
+    def __init__(self):
+        self.visible: bool | None = None
+        self.cursor: pygame.cursors.Cursor | None = None
+        # SYSTEM_CURSOR_* constants -> pre-created Cursor objects
+        self._system_cursors: dict[int, pygame.cursors.Cursor] = {}
+
+    def resolve(self, cursor) -> pygame.cursors.Cursor | None:
+        if isinstance(cursor, int):
+            sys_cursor = self._system_cursors.get(cursor)
+            if sys_cursor is None:
+                sys_cursor = pygame.cursors.Cursor(cursor)
+                self._system_cursors[cursor] = sys_cursor
+            return sys_cursor
+        return cursor
+
+    def set_visible(self, visible: bool) -> None:
+        visible = bool(visible)
+        if visible is not self.visible:
+            pygame.mouse.set_visible(visible)
+            self.visible = visible
+
+    def set_cursor(self, cursor) -> None:
+        cursor = self.resolve(cursor)
+        if cursor is None or cursor is self.cursor:
+            return
+        try:
+            pygame.mouse.set_cursor(cursor)
+        except pygame.error:
+            # headless video drivers (e.g. replays with SDL_VIDEODRIVER=dummy) have no cursors
+            pass
+        self.cursor = cursor
+
+    def invalidate(self) -> None:
+        """Something outside the engine changed the OS cursor (e.g. a modal dialog)."""
+        self.visible = None
+        self.cursor = None
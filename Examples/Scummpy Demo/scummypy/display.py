@@ -0,0 +1,119 @@
+"""
+Fixed-size framebuffer presented to a window of any size.
+
+The game always draws into `Display.framebuffer` at the stage size (640x480 for
+the demo). Presenting it is one scale step:
+
+    - hardware: pygame.SCALED. SDL's renderer keeps the framebuffer as a texture and
+      the GPU scales/letterboxes it to the window or fullscreen size; SDL maps mouse
+      coordinates back to stage pixels itself.
+    - software fallback (no renderer, e.g. the dummy video driver): the window is a
+      plain surface, the framebuffer is scaled into a letterboxed rect once per frame
+      and mouse positions are mapped back here. With a window the size of the stage
+      the framebuffer *is* the window surface and presenting is just flip().
+"""
+import pygame
+
+
+class Display:
+    def __init__(self, size: tuple[int, int], window_size: tuple[int, int] | None = None,
+                 fullscreen: bool = False, hardware: bool = True):
+        self.size = (int(size[0]), int(size[1]))
+        self.window_size = window_size
+        self.fullscreen = fullscreen
+        self.hardware = False   # True once SCALED is in use
+
+        self.framebuffer: pygame.Surface | None = None
+        self._window: pygame.Surface | None = None
+        self._dest = pygame.Rect((0, 0), self.size)   # where the framebuffer lands in the window
+        self._dest_surface: pygame.Surface | None = None
+        self._open(hardware)
+
+    # -----------------------------
+    # Setup
+    # -----------------------------
+    def _open(self, hardware: bool) -> None:
+        if hardware:
+            flags = pygame.SCALED | (pygame.FULLSCREEN if self.fullscreen else 0)
+            try:
+                self.framebuffer = pygame.display.set_mode(self.size, flags)
+                self._window = self.framebuffer
+                self._dest = self.framebuffer.get_rect()
+                self._dest_surface = None
+                self.hardware = True
+                return
+            except pygame.error as e:
+                print(f"[display.py] no hardware scaling ({e}), scaling in software")
+
+        self.hardware = False
+        if self.fullscreen:
+            self._window = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            self._window = pygame.display.set_mode(self.window_size or self.size)
+        self._layout()
+
+    def _layout(self) -> None:
+        win_w, win_h = self._window.get_size()
+        if (win_w, win_h) == self.size:
+            self.framebuffer = self._window
+            self._dest = self._window.get_rect()
+            self._dest_surface = None
+            return
+
+        # largest aspect-correct rect, centered (black bars on the rest)
+        scale = min(win_w / self.size[0], win_h / self.size[1])
+        w, h = max(1, int(self.size[0] * scale)), max(1, int(self.size[1] * scale))
+        self._dest = pygame.Rect((win_w - w) // 2, (win_h - h) // 2, w, h)
+        self._window.fill((0, 0, 0))
+        self._dest_surface = self._window.subsurface(self._dest)
+        if self.framebuffer is None or self.framebuffer is self._window:
+            self.framebuffer = pygame.Surface(self.size).convert(self._window)
+
+    def toggle_fullscreen(self) -> None:
+        self.fullscreen = not self.fullscreen
+        if self.hardware:
+            try:
+                pygame.display.toggle_fullscreen()
+            except pygame.error as e:
+                self.fullscreen = not self.fullscreen
+                print(f"[display.py] toggle_fullscreen() failed: {e}")
+            return
+        keep = self.framebuffer.copy() if self.framebuffer is not self._window else None
+        self.framebuffer = None
+        self._open(False)
+        if keep is not None and self.framebuffer is not self._window:
+            self.framebuffer.blit(keep, (0, 0))
+
+    # -----------------------------
+    # Per frame
+    # -----------------------------
+    def present(self) -> None:
+        if self._dest_surface is not None:
+            # nearest-neighbour keeps pixel art crisp, straight into the window's letterbox rect
+            pygame.transform.scale(self.framebuffer, self._dest.size, self._dest_surface)
+        pygame.display.flip()
+
+    # -----------------------------
+    # Input mapping
+    # -----------------------------
+    def to_framebuffer(self, pos: tuple[int, int]) -> tuple[int, int]:
+        """Window pixel -> framebuffer pixel (clamped to the stage)."""
+        if self._dest_surface is None:
+            return pos
+        x = (pos[0] - self._dest.x) * self.size[0] // self._dest.w
+        y = (pos[1] - self._dest.y) * self.size[1] // self._dest.h
+        return (min(max(x, 0), self.size[0] - 1), min(max(y, 0), self.size[1] - 1))
+
+    def map_event(self, event: pygame.event.Event) -> pygame.event.Event:
+        """Mouse events with window coordinates -> the same event in framebuffer coordinates."""
+        if self._dest_surface is None or not hasattr(event, "pos"):
+            return event
+        data = dict(event.dict)
+        data["pos"] = self.to_framebuffer(event.pos)
+        if "rel" in data:
+            data["rel"] = (data["rel"][0] * self.size[0] // self._dest.w,
+                           data["rel"][1] * self.size[1] // self._dest.h)
+        return pygame.event.Event(event.type, data)
+
+    def mouse_pos(self) -> tuple[int, int]:
+        return self.to_framebuffer(pygame.mouse.get_pos())
@@ -0,0 +1,101 @@
+"""
+One surface per unique costume frame.
+
+Costumes and layer sheets share a lot of identical frames: PUTT's heads, eyes
+and lids appear in int-left-enter, int-stat-left, int-cu-stat and every layered
+close-up. Every frame a costume slices goes through `frame_store.intern()`,
+which hashes its pixels and hands back the surface already stored for that
+content, so each unique frame is in memory once no matter how many costumes
+use it. Identical frames also end up as the *same* Surface object, so the
+scaled/mirrored frame caches (keyed by surface) share their entries too.
+
+Frames are reference counted per owner: `own()` ties a list of interned frames
+to a costume/layer sheet and releases them when it is garbage collected. A
+frame no longer used by anything leaves the store.
+"""
+import weakref
+
+import pygame
+
+from .atlas import frame_hash
+
+
+class FrameStore:
+    def __init__(self):
+        # { content key: [surface, refs] }
+        self._frames: dict[tuple, list] = {}
+        # { surface: content key } for release()
+        self._keys: dict[pygame.Surface, tuple] = {}
+        self.interned = 0        # intern() calls
+        self.shared = 0          # ... answered with a stored frame
+        self.bytes_saved = 0     # memory those would have taken
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @staticmethod
+    def _key(surf: pygame.Surface) -> tuple:
+        # same pixels in a different blit format (colorkey vs alpha) are kept apart
+        colorkey = surf.get_colorkey()
+        return frame_hash(surf), colorkey, bool(surf.get_flags() & pygame.SRCALPHA)
+
+    @staticmethod
+    def _size(surf: pygame.Surface) -> int:
+        return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+    def intern(self, surf: pygame.Surface) -> pygame.Surface:
+        """The stored surface with surf's content (surf itself if it is new). Adds a reference."""
+        self.interned += 1
+        key = self._key(surf)
+        entry = self._frames.get(key)
+        if entry is None:
+            self._frames[key] = [surf, 1]
+            self._keys[surf] = key
+            return surf
+        entry[1] += 1
+        self.shared += 1
+        self.bytes_saved += self._size(surf)
+        return entry[0]
+
+    def release(self, frames) -> None:
+        """Drop one reference to each frame; frames nothing uses anymore leave the store."""
+        for surf in frames:
+            key = self._keys.get(surf)
+            if key is None:
+                continue
+            entry = self._frames[key]
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self._frames[key]
+                del self._keys[surf]
+
+    def own(self, owner, frames) -> None:
+        """Release `frames` once `owner` (a Costume / LayerSheet) is collected."""
+        weakref.finalize(owner, self.release, tuple(frames))
+
+    def refs(self, surf: pygame.Surface) -> int:
+        key = self._keys.get(surf)
+        return self._frames[key][1] if key is not None else 0
+
+    def stats(self) -> dict:
+        return {
+            "unique": len(self._frames),
+            "refs": sum(entry[1] for entry in self._frames.values()),
+            "bytes": sum(self._size(entry[0]) for entry in self._frames.values()),
+            "interned": self.interned,
+            "shared": self.shared,
+            "bytes_saved": self.bytes_saved,
+        }
+
+    def summary(self) -> str:
+        s = self.stats()
+        return (f"{s['refs']} frames in use -> {s['unique']} unique "
+                f"({s['bytes'] / 1024:.0f} KiB); {s['shared']}/{s['interned']} loads shared, "
+                f"{s['bytes_saved'] / 1024:.0f} KiB saved")
+
+    def report(self) -> None:
+        print(f"[framestore.py] {self.summary()}")
+
+
+# one store for every costume of every room
+frame_store = FrameStore()
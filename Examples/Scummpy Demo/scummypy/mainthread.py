@@ -0,0 +1,83 @@
+"""
+Running engine calls on the main thread.
+
+pygame/SDL surfaces, the mixer bookkeeping, rooms and actors all belong to the
+main thread. Worker threads (asset loaders, timers, anything a game script
+spawns) post work here instead; main_loop drains the queue once per frame
+within a time budget.
+
+Engine methods decorated with @on_main_thread do this automatically: called
+on the main thread they run right away, called from anywhere else they are
+queued and return a concurrent.futures.Future for their result.
+
+The queue is a plain deque: append() and popleft() are atomic in CPython, so
+posting never takes a lock.
+"""
+import functools
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable
+
+
+class MainThreadQueue:
+    def __init__(self, main_thread_id: int | None = None):
+        self.main_thread_id = main_thread_id if main_thread_id is not None else threading.get_ident()
+        self._queue: deque[tuple[Callable, tuple, dict, Future]] = deque()
+
+    def is_main_thread(self) -> bool:
+        return threading.get_ident() == self.main_thread_id
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def post(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queue fn(*args, **kwargs) for the main loop. Safe from any thread."""
+        future: Future = Future()
+        self._queue.append((fn, args, kwargs, future))
+        return future
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """Run now if on the main thread, otherwise post() and return the Future."""
+        if self.is_main_thread():
+            return fn(*args, **kwargs)
+        return self.post(fn, *args, **kwargs)
+
+    def drain(self, budget_ms: float = 4.0) -> int:
+        """
+        Run queued calls until the queue is empty or budget_ms is used up (at least one
+        call always runs, so the queue can't starve). Calls posted while draining wait
+        for the next frame. Returns how many ran.
+        """
+        queue = self._queue
+        if not queue:
+            return 0
+
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        ran = 0
+        for _ in range(len(queue)):
+            fn, args, kwargs, future = queue.popleft()
+            ran += 1
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except Exception as e:
+                    print(f"[mainthread.py] {getattr(fn, '__qualname__', fn)} failed:")
+                    traceback.print_exc()
+                    future.set_exception(e)
+            if time.perf_counter() >= deadline:
+                break
+        return ran
+
+
+def on_main_thread(method: Callable) -> Callable:
+    """Engine method decorator: off-thread calls are queued on engine.main_queue."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        queue: MainThreadQueue = self.main_queue
+        if queue.is_main_thread():
+            return method(self, *args, **kwargs)
+        return queue.post(method, self, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,210 @@
+"""
+Input recording and deterministic playback.
+
+A recording holds everything that reaches the game from outside:
+
+    - the RNG seed the session started with (random.shuffle in MusicSystem.shuffle_pool,
+      random.choice in room scripts, ... all use the seeded global `random`)
+    - per frame: the dt the game stepped with and the external events of that frame
+      (player input, QUIT, SOUND_END from the mixer, wall-clock timer events)
+    - the answers given to engine.prompt() dialogs
+
+Events the engine posts itself (ENGINE_RESTART_EVENT, ACTOR_UPDATE, ...) are not
+recorded; replaying the same inputs makes the game post them again.
+
+File layout (gzip):
+    header  b"SCRP" + <HI  version, seed
+    frame   <fH  dt, event count, then per event <IH type, payload length + JSON payload
+    prompts are stored as events of type PROMPT_RECORD
+
+Record:  python main.py --record session.scrp
+Replay:  python main.py --replay session.scrp --headless --report times.json
+"""
+import gzip
+import json
+import struct
+from collections import deque
+from typing import Optional
+
+import pygame
+
+MAGIC = b"SCRP"
+REPLAY_VERSION = 1
+
+# pygame.NOEVENT is never delivered by event.get(), so it is free to mark prompt answers
+PROMPT_RECORD = pygame.NOEVENT
+
+_HEADER = struct.Struct("<HI")
+_FRAME = struct.Struct("<fH")
+_EVENT = struct.Struct("<IH")
+
+# attributes that are tuples on pygame events and come back from JSON as lists
+_TUPLE_ATTRS = ("pos", "rel", "buttons")
+
+
+def _encode_event_dict(data: dict) -> bytes:
+    clean = {k: v for k, v in data.items() if isinstance(v, (int, float, str, bool, tuple, list, type(None)))}
+    return json.dumps(clean, separators=(",", ":")).encode("utf-8")
+
+
+def _decode_event_dict(payload: bytes) -> dict:
+    data = json.loads(payload.decode("utf-8")) if payload else {}
+    for key in _TUPLE_ATTRS:
+        if isinstance(data.get(key), list):
+            data[key] = tuple(data[key])
+    return data
+
+
+# -----------------------------
+# Recording
+# -----------------------------
+class ReplayRecorder:
+    def __init__(self, path: str, seed: int):
+        self.path = path
+        self.seed = seed
+        self.frames = 0
+        self._pending_prompts: list[bool] = []
+        self._file = gzip.open(path, "wb")
+        self._file.write(MAGIC + _HEADER.pack(REPLAY_VERSION, seed))
+
+    def record_prompt(self, result: bool) -> None:
+        self._pending_prompts.append(bool(result))
+
+    def record_frame(self, dt: float, events: list) -> None:
+        entries = [(event.type, _encode_event_dict(event.dict)) for event in events]
+        entries.extend((PROMPT_RECORD, _encode_event_dict({"result": r})) for r in self._pending_prompts)
+        self._pending_prompts.clear()
+
+        parts = [_FRAME.pack(dt, len(entries))]
+        for event_type, payload in entries:
+            parts.append(_EVENT.pack(event_type, len(payload)))
+            parts.append(payload)
+        self._file.write(b"".join(parts))
+        self.frames += 1
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        if self._pending_prompts:
+            self.record_frame(0.0, [])
+        self._file.close()
+        self._file = None
+        print(f"[replay.py] recorded {self.frames} frames to {self.path}")
+
+
+# -----------------------------
+# Playback
+# -----------------------------
+class ReplayPlayer:
+    def __init__(self, seed: int, frames: list[tuple[float, list]], prompts: list[bool]):
+        self.seed = seed
+        self._frames = deque(frames)
+        self._prompts = deque(prompts)
+        self.frame_count = len(frames)
+        # last pointer position seen in the recording (stands in for pygame.mouse.get_pos())
+        self.mouse_pos: tuple[int, int] = (0, 0)
+
+    @classmethod
+    def load(cls, path: str) -> "ReplayPlayer":
+        with gzip.open(path, "rb") as f:
+            data = f.read()
+
+        if data[:4] != MAGIC:
+            raise ValueError(f"[replay.py] {path} is not a replay file")
+        version, seed = _HEADER.unpack_from(data, 4)
+        if version != REPLAY_VERSION:
+            raise ValueError(f"[replay.py] {path}: version {version} != {REPLAY_VERSION}")
+
+        frames: list[tuple[float, list]] = []
+        prompts: list[bool] = []
+        offset = 4 + _HEADER.size
+        while offset < len(data):
+            dt, count = _FRAME.unpack_from(data, offset)
+            offset += _FRAME.size
+            events = []
+            for _ in range(count):
+                event_type, size = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                event_data = _decode_event_dict(data[offset:offset + size])
+                offset += size
+                if event_type == PROMPT_RECORD:
+                    prompts.append(bool(event_data.get("result")))
+                else:
+                    events.append((event_type, event_data))
+            frames.append((dt, events))
+
+        return cls(seed, frames, prompts)
+
+    def next_frame(self) -> Optional[tuple[float, list[pygame.event.Event]]]:
+        """(dt, events) for the next frame, None once the recording is used up."""
+        if not self._frames:
+            return None
+        dt, events = self._frames.popleft()
+        out = []
+        for event_type, event_data in events:
+            if "pos" in event_data:
+                self.mouse_pos = event_data["pos"]
+            out.append(pygame.event.Event(event_type, event_data))
+        return dt, out
+
+    def next_prompt(self) -> bool:
+        if not self._prompts:
+            print("[replay.py] recording has no more prompt answers, answering False")
+            return False
+        return self._prompts.popleft()
+
+
+# -----------------------------
+# Frame times
+# -----------------------------
+class FrameTimeHistogram:
+    # bucket upper bounds in ms; the last bucket catches everything slower
+    BUCKETS_MS = (1, 2, 4, 8, 12, 16.7, 25, 33.3, 50, 100)
+
+    def __init__(self):
+        self.samples: list[float] = []
+
+    def add(self, ms: float) -> None:
+        self.samples.append(ms)
+
+    def _percentile(self, ordered: list[float], pct: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100.0))]
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples)
+        counts = [0] * (len(self.BUCKETS_MS) + 1)
+        for ms in ordered:
+            for i, bound in enumerate(self.BUCKETS_MS):
+                if ms <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+
+        labels = [f"<={b}ms" for b in self.BUCKETS_MS] + [f">{self.BUCKETS_MS[-1]}ms"]
+        return {
+            "frames": len(ordered),
+            "mean_ms": sum(ordered) / len(ordered) if ordered else 0.0,
+            "p50_ms": self._percentile(ordered, 50),
+            "p95_ms": self._percentile(ordered, 95),
+            "p99_ms": self._percentile(ordered, 99),
+            "max_ms": ordered[-1] if ordered else 0.0,
+            "histogram": dict(zip(labels, counts)),
+        }
+
+    def report(self) -> str:
+        s = self.summary()
+        lines = [
+            f"[replay.py] {s['frames']} frames  mean {s['mean_ms']:.2f} ms  p50 {s['p50_ms']:.2f}"
+            f"  p95 {s['p95_ms']:.2f}  p99 {s['p99_ms']:.2f}  max {s['max_ms']:.2f}"
+        ]
+        peak = max(s["histogram"].values(), default=0) or 1
+        for label, count in s["histogram"].items():
+            lines.append(f"  {label:>9} {count:7d} {'#' * int(40 * count / peak)}")
+        return "\n".join(lines)
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
@@ -1,10 +1,37 @@
 import os
 import json
+import threading
 import pygame
 
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from .atlas import RoomAtlas, AtlasSheet
+from .walkbox import WalkboxMap, WALKBOX_FILE
+from .soundbank import SoundBank
+
 ASSETS_ROOT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets")
+BUILD_ROOT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "build")
 ROOM_PATH = ""
 
+# build/manifest.json written by `python -m scummypy build`, loaded on first use
+_build_manifest: dict | None = None
+# the built PCM sound bank; False until the first sound_bank() call with the mixer up
+_sound_bank: SoundBank | None | bool = False
+
+# { "room_name": RoomAtlas | None } - None means "checked, no atlas built"
+_room_atlases: dict[str, RoomAtlas | None] = {}
+
+# Worker threads for batch decoding. SDL_image/SDL_mixer release the GIL while decoding,
+# so several files really do decode at once. convert()/convert_alpha() stay on the main thread.
+LOADER_THREADS: int = min(8, os.cpu_count() or 2)
+_loader_pool: ThreadPoolExecutor | None = None
+_finished_batches: deque = deque()   # AssetBatch objects whose decoding is done
+
+# { (absolute path, colorkey): converted Surface } - see prepare_surface()
+_surface_cache: dict[tuple, pygame.Surface] = {}
+
 def _join(*parts):
     #print(f"_join()> ASSETS_ROOT={ASSETS_ROOT} & parts={parts}")
     sanitized = [str(p).lstrip('/\\') for p in parts]
@@ -12,24 +39,162 @@ def _join(*parts):
     #print(f"_join()> full_path={full_path}")
     return full_path
 
-def load_image(*path_parts):
-    path = _join(*path_parts)
-    return pygame.image.load(path).convert_alpha()
+# -----------------------------
+# Pixel formats
+# -----------------------------
+FORMAT_OPAQUE = "opaque"       # convert(): plain opaque blit
+FORMAT_COLORKEY = "colorkey"   # convert() + RLE colorkey: fully opaque/transparent pixels only
+FORMAT_ALPHA = "alpha"         # convert_alpha(): real per-pixel alpha (soft edges, shadows)
+
+# Key colors tried when turning 0/255-alpha images into colorkeyed ones
+_KEY_CANDIDATES = ((255, 0, 255), (0, 255, 255), (1, 254, 1), (254, 1, 254), (3, 2, 1))
+
+def classify_surface(surf: pygame.Surface) -> str:
+    """Which blit format the image actually needs, judged from its pixels."""
+    if surf.get_colorkey() is not None:
+        return FORMAT_COLORKEY
+    if not surf.get_flags() & pygame.SRCALPHA:
+        return FORMAT_OPAQUE
+
+    w, h = surf.get_size()
+    visible = pygame.mask.from_surface(surf, 0).count()      # alpha > 0
+    opaque = pygame.mask.from_surface(surf, 254).count()     # alpha == 255
+    if opaque == w * h:
+        return FORMAT_OPAQUE
+    if visible == opaque:
+        return FORMAT_COLORKEY
+    return FORMAT_ALPHA
+
+def _free_key_color(surf: pygame.Surface) -> tuple | None:
+    for key in _KEY_CANDIDATES:
+        if pygame.mask.from_threshold(surf, (*key, 255), (1, 1, 1, 1)).count() == 0:
+            return key
+    return None
+
+def prepare_surface(surf: pygame.Surface, colorkey: tuple | None = None) -> pygame.Surface:
+    """
+    Convert a decoded image to the fastest format that still draws it correctly.
+    `colorkey` marks a matte color that should become transparent (e.g. magenta backgrounds).
+    Main thread only; without a display the surface is returned unchanged.
+    """
+    if pygame.display.get_surface() is None:
+        return surf
+
+    if colorkey is not None:
+        colorkey = tuple(colorkey)[:3]
+        if surf.get_flags() & pygame.SRCALPHA:
+            # matte pixels -> alpha 0, then classify what is left
+            surf = surf.copy()
+            pygame.mask.from_threshold(surf, (*colorkey, 255), (1, 1, 1, 1)).to_surface(
+                surf, setcolor=(0, 0, 0, 0), unsetcolor=None)
+        else:
+            out = surf.convert()
+            out.set_colorkey(colorkey, pygame.RLEACCEL)
+            return out
+
+    if surf.get_colorkey() is not None:
+        # paletted PNGs key by palette index; the same RGB can also be an opaque entry,
+        # so go through real alpha and pick a key color nothing visible uses
+        surf = surf.convert_alpha()
+
+    fmt = classify_surface(surf)
+    if fmt == FORMAT_OPAQUE:
+        return surf.convert()
+    if fmt == FORMAT_COLORKEY:
+        key = _free_key_color(surf)
+        if key is not None:
+            out = pygame.Surface(surf.get_size()).convert()
+            out.fill(key)
+            out.blit(surf, (0, 0))
+            out.set_colorkey(key, pygame.RLEACCEL)
+            return out
+    return surf.convert_alpha()
+
+def load_image_path(path: str, colorkey: tuple | None = None) -> pygame.Surface:
+    """Load + prepare_surface(), cached per file and colorkey. Don't draw onto the result."""
+    key = (os.path.abspath(path), tuple(colorkey) if colorkey is not None else None)
+    surf = _surface_cache.get(key)
+    if surf is None:
+        surf = prepare_surface(pygame.image.load(path), colorkey)
+        _surface_cache[key] = surf
+    return surf
+
+def evict_surfaces(keep_room: str | None = None) -> None:
+    """Drop cached room images except `keep_room`'s (shared assets outside rooms/ stay)."""
+    rooms_root = os.path.abspath(_join("rooms")) + os.sep
+    keep = rooms_root + str(keep_room).strip("/\\") + os.sep if keep_room else None
+    for key in list(_surface_cache):
+        path = key[0]
+        if path.startswith(rooms_root) and not (keep and path.startswith(keep)):
+            del _surface_cache[key]
+
+def load_image(*path_parts, colorkey: tuple | None = None):
+    return load_image_path(_join(*path_parts), colorkey)
+
+def built_asset(target: str) -> str | None:
+    """Path of a baked build output (e.g. "rooms/street/atlas"), None if it wasn't built."""
+    global _build_manifest
+    if _build_manifest is None:
+        _build_manifest = {}
+        path = os.path.join(BUILD_ROOT, "manifest.json")
+        if os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as f:
+                _build_manifest = json.load(f).get("assets", {})
+    rel = _build_manifest.get(target)
+    if rel is None:
+        return None
+    path = os.path.join(BUILD_ROOT, *rel.split("/"))
+    return path if os.path.exists(path) else None
+
+def get_room_atlas(room: str) -> RoomAtlas | None:
+    room = str(room).strip("/\\")
+    if room not in _room_atlases:
+        _room_atlases[room] = RoomAtlas.load(_join("rooms", room), built_asset(f"rooms/{room}/atlas"))
+    return _room_atlases[room]
+
+def load_room_walkboxes(room: str) -> WalkboxMap | None:
+    """The room's walkboxes.json (the built one if there is one), None if it has none."""
+    room = str(room).strip("/\\")
+    path = built_asset(f"rooms/{room}/walkboxes") or _join("rooms", room, WALKBOX_FILE)
+    if not os.path.isfile(path):
+        return None
+    return WalkboxMap.load(path)
 
 def load_room_image(room: str, img: str):
+    atlas = get_room_atlas(room)
+    if atlas is not None:
+        region = atlas.image(img)
+        if region is not None:
+            return region
     return load_image("rooms", room, img)
 
+def _costume_sheet_source(*path_parts) -> str | AtlasSheet:
+    """The atlas sheet if the room has one, otherwise the file path still to be decoded."""
+    atlas = get_room_atlas(ROOM_PATH)
+    if atlas is not None:
+        sheet = atlas.sheet("/".join(str(p).strip("/\\") for p in path_parts))
+        if sheet is not None:
+            return sheet
+    return _join("rooms", ROOM_PATH, *path_parts)
+
 def load_room_costume(file_name: str):
+    return load_room_costume_async(file_name).result()
+
+def load_room_costume_async(file_name: str, on_done: Callable | None = None) -> "AssetBatch":
+    """
+    Same data as load_room_costume(), but every sheet/layer image decodes in parallel on the
+    loader pool. The batch resolves to (image, json_data, layer_images_src).
+    """
     json_path = _join("rooms", ROOM_PATH, "cost", f"{file_name}.json")
 
     with open(json_path, "r", encoding="utf-8") as f:
         json_data:dict = json.load(f)
     
-    layer_images_src = {}
+    # { img_name or None (single sheet): path | AtlasSheet }
+    sources: dict = {}
     base_url = json_data.get("base_url", None)
     if base_url is not None:
         # Using the Costume JSON 
-        image:pygame.Surface = pygame.Surface((0,0))  # placeholder
         layers = json_data.get("layers", {})
 
         # Some layers in the JSON can be empty strings (""), so guard for dicts
@@ -44,17 +209,141 @@ def load_room_costume(file_name: str):
 
             layer_images = layer.get("images", {})
             for img_name in layer_images:
-                layer_images_src[img_name] = (load_image("rooms", ROOM_PATH, "cost", base_url, f"{img_name}"))
+                sources[img_name] = _costume_sheet_source("cost", base_url, f"{img_name}")
 
     else:
-        image:pygame.Surface = load_image("rooms", ROOM_PATH, "cost", f"{file_name}.png")
+        sources[None] = _costume_sheet_source("cost", f"{file_name}.png")
+
+    to_decode = [name for name, src in sources.items() if isinstance(src, str)]
+
+    def finish(decoded: list) -> tuple:
+        loaded = dict(sources)
+        for name, surf in zip(to_decode, decoded):
+            loaded[name] = prepare_surface(surf)
 
-    return image, json_data, layer_images_src
+        if base_url is not None:
+            image:pygame.Surface = pygame.Surface((0,0))  # placeholder
+            return image, json_data, loaded
+        return loaded[None], json_data, {}
+
+    futures = [_pool().submit(pygame.image.load, sources[name]) for name in to_decode]
+    return AssetBatch(futures, finish, on_done)
+
+def sound_bank() -> SoundBank | None:
+    """The built PCM sound bank, None if there is none or it doesn't match the mixer format."""
+    global _sound_bank
+    if _sound_bank is False:
+        if not pygame.mixer.get_init():
+            return None
+        path = built_asset("audio/bank")
+        _sound_bank = SoundBank.open(path, ASSETS_ROOT) if path else None
+    return _sound_bank
 
 def load_sound(*path_parts):
     path = _join(*path_parts)
-    return pygame.mixer.Sound(path)
+    bank = sound_bank()
+    sound = bank.get(path) if bank is not None else None
+    return sound or pygame.mixer.Sound(path)
 
 def load_music_track(*path_parts):
     path = _join(*path_parts)
     return pygame.mixer.Sound(path)
+
+
+# -----------------------------
+# Batch / threaded loading
+# -----------------------------
+class AssetBatch:
+    """
+    A group of files decoding on the loader pool.
+    - futures:  one concurrent.futures.Future per file (raw decoded data)
+    - result(): blocks until decoded, runs the main-thread finishing step (convert_alpha)
+    - on_done:  called with the result, either from result() or from process_loaded()
+    """
+    def __init__(self, futures: list[Future], finish: Callable[[list], object], on_done: Callable | None = None):
+        self.futures = futures
+        self.on_done = on_done
+        self.finished = False
+        self._finish = finish
+        self._result = None
+        self._remaining = len(futures)
+        self._lock = threading.Lock()
+
+        if not futures:
+            _finished_batches.append(self)
+        for future in futures:
+            future.add_done_callback(self._on_future_done)
+
+    def _on_future_done(self, _future: Future) -> None:
+        # Runs on the worker thread: only queue the batch, the main thread finishes it
+        with self._lock:
+            self._remaining -= 1
+            ready = self._remaining == 0
+        if ready:
+            _finished_batches.append(self)
+
+    def done(self) -> bool:
+        return self.finished or all(f.done() for f in self.futures)
+
+    def result(self):
+        """Main thread only (convert_alpha needs the display)."""
+        if not self.finished:
+            decoded = [f.result() for f in self.futures]
+            self._result = self._finish(decoded)
+            self.finished = True
+            if callable(self.on_done):
+                self.on_done(self._result)
+        return self._result
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _loader_pool
+    if _loader_pool is None:
+        _loader_pool = ThreadPoolExecutor(max_workers=LOADER_THREADS, thread_name_prefix="scummypy-loader")
+    return _loader_pool
+
+def _path_of(path) -> str:
+    """Batch entries are either a single relative path or a tuple of path parts."""
+    if isinstance(path, (tuple, list)):
+        return _join(*path)
+    return _join(path)
+
+def load_images_async(paths: list, on_done: Callable | None = None, alpha: bool = True) -> AssetBatch:
+    """Decode many images in parallel. Resolves to a list of converted surfaces in `paths` order."""
+    futures = [_pool().submit(pygame.image.load, _path_of(p)) for p in paths]
+
+    def finish(decoded: list) -> list[pygame.Surface]:
+        if alpha:
+            return [prepare_surface(surf) for surf in decoded]
+        return [surf.convert() for surf in decoded]
+
+    return AssetBatch(futures, finish, on_done)
+
+def load_images(paths: list, alpha: bool = True) -> list[pygame.Surface]:
+    return load_images_async(paths, alpha=alpha).result()
+
+def load_sounds_async(paths: list, on_done: Callable | None = None) -> AssetBatch:
+    """Decode many sounds in parallel. Resolves to a list of pygame.mixer.Sound in `paths` order."""
+    futures = [_pool().submit(pygame.mixer.Sound, _path_of(p)) for p in paths]
+    return AssetBatch(futures, lambda decoded: decoded, on_done)
+
+def load_sounds(paths: list) -> list:
+    return load_sounds_async(paths).result()
+
+def process_loaded(max_batches: int = 0) -> int:
+    """
+    Call from the main loop once per frame. Finishes batches whose decoding is done
+    (convert_alpha + on_done callback). max_batches=0 means no limit.
+    Returns how many batches were finished.
+    """
+    count = 0
+    while _finished_batches:
+        if max_batches and count >= max_batches:
+            break
+        batch = _finished_batches.popleft()
+        count += 1
+        try:
+            batch.result()
+        except Exception as e:
+            print("[resources.py] process_loaded(): batch failed:", e)
+    return count
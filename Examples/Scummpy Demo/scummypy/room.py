@@ -1,7 +1,109 @@
 import pygame
 
 from .cursors import Cursors
-from .actor import ActorEvents
+from .actor import ActorEvents, actor_store
+from .animation import AnimationBatch
+from . import resources as Resources
+from .scaling import SCALE_STEPS, scaled_frames
+
+
+class ActorGroup(pygame.sprite.LayeredUpdates):
+    """
+    Actor sprite group that hands member costumes to the room's AnimationBatch.
+    Actors hidden with hide_current_items() leave the group and so stop animating, as before.
+    """
+    def __init__(self, animation: AnimationBatch | None = None, *sprites, **kwargs):
+        self.animation = animation
+        super().__init__(*sprites, **kwargs)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        if self.animation is not None and getattr(sprite, "costume", None) is not None:
+            sprite.costume.attach_batch(self.animation)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        costume = getattr(sprite, "costume", None)
+        if costume is not None and costume._batch is self.animation:
+            costume.detach_batch()
+
+class SpriteGroup(pygame.sprite.LayeredUpdates):
+    """
+    Room sprites. Static sprites in the bottom layers (every layer below the first
+    one holding a dynamic or off-background sprite) are baked into an opaque copy
+    of the room background, which Room.draw() blits instead of the background, so
+    they cost nothing per frame. The bake is redone only when a sprite is added,
+    removed, changes layer, moves through pos/x/y or gets a new image, or when the
+    room background is swapped. Everything from that layer up is drawn every
+    frame, in layer order.
+    """
+    def __init__(self, *sprites, **kwargs):
+        self._baked: list = []
+        self._drawn: list = []
+        self._background: pygame.Surface | None = None
+        self._background_key = None
+        self._dirty = True
+        self.bakes = 0
+        super().__init__(*sprites, **kwargs)
+
+    def invalidate(self):
+        self._dirty = True
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self._dirty = True
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self._dirty = True
+
+    def change_layer(self, sprite, new_layer):
+        super().change_layer(sprite, new_layer)
+        self._dirty = True
+
+    def _split(self, background_rect: pygame.Rect):
+        self._baked, self._drawn = [], []
+        sprites = self.sprites()
+        cut = None      # first layer that has to be drawn per frame
+        for sprite in sprites:
+            if not getattr(sprite, "static", False) or not background_rect.contains(sprite.rect):
+                cut = self.get_layer_of_sprite(sprite)
+                break
+        for sprite in sprites:
+            if cut is not None and self.get_layer_of_sprite(sprite) >= cut:
+                self._drawn.append(sprite)
+            elif sprite.image is not None:
+                self._baked.append(sprite)
+
+    def baked_background(self, background: pygame.Surface, background_rect: pygame.Rect) -> pygame.Surface:
+        """`background` with the bottom static sprites on it (background itself if there are none)."""
+        key = (background, tuple(background_rect))
+        if self._dirty or key != self._background_key:
+            self._dirty = False
+            self._background_key = key
+            self._split(background_rect)
+            self._background = None
+            if self._baked:
+                self.bakes += 1
+                plane = pygame.Surface(background.get_size())
+                if pygame.display.get_surface() is not None:
+                    plane = plane.convert()
+                plane.blit(background, (0, 0))
+                plane.blits([(s.image, s.rect.move(-background_rect.x, -background_rect.y)) for s in self._baked],
+                            doreturn=False)
+                self._background = plane
+        return self._background or background
+
+    def draw(self, surface, bgsurf=None, special_flags=0):
+        """Draws what baked_background() left out. Call after blitting the baked background."""
+        if self._drawn:
+            surface.blits([(s.image, s.rect) for s in self._drawn if s.image is not None], doreturn=False)
+        return []
+
+    def draw_all(self, surface):
+        """Every sprite, in layer order (no background to bake into)."""
+        surface.blits([(s.image, s.rect) for s in self.sprites() if s.image is not None], doreturn=False)
+
 
 class Room:
     ROOM_NAME: str = __name__
@@ -22,9 +124,14 @@ class Room:
         # use passed-in rect or default to (0, 0)
         self.background_rect = background_rect or self.background.get_rect(topleft=(0, 0))
 
-        self.actors = pygame.sprite.LayeredUpdates()
-        self.sprites = pygame.sprite.LayeredUpdates()
+        # every actor timeline in the room is stepped in one go (falls back to per-actor updates without NumPy)
+        self.animation = AnimationBatch() if AnimationBatch.available() else None
+        self.actors = ActorGroup(self.animation)
+        # static sprites are baked into a copy of the background (see SpriteGroup)
+        self.sprites = SpriteGroup()
         self.hotspots = []  # list of (pygame.Rect, callback)
+        # walkable floor + precomputed next-hop table, see walkbox.py (None: actors walk in straight lines)
+        self.walkboxes = Resources.load_room_walkboxes(room_name)
         self._hidden_actors = []
         self._hidden_sprites = []
 
@@ -85,15 +192,38 @@ class Room:
                 break
 
     def update(self, dt: float):
+            if self.animation is not None:
+                self.animation.step(dt)
             self.actors.update(dt)
             self.sprites.update(dt)
 
+    def scale_at(self, y: float) -> float:
+        """Depth scale for an actor standing at y (1.0 without walkboxes/scale bands)."""
+        return self.walkboxes.scale_at(y) if self.walkboxes is not None else 1.0
+
+    def prewarm_scaled_frames(self, costume) -> int:
+        """Pre-scale every frame of `costume` for every scale this room's walkboxes can produce."""
+        if self.walkboxes is None:
+            return 0
+        steps = self.walkboxes.scale_steps() - {SCALE_STEPS}
+        return scaled_frames.warm(costume.all_frames(), sorted(steps))
+
+    def move_actors(self, dx: float, dy: float, actors=None):
+        """
+        Shift many actors at once (default: every actor in the room) in the ActorStore.
+        Their rects are only marked dirty; Actor.update() (or a hit test) brings them up to date.
+        """
+        actors = self.actors if actors is None else actors
+        actor_store.move([a._slot for a in actors], dx, dy)
+
     def draw(self, screen):
         if self.engine.game_state.get_flag("g_roomVisible") is True:
-            screen.blit(self.background, self.background_rect)
-
-        self.actors.draw(screen)
-        self.sprites.draw(screen)
+            screen.blit(self.sprites.baked_background(self.background, self.background_rect), self.background_rect)
+            self.actors.draw(screen)
+            self.sprites.draw(screen)
+        else:
+            self.actors.draw(screen)
+            self.sprites.draw_all(screen)
 
         # DEBUG: draw hotspot rectangles
         if self.engine.DEBUG:
@@ -212,6 +342,10 @@ class Room:
 
     def add_actor(self, actor, actor_name):
         actor.__name__= actor_name
+        if actor.room is None:
+            # walk_to() needs the room's walkboxes
+            actor.room = self
+            actor.engine = self.engine
         # store in ID table
         self.engine.actor_table[actor.actor_id] = actor
 
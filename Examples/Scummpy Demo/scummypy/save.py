@@ -0,0 +1,355 @@
+"""
+Binary save games.
+
+A save is a versioned header followed by one tagged value (see encode_value):
+
+    b"SCSV" <H version>  { "flags": {...}, "inventory": ..., "room": id,
+                           "actors": {id: {"name", "x", "y"}}, "music": {...} }
+
+Autosaves are a full snapshot plus a journal next to it (<name>.log) of
+length-prefixed records holding only what changed since the previous autosave:
+changed/removed flags, and room/inventory/actors/music when they differ.
+Loading applies the journal on top of the snapshot. After JOURNAL_COMPACT_AT
+records the next autosave writes a fresh snapshot and empties the journal.
+
+Snapshots are captured on the main thread: flags are encoded once (which also
+detaches them from lists the game keeps mutating), the rest is a few small
+copies. Diffing against the last autosave, serialization and disk writes happen
+on a single background writer thread so autosaving on every room change does
+not cost a frame.
+"""
+import copy
+import os
+import struct
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Optional
+
+SAVE_MAGIC = b"SCSV"
+SAVE_VERSION = 1
+JOURNAL_COMPACT_AT = 64
+
+_HEADER = struct.Struct("<4sH")
+_LEN = struct.Struct("<I")
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+
+
+# -----------------------------
+# Value codec
+# -----------------------------
+class _Encoded(bytes):
+    """A value already run through encode_value(); written out as is."""
+
+
+def encode_value(value: Any, out: bytearray) -> None:
+    """Tagged binary encoding for None/bool/int/float/str/bytes/list/tuple/dict."""
+    if isinstance(value, _Encoded):
+        out += value
+    elif value is None:
+        out += b"N"
+    elif value is True:
+        out += b"T"
+    elif value is False:
+        out += b"F"
+    elif isinstance(value, int):
+        out += b"i"
+        out += _INT.pack(value)
+    elif isinstance(value, float):
+        out += b"f"
+        out += _FLOAT.pack(value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        out += b"s"
+        out += _LEN.pack(len(data))
+        out += data
+    elif isinstance(value, (bytes, bytearray)):
+        out += b"b"
+        out += _LEN.pack(len(value))
+        out += value
+    elif isinstance(value, (list, tuple)):
+        out += b"l" if isinstance(value, list) else b"t"
+        out += _LEN.pack(len(value))
+        for item in value:
+            encode_value(item, out)
+    elif isinstance(value, dict):
+        out += b"d"
+        out += _LEN.pack(len(value))
+        for key, item in value.items():
+            encode_value(key, out)
+            encode_value(item, out)
+    else:
+        raise TypeError(f"[save.py] can't save {type(value).__name__} values")
+
+
+def decode_value(data: bytes, offset: int = 0) -> tuple[Any, int]:
+    """Returns (value, offset after it)."""
+    tag = data[offset:offset + 1]
+    offset += 1
+    if tag == b"N":
+        return None, offset
+    if tag == b"T":
+        return True, offset
+    if tag == b"F":
+        return False, offset
+    if tag == b"i":
+        return _INT.unpack_from(data, offset)[0], offset + _INT.size
+    if tag == b"f":
+        return _FLOAT.unpack_from(data, offset)[0], offset + _FLOAT.size
+    if tag in (b"s", b"b"):
+        size = _LEN.unpack_from(data, offset)[0]
+        offset += _LEN.size
+        raw = bytes(data[offset:offset + size])
+        return (raw.decode("utf-8") if tag == b"s" else raw), offset + size
+    if tag in (b"l", b"t"):
+        count = _LEN.unpack_from(data, offset)[0]
+        offset += _LEN.size
+        items = []
+        for _ in range(count):
+            item, offset = decode_value(data, offset)
+            items.append(item)
+        return (items if tag == b"l" else tuple(items)), offset
+    if tag == b"d":
+        count = _LEN.unpack_from(data, offset)[0]
+        offset += _LEN.size
+        result = {}
+        for _ in range(count):
+            key, offset = decode_value(data, offset)
+            result[key], offset = decode_value(data, offset)
+        return result, offset
+    raise ValueError(f"[save.py] corrupt save data (tag {tag!r} at {offset - 1})")
+
+
+def _encoded(value: Any) -> Optional[_Encoded]:
+    out = bytearray()
+    try:
+        encode_value(value, out)
+    except TypeError:
+        return None
+    return _Encoded(out)
+
+
+# -----------------------------
+# Snapshots
+# -----------------------------
+def capture_snapshot(engine) -> dict:
+    """
+    Everything a save holds. Call on the main thread. Flag values are kept
+    encoded (_Encoded bytes): lists the game keeps mutating can't change under
+    the writer thread, and autosave diffs compare the bytes.
+    """
+    state = engine.game_state
+    flags = {}
+    for name, value in state.flags.items():
+        # runtime-only values (e.g. pygame cursors kept in flags) are not saved
+        data = _encoded(value)
+        if data is not None:
+            flags[name] = data
+
+    actors = {}
+    for actor_id, actor in engine.actor_table.items():
+        actors[int(actor_id)] = {
+            "name": getattr(actor, "__name__", ""),
+            "x": float(actor.x),
+            "y": float(actor.y),
+        }
+
+    music = getattr(engine, "music", None)
+    music_state = None
+    if music is not None:
+        music_state = {
+            "preferred": list(music.preferred_pool) if music.preferred_pool is not None else None,
+            "saved": list(music._preferred_pool_save) if music._preferred_pool_save is not None else None,
+            "current": list(music._current_pool),
+            "index": int(music._current_index),
+            "song": int(music._current_song_id),
+        }
+
+    inventory = state.get_inventory() if hasattr(state, "get_inventory") else getattr(state, "inventory", None)
+    return {
+        "flags": flags,
+        "inventory": inventory.copy() if isinstance(inventory, (list, dict)) else inventory,
+        "room": state.get_flag("g_currentRoom"),
+        "actors": actors,
+        "music": music_state,
+    }
+
+
+def encode_snapshot(snapshot: dict) -> bytes:
+    out = bytearray(_HEADER.pack(SAVE_MAGIC, SAVE_VERSION))
+    encode_value(snapshot, out)
+    return bytes(out)
+
+
+def decode_snapshot(data: bytes) -> dict:
+    magic, version = _HEADER.unpack_from(data, 0)
+    if magic != SAVE_MAGIC:
+        raise ValueError("[save.py] not a save file")
+    if version != SAVE_VERSION:
+        raise ValueError(f"[save.py] save version {version} != {SAVE_VERSION}")
+    snapshot, _ = decode_value(data, _HEADER.size)
+    return snapshot
+
+
+def apply_snapshot(engine, snapshot: dict) -> None:
+    """
+    Put a snapshot back into the running game: state, room, actor positions and music pool.
+    Autosaves once the whole snapshot is in (not from change_room, halfway through).
+    """
+    state = engine.game_state
+    flags = snapshot.get("flags", {})
+    autosave = getattr(engine, "AUTOSAVE_ON_ROOM_CHANGE", False)
+
+    # deep copies: the game mutates some flag values (e.g. the room history list) in place
+    state.flags = copy.deepcopy(flags)
+    if snapshot.get("inventory") is not None:
+        state.inventory = copy.deepcopy(snapshot["inventory"])
+
+    room_id = snapshot.get("room")
+    if isinstance(room_id, int) and room_id > 0 and room_id in engine.room_registry:
+        engine.AUTOSAVE_ON_ROOM_CHANGE = False
+        try:
+            engine.change_room(room_id)
+        finally:
+            engine.AUTOSAVE_ON_ROOM_CHANGE = autosave
+        # change_room rewrites the room history flags; the saved ones win
+        for name, value in copy.deepcopy(flags).items():
+            state.set_flag(name, value)
+
+    for actor_id, data in (snapshot.get("actors") or {}).items():
+        actor = engine.actor_table.get(actor_id)
+        if actor is not None and getattr(actor, "__name__", "") == data.get("name"):
+            actor.pos = (data["x"], data["y"])
+
+    music_state = snapshot.get("music")
+    music = getattr(engine, "music", None)
+    if music is not None and music_state:
+        music.preferred_pool = music_state["preferred"]
+        music._preferred_pool_save = music_state["saved"]
+        music._current_pool = music_state["current"]
+        music._current_index = music_state["index"]
+        song_id = music_state["song"]
+        if song_id > 0 and song_id != music._current_song_id and state.get_flag("g_musicMuted") is not True:
+            music.start_song(song_id)
+
+    if autosave and getattr(engine, "_replay", None) is None:
+        engine.saves.autosave()
+
+
+def _snapshot_delta(previous: dict, current: dict) -> dict:
+    delta: dict = {}
+    prev_flags, flags = previous["flags"], current["flags"]
+    changed = {name: data for name, data in flags.items() if prev_flags.get(name) != data}
+    removed = [name for name in prev_flags if name not in flags]
+    if changed:
+        delta["flags"] = changed
+    if removed:
+        delta["removed"] = removed
+    for key in ("inventory", "room", "actors", "music"):
+        if _encoded(previous.get(key)) != _encoded(current.get(key)):
+            delta[key] = current.get(key)
+    return delta
+
+
+def _apply_delta(snapshot: dict, delta: dict) -> None:
+    snapshot.setdefault("flags", {}).update(delta.get("flags", {}))
+    for name in delta.get("removed", ()):
+        snapshot["flags"].pop(name, None)
+    for key in ("inventory", "room", "actors", "music"):
+        if key in delta:
+            snapshot[key] = delta[key]
+
+
+# -----------------------------
+# Save system
+# -----------------------------
+class SaveSystem:
+    def __init__(self, engine, save_dir: str = "saves"):
+        self.engine = engine
+        self.save_dir = save_dir
+        self.autosave_name = "autosave.sav"
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scummypy-save")
+
+        # what the last autosave on disk looks like, for journal deltas (writer thread only)
+        self._last_snapshot: Optional[dict] = None
+        self._journal_records = 0
+
+    def _path(self, name: str) -> str:
+        return name if os.path.isabs(name) else os.path.join(self.save_dir, name)
+
+    # ---------- full saves ----------
+    def save(self, name: str) -> Future:
+        """Snapshot now, write `name` in the background. Returns the writer future."""
+        snapshot = capture_snapshot(self.engine)
+        return self._writer.submit(self._write_full, self._path(name), snapshot, None)
+
+    def load(self, name: str) -> dict:
+        """Read `name` (plus its journal if it is an autosave) and apply it to the game."""
+        self.flush()
+        snapshot = self.read(name)
+        apply_snapshot(self.engine, snapshot)
+        return snapshot
+
+    def read(self, name: str) -> dict:
+        path = self._path(name)
+        with open(path, "rb") as f:
+            snapshot = decode_snapshot(f.read())
+
+        journal = path + ".log"
+        if os.path.isfile(journal):
+            with open(journal, "rb") as f:
+                data = f.read()
+            offset = 0
+            while offset + _LEN.size <= len(data):
+                size = _LEN.unpack_from(data, offset)[0]
+                offset += _LEN.size
+                if offset + size > len(data):
+                    break   # torn last record (crash mid-write): ignore it
+                delta, _ = decode_value(data, offset)
+                offset += size
+                _apply_delta(snapshot, delta)
+        return snapshot
+
+    # ---------- autosave ----------
+    def autosave(self) -> Future:
+        """Write only what changed since the last autosave (full snapshot now and then)."""
+        snapshot = capture_snapshot(self.engine)
+        return self._writer.submit(self._write_autosave, self._path(self.autosave_name), snapshot)
+
+    def flush(self) -> None:
+        """Wait for every queued write."""
+        self._writer.submit(lambda: None).result()
+
+    def shutdown(self) -> None:
+        self._writer.shutdown(wait=True)
+
+    # ---------- writer thread ----------
+    def _write_autosave(self, path: str, snapshot: dict) -> str:
+        if self._last_snapshot is None or self._journal_records >= JOURNAL_COMPACT_AT:
+            self._write_full(path, snapshot, path + ".log")
+            self._journal_records = 0
+        else:
+            delta = _snapshot_delta(self._last_snapshot, snapshot)
+            if not delta:
+                return path
+            self._append_journal(path + ".log", delta)
+            self._journal_records += 1
+        self._last_snapshot = snapshot
+        return path
+
+    def _write_full(self, path: str, snapshot: dict, journal: Optional[str]) -> str:
+        data = encode_snapshot(snapshot)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        if journal and os.path.exists(journal):
+            os.remove(journal)
+        return path
+
+    def _append_journal(self, journal: str, delta: dict) -> str:
+        out = bytearray()
+        encode_value(delta, out)
+        with open(journal, "ab") as f:
+            f.write(_LEN.pack(len(out)) + out)
+        return journal
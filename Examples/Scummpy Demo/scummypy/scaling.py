@@ -0,0 +1,105 @@
+"""
+Depth scaling of actors.
+
+Rooms define scale bands: (y, scale) points, linearly interpolated by the
+actor's y (SCUMM's scale slots). Scales are quantised to 1/SCALE_STEPS so
+nearby y positions share frames, and every scaled frame comes out of
+`scaled_frames`, a byte-bounded LRU cache keyed by (source frame, quantised
+scale). Once the frames an actor uses are cached, drawing a scaled actor
+costs the same as an unscaled one: a dict lookup instead of a transform.
+
+Costume.current_frame(scale) scales single frames and each layer of a
+layered costume before composing, so the cache always sees stable source
+surfaces. Room.prewarm_scaled_frames(costume) fills the cache for every
+scale its walkboxes can produce.
+"""
+from collections import OrderedDict
+
+import pygame
+
+SCALE_STEPS = 64      # scales are multiples of 1/64
+MIN_SCALE = 1         # in steps
+
+
+def quantize(scale: float) -> int:
+    """Scale -> cache step (SCALE_STEPS == unscaled)."""
+    return max(MIN_SCALE, int(round(scale * SCALE_STEPS)))
+
+
+def interpolate_bands(bands: list[tuple[float, float]], y: float) -> float:
+    """Scale at y from sorted (y, scale) points; clamped outside the first/last point."""
+    if not bands:
+        return 1.0
+    if y <= bands[0][0]:
+        return bands[0][1]
+    for (y0, s0), (y1, s1) in zip(bands, bands[1:]):
+        if y <= y1:
+            if y1 == y0:
+                return s1
+            return s0 + (s1 - s0) * (y - y0) / (y1 - y0)
+    return bands[-1][1]
+
+
+class ScaledFrameCache:
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        # { (source Surface, step): scaled Surface }, least recently used first
+        self._frames: OrderedDict[tuple[pygame.Surface, int], pygame.Surface] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def get(self, image: pygame.Surface, step: int) -> pygame.Surface:
+        if step == SCALE_STEPS:
+            return image
+        key = (image, step)
+        scaled = self._frames.get(key)
+        if scaled is not None:
+            self._frames.move_to_end(key)
+            self.hits += 1
+            return scaled
+
+        self.misses += 1
+        scaled = self._scale(image, step)
+        self._frames[key] = scaled
+        self.bytes += self._size(scaled)
+        while self.bytes > self.max_bytes and len(self._frames) > 1:
+            _, old = self._frames.popitem(last=False)
+            self.bytes -= self._size(old)
+        return scaled
+
+    def warm(self, images, steps) -> int:
+        """Scale every image at every step now (e.g. while a room loads). Returns new entries."""
+        before = self.misses
+        for step in steps:
+            for image in images:
+                self.get(image, step)
+        return self.misses - before
+
+    def clear(self) -> None:
+        self._frames.clear()
+        self.bytes = 0
+
+    @staticmethod
+    def _size(surf: pygame.Surface) -> int:
+        return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+    @staticmethod
+    def _scale(image: pygame.Surface, step: int) -> pygame.Surface:
+        w, h = image.get_size()
+        size = (max(1, w * step // SCALE_STEPS), max(1, h * step // SCALE_STEPS))
+        key = image.get_colorkey()
+        if key is not None or image.get_bitsize() < 24:
+            # colorkeyed frames: filtering would blend the key color into the edges
+            scaled = pygame.transform.scale(image, size)
+            if key is not None:
+                scaled.set_colorkey(key, pygame.RLEACCEL)
+            return scaled
+        return pygame.transform.smoothscale(image, size)
+
+
+# one pool for every room: actors in consecutive rooms often share costumes
+scaled_frames = ScaledFrameCache()
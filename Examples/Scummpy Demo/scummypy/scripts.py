@@ -0,0 +1,279 @@
+"""
+Cooperative room/cutscene scripts, SCUMM style.
+
+A script is a generator (or `async def`) that yields what it waits for:
+
+    def close_up_script(room, engine):
+        yield WaitMs(400)
+        engine.say_line(["putt_0004", "putt_0005"])
+        yield WaitTalkieEnd(channel=0)
+        yield WaitMs(1000)
+        hide_close_up(room, engine)
+
+    engine.scripts.start(close_up_script, room, engine, room=room)
+
+    yield None / WaitFrames(n)       next frame / n frames
+    yield WaitMs(ms)                 game time (the main loop's dt, so replays match)
+    yield WaitAnimationEnd(actor)    ANIMATION_END of that actor (optionally one animation)
+    yield WaitTalkieEnd(channel)     the say_line() playing on that channel finishes or is stopped
+    yield signal / other_script      a Signal fired from a callback, another Script finishing
+
+Scripts only ever run inside ScriptScheduler.update(), which main_loop calls once
+per frame on the main thread. Timed waits sit in heaps, so a frame with
+nothing due costs two heap peeks.
+"""
+import heapq
+import traceback
+from collections import deque
+from typing import Any, Callable
+
+from .actor import ActorEvents, event_bus
+
+
+# -----------------------------
+# Waits
+# -----------------------------
+class _Wait:
+    __slots__ = ()
+
+    def __await__(self):
+        # lets `async def` scripts do `await WaitMs(400)`
+        return (yield self)
+
+
+class WaitFrames(_Wait):
+    __slots__ = ("frames",)
+
+    def __init__(self, frames: int = 1):
+        self.frames = max(1, int(frames))
+
+
+class WaitMs(_Wait):
+    __slots__ = ("ms",)
+
+    def __init__(self, ms: float):
+        self.ms = float(ms)
+
+
+class WaitAnimationEnd(_Wait):
+    __slots__ = ("actor", "animation")
+
+    def __init__(self, actor, animation: str | None = None):
+        self.actor = actor
+        self.animation = animation
+
+
+class WaitTalkieEnd(_Wait):
+    __slots__ = ("channel",)
+
+    def __init__(self, channel: int = 0):
+        self.channel = channel
+
+
+class Signal(_Wait):
+    """Something a callback fires (e.g. an audio on_end_cb) that scripts can wait on."""
+    __slots__ = ("fired", "_waiters")
+
+    def __init__(self):
+        self.fired = False
+        self._waiters: list[Callable[[], None]] = []
+
+    def __call__(self, *_args) -> None:
+        self.fired = True
+        waiters, self._waiters = self._waiters, []
+        for wake in waiters:
+            wake()
+
+
+# -----------------------------
+# Scripts
+# -----------------------------
+class Script:
+    __slots__ = ("name", "room", "done", "_gen", "_wait_id", "_on_done", "_unsubscribe")
+
+    def __init__(self, gen, name: str, room=None):
+        self.name = name
+        self.room = room
+        self.done = False
+        self._gen = gen
+        self._wait_id = 0            # bumped on every resume/stop; stale heap entries are skipped
+        self._on_done = Signal()
+        self._unsubscribe: Callable[[], None] | None = None
+
+    def stop(self) -> None:
+        if self.done:
+            return
+        self._finish()
+        if getattr(self._gen, "gi_running", False) or getattr(self._gen, "cr_running", False):
+            return   # stopped from inside itself: closed once it yields (see _resume)
+        try:
+            self._gen.close()
+        except Exception:
+            traceback.print_exc()
+
+    def _finish(self) -> None:
+        self.done = True
+        self._wait_id += 1
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        self._on_done()
+
+    def __repr__(self) -> str:
+        return f"<Script {self.name}{' done' if self.done else ''}>"
+
+
+class ScriptScheduler:
+    def __init__(self):
+        self.frame = 0
+        self.time_ms = 0.0
+        self.scripts: list[Script] = []
+        self._seq = 0
+        self._timers: list[tuple[float, int, Script, int]] = []   # (wake time_ms, seq, script, wait id)
+        self._frames: list[tuple[int, int, Script, int]] = []     # (wake frame, seq, script, wait id)
+        self._ready: deque[tuple[Script, int]] = deque()
+        self._talking: set[int] = set()
+        self._talkie_waiters: dict[int, list[tuple[Script, int]]] = {}
+
+    # -----------------------------
+    # Starting / stopping
+    # -----------------------------
+    def start(self, script, *args, name: str | None = None, room=None) -> Script:
+        """
+        Start a generator function / coroutine function (called with *args) or an already
+        created generator/coroutine. Runs up to its first wait right away.
+        room=... ties it to that room: change_room() stops it.
+        """
+        gen = script(*args) if callable(script) else script
+        if not hasattr(gen, "send"):
+            raise TypeError(f"[scripts.py] {script!r} is not a generator or coroutine")
+        name = name or getattr(script, "__name__", None) or getattr(gen, "__name__", "script")
+        handle = Script(gen, name, room)
+        self.scripts.append(handle)
+        self._resume(handle, None)
+        return handle
+
+    def stop(self, name: str) -> None:
+        for script in list(self.scripts):
+            if script.name == name:
+                script.stop()
+        self._prune()
+
+    def stop_room(self, room) -> None:
+        for script in list(self.scripts):
+            if script.room is room:
+                script.stop()
+        self._prune()
+
+    def stop_all(self) -> None:
+        for script in list(self.scripts):
+            script.stop()
+        self.scripts.clear()
+        self._timers.clear()
+        self._frames.clear()
+        self._ready.clear()
+        self._talkie_waiters.clear()
+        self._talking.clear()
+
+    def is_running(self, name: str) -> bool:
+        return any(s.name == name and not s.done for s in self.scripts)
+
+    def _prune(self) -> None:
+        self.scripts = [s for s in self.scripts if not s.done]
+
+    # -----------------------------
+    # Talkies (the engine reports these from say_line/stop_line)
+    # -----------------------------
+    def talkie_started(self, channel: int) -> None:
+        self._talking.add(channel)
+
+    def talkie_ended(self, channel: int) -> None:
+        self._talking.discard(channel)
+        for entry in self._talkie_waiters.pop(channel, ()):
+            self._ready.append(entry)
+
+    # -----------------------------
+    # Per frame
+    # -----------------------------
+    def update(self, dt: float) -> None:
+        self.frame += 1
+        self.time_ms += dt * 1000.0
+
+        due: list[tuple[Script, int]] = list(self._ready)
+        self._ready.clear()
+        timers, frames = self._timers, self._frames
+        while frames and frames[0][0] <= self.frame:
+            _, _, script, wait_id = heapq.heappop(frames)
+            due.append((script, wait_id))
+        while timers and timers[0][0] <= self.time_ms:
+            _, _, script, wait_id = heapq.heappop(timers)
+            due.append((script, wait_id))
+
+        if not due:
+            return
+        for script, wait_id in due:
+            if not script.done and script._wait_id == wait_id:
+                self._resume(script, None)
+        self._prune()
+
+    def _resume(self, script: Script, value: Any) -> None:
+        script._wait_id += 1
+        if script._unsubscribe is not None:
+            script._unsubscribe()
+            script._unsubscribe = None
+        try:
+            wait = script._gen.send(value)
+        except StopIteration:
+            if not script.done:
+                script._finish()
+            return
+        except Exception:
+            print(f"[scripts.py] script {script.name} crashed:")
+            traceback.print_exc()
+            if not script.done:
+                script._finish()
+            return
+        if script.done:
+            script._gen.close()
+            return
+        self._schedule(script, wait)
+
+    def _push(self, heap: list, when, script: Script) -> None:
+        self._seq += 1
+        heapq.heappush(heap, (when, self._seq, script, script._wait_id))
+
+    def _schedule(self, script: Script, wait: Any) -> None:
+        wait_id = script._wait_id
+        if wait is None:
+            self._push(self._frames, self.frame + 1, script)
+        elif isinstance(wait, WaitFrames):
+            self._push(self._frames, self.frame + wait.frames, script)
+        elif isinstance(wait, WaitMs):
+            self._push(self._timers, self.time_ms + wait.ms, script)
+        elif isinstance(wait, WaitTalkieEnd):
+            if wait.channel in self._talking:
+                self._talkie_waiters.setdefault(wait.channel, []).append((script, wait_id))
+            else:
+                self._ready.append((script, wait_id))
+        elif isinstance(wait, WaitAnimationEnd):
+            self._wait_animation(script, wait, wait_id)
+        elif isinstance(wait, (Signal, Script)):
+            signal = wait._on_done if isinstance(wait, Script) else wait
+            if signal.fired:
+                self._ready.append((script, wait_id))
+            else:
+                signal._waiters.append(lambda: self._ready.append((script, wait_id)))
+        else:
+            print(f"[scripts.py] script {script.name} yielded {wait!r}, stopping it")
+            script.stop()
+
+    def _wait_animation(self, script: Script, wait: WaitAnimationEnd, wait_id: int) -> None:
+        actor_id = getattr(wait.actor, "actor_id", None)
+
+        def on_end(actor, event_data, *_args):
+            if script._wait_id == wait_id:
+                self._ready.append((script, wait_id))
+
+        event_bus.subscribe(ActorEvents.ANIMATION_END, on_end, actor_id=actor_id, animation=wait.animation)
+        script._unsubscribe = lambda: event_bus.unsubscribe(
+            ActorEvents.ANIMATION_END, on_end, actor_id=actor_id, animation=wait.animation)
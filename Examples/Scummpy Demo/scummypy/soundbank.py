@@ -0,0 +1,149 @@
+"""
+Pre-decoded PCM sound bank.
+
+`python -m scummypy build` decodes every sfx and talkie once, in the mixer's
+own sample format, and writes them into a single bank file:
+
+    b"SPYBANK1" | u32 header size | JSON header | PCM data (16-byte aligned)
+
+    header: {"frequency": 44100, "format": -16, "channels": 2,
+             "sounds": {"audio/talkies/putt_0004.flac": [offset, length], ...}}
+
+At runtime the bank is mmap'd read-only and a sound is
+`pygame.mixer.Sound(buffer=memoryview(bank)[offset:offset + length])`: a copy
+of already-decoded samples instead of an MP3/FLAC decode. The bank is only
+used when the running mixer has exactly the format it was baked for;
+otherwise AudioManager decodes the files as before.
+"""
+import os
+import json
+import mmap
+import struct
+from contextlib import contextmanager
+
+import pygame
+
+BANK_FILE = "sounds.bank"
+BANK_MAGIC = b"SPYBANK1"
+BANK_DIRS = ("audio/sfx", "audio/talkies")          # under assets/; music keeps streaming from files
+SOUND_EXTS = (".wav", ".ogg", ".mp3", ".flac")
+
+# the format AudioManager opens the mixer with, and so the format sounds are baked in
+MIXER_FREQUENCY = 44100
+MIXER_SIZE = -16
+MIXER_CHANNELS = 2
+
+
+# -----------------------------
+# Baking
+# -----------------------------
+@contextmanager
+def baking_mixer():
+    """A mixer to decode with (opened in the bank format if none is running). Yields its format."""
+    quit_after = not pygame.mixer.get_init()
+    if quit_after:
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")   # no device needed to decode
+        pygame.mixer.init(MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, allowedchanges=0)
+    try:
+        yield pygame.mixer.get_init()
+    finally:
+        if quit_after:
+            pygame.mixer.quit()
+
+
+def decode_sound(path: str) -> bytes:
+    """Raw PCM of one sound file in the running mixer's format (see baking_mixer())."""
+    return pygame.mixer.Sound(path).get_raw()
+
+
+def bake_sound_bank(assets_root: str, sounds: list[str], out_path: str) -> dict:
+    """Decode `sounds` (asset-relative paths) to raw mixer PCM and write the bank. Returns the header."""
+    with baking_mixer() as fmt:
+        blobs = [(rel, decode_sound(os.path.join(assets_root, *rel.split("/")))) for rel in sounds]
+    return write_sound_bank(out_path, fmt, blobs)
+
+
+def write_sound_bank(out_path: str, fmt: tuple[int, int, int], blobs: list[tuple[str, bytes]]) -> dict:
+    """Lay already decoded (asset-relative path, PCM) pairs out as a bank file. Returns the header."""
+    frequency, size, channels = fmt
+    header = {"frequency": frequency, "format": size, "channels": channels, "sounds": {}}
+
+    # offsets are relative to the data block, which starts right after the header
+    offset = 0
+    for rel, raw in blobs:
+        header["sounds"][rel] = [offset, len(raw)]
+        offset += (len(raw) + 15) & ~15
+
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    data_start = (len(BANK_MAGIC) + 4 + len(header_bytes) + 15) & ~15
+    with open(out_path, "wb") as f:
+        f.write(BANK_MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * (data_start - f.tell()))
+        for rel, raw in blobs:
+            f.write(raw)
+            f.write(b"\0" * (-len(raw) & 15))
+
+    print(f"[soundbank.py] {out_path}: {len(blobs)} sounds, {offset / 1024:.0f} KiB PCM")
+    return header
+
+
+# -----------------------------
+# Runtime
+# -----------------------------
+class SoundBank:
+    def __init__(self, path: str, assets_root: str):
+        self.path = path
+        self.assets_root = os.path.abspath(assets_root)
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(BANK_MAGIC)] != BANK_MAGIC:
+            self._mm.close()
+            raise ValueError(f"[soundbank.py] {path} is not a sound bank")
+
+        (header_size,) = struct.unpack_from("<I", self._mm, len(BANK_MAGIC))
+        header_start = len(BANK_MAGIC) + 4
+        header = json.loads(self._mm[header_start:header_start + header_size].decode("utf-8"))
+        self.format = (header["frequency"], header["format"], header["channels"])
+        self._data_start = (header_start + header_size + 15) & ~15
+        self._sounds: dict[str, list[int]] = header["sounds"]
+        self._view = memoryview(self._mm)
+
+    @classmethod
+    def open(cls, path: str, assets_root: str) -> "SoundBank | None":
+        """The bank if it matches the running mixer's format, else None (callers decode files)."""
+        try:
+            bank = cls(path, assets_root)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[soundbank.py] not using {path}: {e}")
+            return None
+        if pygame.mixer.get_init() != bank.format:
+            print(f"[soundbank.py] not using {path}: baked for {bank.format}, mixer is {pygame.mixer.get_init()}")
+            bank.close()
+            return None
+        return bank
+
+    def __len__(self) -> int:
+        return len(self._sounds)
+
+    def __contains__(self, path: str) -> bool:
+        return self._key(path) in self._sounds
+
+    def _key(self, path: str) -> str:
+        # accepts asset-relative keys and file paths ("assets/audio/sfx/x.wav", absolute, ...)
+        full = os.path.abspath(path)
+        if full.startswith(self.assets_root + os.sep):
+            path = os.path.relpath(full, self.assets_root)
+        return path.replace(os.sep, "/")
+
+    def get(self, path: str) -> pygame.mixer.Sound | None:
+        entry = self._sounds.get(self._key(path))
+        if entry is None:
+            return None
+        start = self._data_start + entry[0]
+        return pygame.mixer.Sound(buffer=self._view[start:start + entry[1]])
+
+    def close(self) -> None:
+        self._view.release()
+        self._mm.close()
@@ -1,8 +1,15 @@
 import pygame
 
 class Sprite(pygame.sprite.Sprite):
-    def __init__(self, image, pos):
+    """
+    Static sprites (the default) are baked into their room's background (see
+    SpriteGroup). Moving one through pos/x/y or swapping its image re-bakes it;
+    set static = False for sprites that change every frame (or call
+    room.sprites.invalidate() after editing rect directly).
+    """
+    def __init__(self, image, pos, static: bool = True):
         super().__init__()
+        self.static = static
         self.image = image
         self.rect = self.image.get_rect(topleft=pos)
         self.mask = pygame.mask.from_surface(self.image)
@@ -13,6 +20,23 @@ class Sprite(pygame.sprite.Sprite):
         # Only needed if you want automatic movement or animation
         pass 
 
+    def _changed(self):
+        """Tell the group(s) holding this static sprite to re-bake."""
+        if self.static:
+            for group in self.groups():
+                invalidate = getattr(group, "invalidate", None)
+                if invalidate is not None:
+                    invalidate()
+
+    @property
+    def image(self):
+        return self._image
+
+    @image.setter
+    def image(self, value):
+        self._image = value
+        self._changed()
+
     def collidepoint(self, pos):
         if self.disabled is True:
             return False
@@ -45,6 +69,7 @@ class Sprite(pygame.sprite.Sprite):
     @pos.setter
     def pos(self, value):
         self.rect.topleft = value
+        self._changed()
 
     @property
     def x(self):
@@ -53,6 +78,7 @@ class Sprite(pygame.sprite.Sprite):
     @x.setter
     def x(self, value):
         self.rect.x = value
+        self._changed()
 
     @property
     def y(self):
@@ -61,3 +87,4 @@ class Sprite(pygame.sprite.Sprite):
     @y.setter
     def y(self, value):
         self.rect.y = value
+        self._changed()
@@ -19,20 +19,10 @@ def ask_yes_no(
     _begin_modal(engine)
 
     result: bool = False
-    root = None
     try:
-        import tkinter as tk
         from tkinter import messagebox
 
-        root = tk.Tk()
-        root.withdraw()
-        root.attributes("-topmost", True)
-
-        try:
-            root.update_idletasks()
-            root.update()
-        except Exception:
-            pass
+        root = _get_tk_root()
 
         result = bool(messagebox.askyesno(title, message, parent=root))
 
@@ -46,12 +36,6 @@ def ask_yes_no(
         return result
 
     finally:
-        try:
-            if root is not None:
-                root.destroy()
-        except Exception:
-            pass
-
         _end_modal(engine)
 
 
@@ -69,20 +53,10 @@ def ask_ok_cancel(
     _begin_modal(engine)
 
     result: bool = False
-    root = None
     try:
-        import tkinter as tk
         from tkinter import messagebox
 
-        root = tk.Tk()
-        root.withdraw()
-        root.attributes("-topmost", True)
-
-        try:
-            root.update_idletasks()
-            root.update()
-        except Exception:
-            pass
+        root = _get_tk_root()
 
         result = bool(messagebox.askokcancel(title, message, parent=root))
 
@@ -96,12 +70,6 @@ def ask_ok_cancel(
         return result
 
     finally:
-        try:
-            if root is not None:
-                root.destroy()
-        except Exception:
-            pass
-
         _end_modal(engine)
 
 
@@ -109,6 +77,28 @@ def ask_ok_cancel(
 # Internal helpers
 # -------------------------
 
+_tk_root = None
+
+
+def _get_tk_root():
+    """Hidden Tk root, created (and tkinter imported) on the first dialog, then reused."""
+    global _tk_root
+    if _tk_root is None:
+        import tkinter as tk
+
+        _tk_root = tk.Tk()
+        _tk_root.withdraw()
+        _tk_root.attributes("-topmost", True)
+
+    try:
+        _tk_root.update_idletasks()
+        _tk_root.update()
+    except Exception:
+        pass
+
+    return _tk_root
+
+
 def _ensure_main_thread(engine) -> None:
     # If you stored _main_thread_id on engine, enforce it
     main_id = getattr(engine, "_main_thread_id", None)
@@ -120,6 +110,8 @@ def _begin_modal(engine) -> None:
     engine.mouse_input_blocked = True
     engine.key_input_blocked = True
     pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
+    if hasattr(engine, "invalidate_cursor"):
+        engine.invalidate_cursor()
 
 
 def _end_modal(engine) -> None:
@@ -0,0 +1,323 @@
+"""
+Walkboxes and actor navigation, SCUMM style.
+
+A room's walkable floor is a set of convex polygons stored next to its images:
+
+    assets/rooms/<room>/walkboxes.json
+    {
+        "version": 1,
+        "boxes": [ {"name": "road-left", "points": [[40, 265], [370, 245], ...]}, ... ],
+        "scale": [[y, scale], ...],     <- optional depth scale bands, see scaling.py
+        "next_hop": [[...], ...]        <- optional, written by the bake step
+    }
+
+Two boxes are neighbours when they share (part of) an edge; that shared segment
+is the portal an actor walks through. From the neighbour graph an all-pairs
+next-hop table is built once (Floyd-Warshall over box-center distances):
+next_hop[a][b] is the box to step into when walking from box a to box b, -1 when
+b can't be reached. A path query then only follows table entries, it never
+searches.
+
+Bake the table into the json so rooms don't compute it at load:
+    python -m scummypy.walkbox street
+"""
+import json
+import math
+import os
+
+from .scaling import interpolate_bands, quantize
+
+WALKBOX_FILE = "walkboxes.json"
+WALKBOX_VERSION = 1
+
+_EPS = 0.5   # px; edges closer than this count as shared
+
+Point = tuple[float, float]
+
+
+# -----------------------------
+# Geometry
+# -----------------------------
+def _cross(o: Point, a: Point, b: Point) -> float:
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def _closest_on_segment(p: Point, a: Point, b: Point) -> Point:
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    length2 = dx * dx + dy * dy
+    if length2 == 0:
+        return a
+    t = ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / length2
+    t = min(1.0, max(0.0, t))
+    return (a[0] + t * dx, a[1] + t * dy)
+
+
+def _segment_intersection(p: Point, q: Point, a: Point, b: Point) -> Point | None:
+    r = (q[0] - p[0], q[1] - p[1])
+    s = (b[0] - a[0], b[1] - a[1])
+    denom = r[0] * s[1] - r[1] * s[0]
+    if denom == 0:
+        return None
+    t = ((a[0] - p[0]) * s[1] - (a[1] - p[1]) * s[0]) / denom
+    u = ((a[0] - p[0]) * r[1] - (a[1] - p[1]) * r[0]) / denom
+    if 0.0 <= t <= 1.0 and 0.0 <= u <= 1.0:
+        return (p[0] + t * r[0], p[1] + t * r[1])
+    return None
+
+
+def _best_crossing(p: Point, q: Point, a: Point, b: Point) -> Point:
+    """Point on portal a-b with the shortest p -> point -> q detour (convex in t: ternary search)."""
+    hit = _segment_intersection(p, q, a, b)
+    if hit is not None:
+        return hit
+
+    def at(t: float) -> Point:
+        return (a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t)
+
+    lo, hi = 0.0, 1.0
+    for _ in range(24):
+        m1, m2 = lo + (hi - lo) / 3, hi - (hi - lo) / 3
+        c1, c2 = at(m1), at(m2)
+        if math.dist(p, c1) + math.dist(c1, q) <= math.dist(p, c2) + math.dist(c2, q):
+            hi = m2
+        else:
+            lo = m1
+    return at((lo + hi) / 2)
+
+
+def _shared_segment(a1: Point, a2: Point, b1: Point, b2: Point) -> tuple[Point, Point] | None:
+    """Overlap of two collinear edges, or None."""
+    if abs(_cross(a1, a2, b1)) > _EPS * math.dist(a1, a2) or abs(_cross(a1, a2, b2)) > _EPS * math.dist(a1, a2):
+        return None
+    dx, dy = a2[0] - a1[0], a2[1] - a1[1]
+    length2 = dx * dx + dy * dy
+    if length2 == 0:
+        return None
+
+    def t(p: Point) -> float:
+        return ((p[0] - a1[0]) * dx + (p[1] - a1[1]) * dy) / length2
+
+    lo = max(0.0, min(t(b1), t(b2)))
+    hi = min(1.0, max(t(b1), t(b2)))
+    if (hi - lo) * math.sqrt(length2) < _EPS:
+        return None
+    return ((a1[0] + lo * dx, a1[1] + lo * dy), (a1[0] + hi * dx, a1[1] + hi * dy))
+
+
+class Walkbox:
+    __slots__ = ("name", "points", "center", "bounds", "_sign")
+
+    def __init__(self, name: str, points: list[Point]):
+        if len(points) < 3:
+            raise ValueError(f"[walkbox.py] box '{name}' needs at least 3 points")
+        self.name = name
+        self.points: list[Point] = [(float(x), float(y)) for x, y in points]
+        n = len(self.points)
+        self.center: Point = (sum(p[0] for p in self.points) / n, sum(p[1] for p in self.points) / n)
+        xs = [p[0] for p in self.points]
+        ys = [p[1] for p in self.points]
+        self.bounds = (min(xs), min(ys), max(xs), max(ys))
+
+        crosses = [_cross(self.points[i], self.points[(i + 1) % n], self.points[(i + 2) % n]) for i in range(n)]
+        if not (all(c >= 0 for c in crosses) or all(c <= 0 for c in crosses)):
+            raise ValueError(f"[walkbox.py] box '{name}' is not convex")
+        self._sign = 1.0 if sum(crosses) >= 0 else -1.0
+
+    def edges(self):
+        pts = self.points
+        for i in range(len(pts)):
+            yield pts[i], pts[(i + 1) % len(pts)]
+
+    def contains(self, p: Point) -> bool:
+        x0, y0, x1, y1 = self.bounds
+        if not (x0 - _EPS <= p[0] <= x1 + _EPS and y0 - _EPS <= p[1] <= y1 + _EPS):
+            return False
+        sign = self._sign
+        return all(_cross(a, b, p) * sign >= -_EPS for a, b in self.edges())
+
+    def closest_point(self, p: Point) -> Point:
+        if self.contains(p):
+            return p
+        return min((_closest_on_segment(p, a, b) for a, b in self.edges()), key=lambda q: math.dist(p, q))
+
+
+# -----------------------------
+# Navigation
+# -----------------------------
+class WalkboxMap:
+    def __init__(self, boxes: list[Walkbox], next_hop: list[list[int]] | None = None,
+                 scale_bands: list | None = None):
+        self.boxes = boxes
+        # [(y, scale), ...] sorted by y; empty = actors are never scaled
+        self.scale_bands: list[tuple[float, float]] = sorted((float(y), float(s)) for y, s in (scale_bands or []))
+        # { (a, b): (portal end, portal end) } for neighbouring boxes, both directions
+        self.portals: dict[tuple[int, int], tuple[Point, Point]] = {}
+        self._find_portals()
+
+        n = len(boxes)
+        if next_hop is not None and len(next_hop) == n and all(len(row) == n for row in next_hop):
+            self.next_hop = next_hop
+        else:
+            self.next_hop = self._build_next_hop()
+
+    def _find_portals(self) -> None:
+        boxes = self.boxes
+        for i in range(len(boxes)):
+            for j in range(i + 1, len(boxes)):
+                bi, bj = boxes[i].bounds, boxes[j].bounds
+                if bi[0] > bj[2] + _EPS or bj[0] > bi[2] + _EPS or bi[1] > bj[3] + _EPS or bj[1] > bi[3] + _EPS:
+                    continue
+                best = None
+                for a1, a2 in boxes[i].edges():
+                    for b1, b2 in boxes[j].edges():
+                        seg = _shared_segment(a1, a2, b1, b2)
+                        if seg is not None and (best is None or math.dist(*seg) > math.dist(*best)):
+                            best = seg
+                if best is not None:
+                    self.portals[(i, j)] = best
+                    self.portals[(j, i)] = best
+
+    def _build_next_hop(self) -> list[list[int]]:
+        n = len(self.boxes)
+        inf = float("inf")
+        dist = [[0.0 if i == j else inf for j in range(n)] for i in range(n)]
+        hop = [[i if i == j else -1 for j in range(n)] for i in range(n)]
+        for (i, j) in self.portals:
+            dist[i][j] = math.dist(self.boxes[i].center, self.boxes[j].center)
+            hop[i][j] = j
+
+        for k in range(n):
+            dist_k = dist[k]
+            for i in range(n):
+                dik = dist[i][k]
+                if dik == inf:
+                    continue
+                dist_i, hop_i = dist[i], hop[i]
+                for j in range(n):
+                    d = dik + dist_k[j]
+                    if d < dist_i[j]:
+                        dist_i[j] = d
+                        hop_i[j] = hop_i[k]
+        return hop
+
+    # ---------- scaling ----------
+    def scale_at(self, y: float) -> float:
+        return interpolate_bands(self.scale_bands, y) if self.scale_bands else 1.0
+
+    def scale_steps(self) -> set[int]:
+        """Every quantised scale an actor standing on a box can get."""
+        steps: set[int] = set()
+        if not self.scale_bands:
+            return steps
+        for box in self.boxes:
+            for y in range(int(box.bounds[1]), int(box.bounds[3]) + 1):
+                steps.add(quantize(self.scale_at(y)))
+        return steps
+
+    # ---------- queries ----------
+    def find_box(self, p: Point) -> int:
+        """Index of the box containing p, -1 if none."""
+        for i, box in enumerate(self.boxes):
+            if box.contains(p):
+                return i
+        return -1
+
+    def nearest_box(self, p: Point) -> tuple[int, Point]:
+        """(box index, closest walkable point in it) for any point, on or off the boxes."""
+        best, best_point, best_dist = -1, p, float("inf")
+        for i, box in enumerate(self.boxes):
+            q = box.closest_point(p)
+            d = math.dist(p, q)
+            if d < best_dist:
+                best, best_point, best_dist = i, q, d
+                if d == 0:
+                    break
+        return best, best_point
+
+    def path(self, start: Point, goal: Point) -> list[Point]:
+        """
+        Waypoints from start to goal (start excluded). Points off the boxes are pulled
+        onto the nearest box; an unreachable goal ends at the closest point of the start box.
+        """
+        if not self.boxes:
+            return [goal]
+        cur, pos = self.nearest_box(start)
+        goal_box, target = self.nearest_box(goal)
+
+        if self.next_hop[cur][goal_box] < 0:
+            return [self.boxes[cur].closest_point(goal)]
+
+        points: list[Point] = []
+        if pos != (float(start[0]), float(start[1])):
+            points.append(pos)
+        while cur != goal_box:
+            nxt = self.next_hop[cur][goal_box]
+            a, b = self.portals[(cur, nxt)]
+            through = _best_crossing(pos, target, a, b)
+            if through != pos:
+                points.append(through)
+            pos, cur = through, nxt
+        points.append(target)
+        return points
+
+    # ---------- data ----------
+    @classmethod
+    def from_dict(cls, data: dict) -> "WalkboxMap":
+        boxes = [Walkbox(b.get("name", str(i)), b["points"]) for i, b in enumerate(data.get("boxes", []))]
+        return cls(boxes, data.get("next_hop"), data.get("scale"))
+
+    def to_dict(self) -> dict:
+        return {
+            "version": WALKBOX_VERSION,
+            "boxes": [{"name": b.name, "points": [list(p) for p in b.points]} for b in self.boxes],
+            "scale": [list(band) for band in self.scale_bands],
+            "next_hop": self.next_hop,
+        }
+
+    @classmethod
+    def load(cls, path: str) -> "WalkboxMap":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def bake_room_walkboxes(room_dir: str, out_path: str | None = None) -> WalkboxMap:
+    """
+    Recompute the next-hop table of <room_dir>/walkboxes.json and write it back
+    (or to out_path, which is what `python -m scummypy build` does).
+    """
+    path = os.path.join(room_dir, WALKBOX_FILE)
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    data.pop("next_hop", None)
+    nav = WalkboxMap.from_dict(data)
+
+    path = out_path or path
+    out = nav.to_dict()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{\n")
+        f.write(f'    "version": {out["version"]},\n')
+        f.write('    "boxes": [\n')
+        f.write(",\n".join(f"        {json.dumps(b)}" for b in out["boxes"]))
+        f.write("\n    ],\n")
+        if out["scale"]:
+            f.write(f'    "scale": {json.dumps(out["scale"])},\n')
+        f.write('    "next_hop": [\n')
+        f.write(",\n".join(f"        {json.dumps(row)}" for row in out["next_hop"]))
+        f.write("\n    ]\n}\n")
+    print(f"[walkbox.py] {path}: {len(nav.boxes)} boxes, {len(nav.portals) // 2} portals")
+    return nav
+
+
+if __name__ == "__main__":
+    import argparse
+    import scummypy.resources as Resources
+
+    parser = argparse.ArgumentParser(description="Bake walkbox next-hop tables into the rooms' walkboxes.json.")
+    parser.add_argument("rooms", nargs="*", help="room folder names under assets/rooms (default: all)")
+    args = parser.parse_args()
+
+    rooms_root = Resources._join("rooms")
+    rooms = args.rooms or sorted(d for d in os.listdir(rooms_root) if os.path.isdir(os.path.join(rooms_root, d)))
+    for room in rooms:
+        if os.path.isfile(os.path.join(rooms_root, room, WALKBOX_FILE)):
+            bake_room_walkboxes(os.path.join(rooms_root, room))
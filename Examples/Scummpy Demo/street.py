@@ -1,4 +1,3 @@
-import threading
 import pygame
 import time
 
@@ -10,6 +9,7 @@ from scummypy.actor import Actor, ActorEvents
 from scummypy.costume import Costume
 from scummypy import audio
 from scummypy.cursors import Cursors
+from scummypy.scripts import WaitMs, WaitTalkieEnd
 
 
 ROOM_NAME: str = __name__
@@ -18,7 +18,7 @@ ROOM_PATH: str = ROOM_NAME+"/"
 def init(engine) -> Room:
     print("init", ROOM_NAME, "with debug enabled:", engine.DEBUG)
 
-    bg = Resources.load_room_image(ROOM_PATH, "bg.png").convert()
+    bg = Resources.load_room_image(ROOM_PATH, "bg.png")
 
     room = Room(engine, ROOM_NAME, bg)
 
@@ -163,28 +163,30 @@ def onStumpClick(room, engine):
     if not engine.game_state.get_flag("street_cu_on"):
         room.engine.current_skipable = lambda eng_self: hideCloseup(room, engine)
         engine.game_state.set_flag("street_cu_on", True) 
-        bg = Resources.load_room_image(ROOM_PATH, "cu_left_bg.png").convert()
+        bg = Resources.load_room_image(ROOM_PATH, "cu_left_bg.png")
         engine.close_up(bg, True)
         costume = Costume( Resources.load_room_costume("PUTT/int-cu-stat") )
         room.putt.change_costume(costume)
         room.putt.costume.stop_layers("head", "lids", "eyes-normal", frame=None)
-        room.close_up_timer = threading.Timer(0.4, handleCloseupStarted, args=(room, engine))
-        room.close_up_timer.start()
+        room.close_up_script = engine.scripts.start(closeupScript, room, engine, room=room)
 
     else:
         hideCloseup(room, engine)
 
-def handleCloseupStarted(room, engine):
-    print("handleCloseupStarted called")
-    if engine.in_close_up == True:
-        engine.say_line(["putt_0004", "putt_0006", "putt_0005"], on_done=lambda: handleCloseupEnded(room, engine))
+def closeupScript(room, engine):
+    yield WaitMs(400)
+    print("closeupScript: close-up started")
+    if engine.in_close_up != True:
+        return
 
-def handleCloseupEnded(room, engine):
-    room.close_up_timer = threading.Timer(1, hideCloseup, args=(room, engine))
-    room.close_up_timer.start()
+    engine.say_line(["putt_0004", "putt_0006", "putt_0005"])
+    yield WaitTalkieEnd(channel=0)
+    yield WaitMs(1000)
+    hideCloseup(room, engine)
 
 def hideCloseup(room, engine):
-    room.close_up_timer.cancel()
+    if getattr(room, "close_up_script", None) is not None:
+        room.close_up_script.stop()
     room.engine.current_skipable = None
     engine.game_state.set_flag("street_cu_on", False) 
     handlePuttAnimationEnd(room.putt, None, room)
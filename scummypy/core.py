@@ -1,9 +1,4 @@
 import pygame
-import tkinter as tk
-from tkinter import simpledialog
-from tkinter import commondialog
-from tkinter import messagebox
-from .system import InputDialog
 
 
 import scummypy.resources as Resources
@@ -14,14 +9,13 @@ from .music import MusicSystem, Song
 
 class Engine:
     def __init__(self, screen_size=(640, 480), fps=60, title="Scummpy"):
-        pygame.init()
+        # only the display up front; the mixer starts with AudioManager
+        pygame.display.init()
         self.screen = pygame.display.set_mode(screen_size)
         pygame.display.set_caption(title)
 
-        # ---- Tkinter hidden root ----
-        self.tk_root = tk.Tk()
-        self.tk_root.withdraw()   # Hide the main Tkinter window
-        self.tk_root.attributes("-topmost", True)  # Dialogs appear on top
+        # ---- Tkinter hidden root (created on the first show_prompt) ----
+        self._tk_root = None
 
         self.DEBUG: bool = False
         self.HOTSPOT_DRAWER_POINTS = [(None, None), (0, 0)]
@@ -39,9 +33,19 @@ class Engine:
         self.actor_table = {}
         self.sound_channels = {}
         self.audio_schedulers = []
-        Cursors.load_all()
+        # cursors load on first use (Cursors.NORMAL etc.), see cursors.py
         self.Cursors = Cursors
 
+    @property
+    def tk_root(self):
+        if self._tk_root is None:
+            import tkinter as tk
+
+            self._tk_root = tk.Tk()
+            self._tk_root.withdraw()   # Hide the main Tkinter window
+            self._tk_root.attributes("-topmost", True)  # Dialogs appear on top
+        return self._tk_root
+
     def refocus_pygame(self):
         # Bring the Pygame window to the front
         pygame.display.set_mode(self.screen.get_size())  # refreshes window handle
@@ -273,6 +277,9 @@ class Engine:
             self.HOTSPOT_DRAWER_POINTS[0] = (None, None)
     
     def show_prompt(self, promptType="input", title="Info", message="Unknown message"):
+        from tkinter import messagebox
+        from .system import InputDialog
+
         # Block engine input while dialog is up
         self.input_blocked = True
         pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
@@ -1,7 +1,15 @@
 import pygame
 import scummypy.resources as Resources
 
-class Cursors:
+class _LazyCursors(type):
+    def __getattr__(cls, name: str):
+        # Only called when `name` is not loaded yet
+        if name in cls.__dict__.get("SPECS", {}):
+            return cls.get(name)
+        raise AttributeError(name)
+
+
+class Cursors(metaclass=_LazyCursors):
     @staticmethod
     def HCursor(filename: str, hotspot=(0, 0)) -> pygame.cursors.Cursor:
         name=filename
@@ -9,23 +17,33 @@ class Cursors:
         cursor = pygame.cursors.Cursor(hotspot, surf)
         return cursor
 
-    HIGHLIGHT = None
-    NORMAL = None
-    NWDeep = None
-    #NORTH
-    NEDeep = None
-    #EAST
-    EShallow = None
-    #SOUTH
-    WEST = None
+    # Cursors are decoded on first use (Cursors.NEDeep etc.), not at engine startup.
+    # { attribute name: (filename, hotspot) }
+    SPECS: dict[str, tuple[str, tuple[int, int]]] = {
+        "HIGHLIGHT": ("hw_cursorHighlight.png", (0, 0)),
+        "NORMAL":    ("hw_cursorNormal.png", (0, 0)),
+        "NWDeep":    ("hw_cursorNWDeep.png", (0, 0)),
+        #NORTH
+        "NEDeep":    ("hw_cursorNEDeep.png", (30, 0)),
+        #EAST
+        "EShallow":  ("hw_cursorEShallow.png", (22, 16)),
+        #SOUTH
+        "WEST":      ("hw_cursorWest.png", (0, 14)),
+        #BACK TO NORTH
+    }
 
-    #BACK TO NORTH
+    @classmethod
+    def get(cls, name: str) -> pygame.cursors.Cursor:
+        """Load (once) and return the cursor registered under `name` in SPECS."""
+        cursor = cls.__dict__.get(name)
+        if cursor is None:
+            filename, hotspot = cls.SPECS[name]
+            cursor = cls.HCursor(filename, hotspot)
+            setattr(cls, name, cursor)
+        return cursor
 
     @classmethod
     def load_all(cls):
-        cls.HIGHLIGHT = cls.HCursor("hw_cursorHighlight.png")
-        cls.NORMAL   = cls.HCursor("hw_cursorNormal.png")
-        cls.NWDeep   = cls.HCursor("hw_cursorNWDeep.png", (0, 0))
-        cls.NEDeep   = cls.HCursor("hw_cursorNEDeep.png", (30, 0))
-        cls.EShallow   = cls.HCursor("hw_cursorEShallow.png", (22, 16))
-        cls.WEST   = cls.HCursor("hw_cursorWest.png", (0, 14))
+        """Eagerly load every cursor (optional; normally they load on first use)."""
+        for name in cls.SPECS:
+            cls.get(name)